@@ -12,18 +12,25 @@ from sheets_logger import (
     approve_owner_submission,
     reject_owner_submission,
     get_pending_owner_submissions,
-    create_owner_direct
+    get_owners_by_ids,
+    review_owner_submissions,
+    create_owner_direct,
+    queue_log_action
 )
 from config import ADMIN_IDS
+from moderation_queue import moderation_queue, POSTPONED
+from media import photo_cache, full_photo_button
 from menus import (
     open_menu_for_role,
     accounts_menu,
     PANEL_ITEMS, PANEL_ACCOUNTS, PANEL_WORKFLOW, PANEL_USERS,
     PANEL_TASKS, PANEL_REPORTS, PANEL_SYSTEM, PANEL_BACK,
-    BTN_PENDING_ACCOUNTS
+    BTN_PENDING_ACCOUNTS,
+    BTN_BULK_REVIEW
 )
 
 from items import handle_items_panel
+from sheet_metrics import CALLS
 
 def log_line(label, value=""):
     print(f"[BOT DEBUG] {label}: {value}")
@@ -39,13 +46,28 @@ ENABLE_SHEETS = True  # Set to True when going live
 ROLE_CACHE = {}
 ADMIN_CACHE = set()
 
-POSTPONED_OWNER_SUBMISSIONS = {}
 SECOND_BOT_WARNING_SHOWN = False
 
 # simple rate limiter (per user)
 USER_RATE_LIMIT = {}
 RATE_LIMIT_SECONDS = 0.4
 
+# pending submission review
+PENDING_PAGE_SIZE = 5
+CARD_CONCURRENCY = 3   # cards sent in parallel into one chat (Telegram per-chat limit)
+
+# the pending list is read once per PENDING ACCOUNTS press; NEXT PAGE pages
+# through that read for this long before reading the tab again
+PENDING_LIST_TTL = 300
+_PENDING_LISTS = {}    # chat_id -> (read_at, [pending submission rows])
+
+# postponed submissions listed per WORKFLOW page
+WORKFLOW_PAGE_SIZE = 10
+
+# bulk submission review
+BULK_PAGE_SIZE = 20
+NOTIFY_CONCURRENCY = 10   # worker notifications go to different chats
+
 async def get_cached_role(context, user_id):
     if user_id in ROLE_CACHE:
         return ROLE_CACHE[user_id]
@@ -66,6 +88,7 @@ ACCOUNT_OWNER_STATE = 7
 ACCOUNT_CONFIRM = 8
 ACCOUNT_LOCATION = 13
 ACCOUNT_PHOTO = 14
+ACCOUNT_DUPLICATE_CHECK = 15
 ACCOUNT_EDIT_SELECT = 20
 ACCOUNT_EDIT_NAME = 9
 ACCOUNT_EDIT_PHONE = 10
@@ -197,16 +220,13 @@ def clear_user_session(context):
     context.user_data.clear()
 
 import asyncio
+import time
 
 async def run_sheet(context, func, *args, **kwargs):
 
-    loop = asyncio.get_running_loop()
-
     try:
-        return await loop.run_in_executor(
-            None,
-            lambda: func(*args, **kwargs)
-        )
+        # to_thread runs func in a copy of this context (sheet_metrics flow label)
+        return await asyncio.to_thread(func, *args, **kwargs)
 
     except Exception as e:
         print("SHEETS ERROR:", repr(e))
@@ -216,6 +236,12 @@ async def run_sheet(context, func, *args, **kwargs):
 # START BUTTON PRESSED
 # =========================================================
 async def start_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    # Sheets calls of /start count under the "register" flow (sheet_metrics)
+    with CALLS.flow("register"):
+        await _start_button(update, context)
+
+
+async def _start_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.clear()
     user = update.effective_user
     uid = str(user.id)
@@ -288,6 +314,14 @@ async def start_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     return
 
+async def _review_failed(context, query, submission_id):
+    # the Sheets call failed, nothing was decided: keep the card and its
+    # buttons so the admin can press again
+    await context.bot.send_message(
+        chat_id=query.message.chat.id,
+        text=f"⚠️ Could not save the decision for {submission_id} (Google Sheets error). Nothing changed, try again."
+    )
+
 async def owner_review_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     query = update.callback_query
@@ -311,43 +345,39 @@ async def owner_review_callback(update: Update, context: ContextTypes.DEFAULT_TY
 
     if action == "OWNER_APPROVE":
 
+        owner_id = ""
+
         try:
             if ENABLE_SHEETS:
 
-                rows = await run_sheet(context, get_pending_owner_submissions)
-
-                submission_found = False
-
-                for r in rows:
-                    if r[0] == submission_id:
-                        worker_id = r[1]
-                        submission_found = True
-                        break
-
-                # submission already processed by another admin
-                if not submission_found:
-                    await query.edit_message_text(
-                        f"⚠️ Submission {submission_id} already processed."
-                    )
-                    return
-
-                owner_id = await run_sheet(
+                # single-row compare-and-set; False means missing or already
+                # processed, None that the call failed (run_sheet)
+                result = await run_sheet(
                     context,
                     approve_owner_submission,
                     submission_id
                 )
 
-                if not owner_id:
+                if result is None:
+                    await _review_failed(context, query, submission_id)
+                    return
+
+                if not result:
                     await query.edit_message_text(
                         f"⚠️ Submission {submission_id} already processed."
                     )
                     return
 
+                owner_id, submitted_by = result
+                worker_id = submitted_by or worker_id
+
+                queue_log_action(admin_id, "ADMIN", "APPROVE_OWNER", owner_id=owner_id, details=submission_id)
+
         except Exception as e:
             log_block("OWNER APPROVE ERROR")
             log_line("ERROR", repr(e))
 
-        data = POSTPONED_OWNER_SUBMISSIONS.pop(submission_id, None)
+        data = moderation_queue().cleanup_info(submission_id)
 
         if data and isinstance(data, dict):
 
@@ -377,7 +407,7 @@ async def owner_review_callback(update: Update, context: ContextTypes.DEFAULT_TY
         except:
             pass
 
-        POSTPONED_OWNER_SUBMISSIONS[submission_id] = "REVIEWED"
+        moderation_queue().mark_reviewed(submission_id)
 
         # notify worker who submitted
         try:
@@ -406,11 +436,26 @@ async def owner_review_callback(update: Update, context: ContextTypes.DEFAULT_TY
 
                 log_line("REJECT_RESULT", result)
 
+                if result is None:
+                    await _review_failed(context, query, submission_id)
+                    return
+
+                if not result:
+                    await query.edit_message_text(
+                        f"⚠️ Submission {submission_id} already processed."
+                    )
+                    return
+
+                _, submitted_by = result
+                worker_id = submitted_by or worker_id
+
+                queue_log_action(admin_id, "ADMIN", "REJECT_OWNER", details=submission_id)
+
         except Exception as e:
             log_block("OWNER REJECT ERROR")
             log_line("ERROR", repr(e))
 
-        data = POSTPONED_OWNER_SUBMISSIONS.pop(submission_id, None)
+        data = moderation_queue().cleanup_info(submission_id)
 
         if data and isinstance(data, dict):
 
@@ -440,7 +485,7 @@ async def owner_review_callback(update: Update, context: ContextTypes.DEFAULT_TY
         except:
             pass
 
-        POSTPONED_OWNER_SUBMISSIONS[submission_id] = "REVIEWED"
+        moderation_queue().mark_reviewed(submission_id)
 
         # notify worker
         try:
@@ -455,13 +500,526 @@ async def owner_review_callback(update: Update, context: ContextTypes.DEFAULT_TY
 
     elif action == "OWNER_POSTPONE":
 
-        POSTPONED_OWNER_SUBMISSIONS[submission_id] = {
-            "message": query.message.text,
-            "photo": query.message.photo[-1].file_id if (query.message.photo and len(query.message.photo) > 0) else None
-        }
+        moderation_queue().postpone(
+            submission_id,
+            query.message.text or query.message.caption or "",
+            query.message.photo[-1].file_id if (query.message.photo and len(query.message.photo) > 0) else None
+        )
 
         await query.edit_message_reply_markup(reply_markup=None)
 
         await query.message.reply_text(
             f"⏳ Submission {submission_id} postponed.\nYou can review it later in WORKFLOW."
         )
+
+
+# =========================================================
+# PENDING SUBMISSIONS REVIEW (paginated)
+# =========================================================
+
+def _duplicate_info(distance_warning):
+    # "WITHIN_42M_OF_OWN-000012" -> ("42", "OWN-000012")
+    parts = (distance_warning or "").split("_OF_")
+
+    if len(parts) == 2:
+        return parts[0].replace("WITHIN_", "").replace("M", ""), parts[1]
+
+    return "", ""
+
+
+def _submission_card_text(r, owner_row):
+
+    submission_id = r[0]
+    distance_warning = r[15] if len(r) > 15 else ""
+    meters, owner_id = _duplicate_info(distance_warning)
+
+    duplicate_message = ""
+
+    if distance_warning and owner_id:
+        duplicate_message = (
+            f"\n⚠ Possible duplicate yard detected"
+            f"\nDistance: {meters} meters"
+            f"\nOwner ID: {owner_id}"
+        )
+    elif distance_warning:
+        duplicate_message = f"\n⚠ Possible duplicate\n{distance_warning}"
+
+    existing_map = owner_row[9] if owner_row and len(owner_row) >= 10 else ""
+
+    return (
+        "━━━━━━━━━━━━━━━━━━━━\n"
+        "📥 SUBMISSION REVIEW\n"
+        "━━━━━━━━━━━━━━━━━━━━\n"
+        f"Submission ID: {submission_id}\n"
+        f"👤 Name: {r[6]}\n"
+        f"📞 Phone: {r[7]}\n"
+        f"📧 Email: {r[8]}\n"
+        f"🌐 Socials: {r[9]}\n"
+        f"📍 City: {r[10]}\n"
+        f"🆔 Finder ID: {r[1]}"
+        f"{duplicate_message}\n\n"
+        f"🆕 Submitted Map:\n{r[4]}"
+        + (f"\n\n📍 Existing Map:\n{existing_map}" if existing_map else "")
+    )
+
+
+async def _send_submission_card(context, chat_id, r, owner_row, limiter):
+
+    submission_id = r[0]
+    worker_id = r[1]
+    photo = r[5]
+
+    keyboard = InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("✅ APPROVE", callback_data=f"OWNER_APPROVE|{submission_id}|{worker_id}"),
+            InlineKeyboardButton("❌ REJECT", callback_data=f"OWNER_REJECT|{submission_id}|{worker_id}")
+        ]
+    ])
+
+    cache = photo_cache()
+    meta = cache.by_file_id(photo)
+
+    text = _submission_card_text(r, owner_row)
+
+    if meta and meta["first_ref"] and meta["first_ref"] != submission_id:
+        text = f"⚠ Same photo already used by {meta['first_ref']}\n" + text
+
+    existing_photo = owner_row[10] if owner_row and len(owner_row) >= 11 else None
+
+    # list view: thumbnails only, full size behind a button
+    photo_buttons = [
+        b for b in (
+            full_photo_button(photo),
+            full_photo_button(existing_photo, "🔍 EXISTING PHOTO")
+        ) if b
+    ]
+
+    if photo_buttons:
+        keyboard = InlineKeyboardMarkup(list(keyboard.inline_keyboard) + [photo_buttons])
+
+    async with limiter:
+
+        # one message per card: submitted photo + details + buttons
+        try:
+            if photo:
+                main_msg = await context.bot.send_photo(
+                    chat_id=chat_id,
+                    photo=cache.thumb_for(photo),
+                    caption=text[:1024],
+                    reply_markup=keyboard
+                )
+            else:
+                main_msg = await context.bot.send_message(
+                    chat_id=chat_id,
+                    text=text,
+                    reply_markup=keyboard
+                )
+        except Exception as e:
+            log_line("CARD_PHOTO_ERROR", f"{submission_id} {e!r}")
+            main_msg = await context.bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                reply_markup=keyboard
+            )
+
+        media_ids = []
+
+        # existing yard photo threaded under its card so parallel cards never mix
+        if existing_photo:
+            try:
+                m = await context.bot.send_photo(
+                    chat_id=chat_id,
+                    photo=cache.thumb_for(existing_photo),
+                    caption="Existing yard photo for comparison",
+                    reply_to_message_id=main_msg.message_id
+                )
+                media_ids.append(m.message_id)
+            except Exception as e:
+                log_line("EXISTING_PHOTO_ERROR", f"{submission_id} {e!r}")
+
+    moderation_queue().mark_shown(submission_id, chat_id, main_msg.message_id, media_ids)
+
+
+def _submission_seq(submission_id):
+    # SUB-000123 -> 123 (IDs are issued in sheet order); -1 if unparsable
+    try:
+        return int(str(submission_id).rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return -1
+
+
+async def send_pending_page(context, chat_id, after=None):
+    # after: the last SUBMISSION_ID of the previous page. A cursor, not an
+    # offset: cards approved / rejected meanwhile leave the list without
+    # shifting the next page past submissions nobody has seen yet
+
+    listed = _PENDING_LISTS.get(chat_id)
+
+    if after and listed and time.monotonic() - listed[0] < PENDING_LIST_TTL:
+        rows = listed[1]
+    else:
+        rows = await run_sheet(context, get_pending_owner_submissions)
+        if rows is not None:
+            _PENDING_LISTS[chat_id] = (time.monotonic(), rows)
+        rows = rows or []
+
+    # skip submissions reviewed through the bot (moderation queue tombstones)
+    reviewed = moderation_queue().reviewed_ids(r[0] for r in rows)
+    rows = [r for r in rows if r[0] not in reviewed]
+    total = len(rows)
+
+    if after:
+        rows = [r for r in rows if _submission_seq(r[0]) > _submission_seq(after)]
+
+    log_block("PENDING ACCOUNTS LOAD")
+    log_line("ROWS_RETURNED", total)
+    log_line("AFTER", after or "-")
+
+    if not rows:
+        text = "No more pending owner submissions." if total else "No pending owner submissions."
+        await context.bot.send_message(chat_id=chat_id, text=text)
+        return
+
+    page_rows = rows[:PENDING_PAGE_SIZE]
+    remaining = len(rows) - len(page_rows)
+
+    # resolve every referenced owner for this page in one lookup
+    owner_ids = {_duplicate_info(r[15] if len(r) > 15 else "")[1] for r in page_rows}
+    owner_ids.discard("")
+
+    owners = {}
+    if owner_ids:
+        owners = await run_sheet(context, get_owners_by_ids, owner_ids) or {}
+
+    await context.bot.send_message(
+        chat_id=chat_id,
+        text=f"📋 Pending Account Submissions ({total})" + (" — continued" if after else "")
+    )
+
+    limiter = asyncio.Semaphore(CARD_CONCURRENCY)
+
+    results = await asyncio.gather(
+        *[
+            _send_submission_card(
+                context,
+                chat_id,
+                r,
+                owners.get(_duplicate_info(r[15] if len(r) > 15 else "")[1]),
+                limiter
+            )
+            for r in page_rows
+        ],
+        return_exceptions=True
+    )
+
+    for r, result in zip(page_rows, results):
+        if isinstance(result, Exception):
+            log_line("CARD_ERROR", f"{r[0]} {result!r}")
+
+    if remaining:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=f"{remaining} more pending after these",
+            reply_markup=InlineKeyboardMarkup([
+                [InlineKeyboardButton("➡ NEXT PAGE", callback_data=f"PENDING_PAGE|{page_rows[-1][0]}")]
+            ])
+        )
+
+
+async def pending_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    query = update.callback_query
+    await query.answer()
+
+    if str(query.from_user.id) not in [str(a) for a in ADMIN_IDS]:
+        return
+
+    # the last SUBMISSION_ID already shown (buttons from before cursors: start over)
+    after = query.data.split("|", 1)[1] if "|" in query.data else ""
+    if _submission_seq(after) < 0:
+        after = None
+
+    try:
+        await query.edit_message_reply_markup(reply_markup=None)
+    except Exception:
+        pass
+
+    await send_pending_page(context, query.message.chat.id, after)
+
+
+async def send_postponed_page(context, chat_id, after=None):
+    # after: (postponed_at, submission_id) of the last card already listed,
+    # so submissions approved from the previous page don't push unseen ones
+    # past the next one
+
+    queue = moderation_queue()
+    total = queue.count(POSTPONED)
+
+    if not total:
+        await context.bot.send_message(chat_id=chat_id, text="No postponed owner submissions.")
+        return
+
+    records = queue.page(POSTPONED, after, WORKFLOW_PAGE_SIZE)
+
+    if not records:
+        await context.bot.send_message(chat_id=chat_id, text="No more postponed owner submissions.")
+        return
+
+    for rec in records:
+
+        sid = rec["submission_id"]
+
+        keyboard = InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton("✅ APPROVE", callback_data=f"OWNER_APPROVE|{sid}|0"),
+                InlineKeyboardButton("❌ REJECT", callback_data=f"OWNER_REJECT|{sid}|0")
+            ]
+        ])
+
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=f"⏳ Postponed Submission\nSubmission ID: {sid}\n\n{rec['message']}"[:4000],
+            reply_markup=keyboard
+        )
+
+    last = records[-1]
+    cursor = (last["updated_at"], last["submission_id"])
+    remaining = queue.count_after(POSTPONED, cursor)
+
+    if remaining:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=f"{remaining} more postponed after these — {total} total",
+            reply_markup=InlineKeyboardMarkup([
+                [InlineKeyboardButton("➡ NEXT PAGE", callback_data=f"WORKFLOW_PAGE|{cursor[0]!r}|{cursor[1]}")]
+            ])
+        )
+
+
+async def workflow_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    query = update.callback_query
+    await query.answer()
+
+    if str(query.from_user.id) not in [str(a) for a in ADMIN_IDS]:
+        return
+
+    # WORKFLOW_PAGE|<postponed_at>|<submission_id> (buttons from before cursors: start over)
+    try:
+        _, postponed_at, sid = query.data.split("|", 2)
+        after = (float(postponed_at), sid)
+    except ValueError:
+        after = None
+
+    try:
+        await query.edit_message_reply_markup(reply_markup=None)
+    except Exception:
+        pass
+
+    await send_postponed_page(context, query.message.chat.id, after)
+
+
+# ================================
+# BULK SUBMISSION REVIEW
+# ================================
+# One message with a toggle button per pending submission. Selection lives
+# in user_data["bulk_review"]; APPROVE/REJECT SELECTED goes through
+# review_owner_submissions (one batch read, one append, one batch write).
+
+def _bulk_keyboard(state):
+
+    ids = state["ids"]
+    selected = state["selected"]
+
+    pages = max(1, (len(ids) + BULK_PAGE_SIZE - 1) // BULK_PAGE_SIZE)
+    page = max(0, min(state["page"], pages - 1))
+    state["page"] = page
+
+    rows = []
+
+    for sid in ids[page * BULK_PAGE_SIZE:(page + 1) * BULK_PAGE_SIZE]:
+        mark = "☑" if sid in selected else "☐"
+        label = state["labels"].get(sid, "")
+        rows.append([InlineKeyboardButton(f"{mark} {sid} {label}"[:60], callback_data=f"BULK_OWNER|T|{sid}")])
+
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton("⬅", callback_data=f"BULK_OWNER|P|{page - 1}"))
+    nav.append(InlineKeyboardButton(f"{page + 1}/{pages}", callback_data=f"BULK_OWNER|P|{page}"))
+    if page + 1 < pages:
+        nav.append(InlineKeyboardButton("➡", callback_data=f"BULK_OWNER|P|{page + 1}"))
+    rows.append(nav)
+
+    rows.append([
+        InlineKeyboardButton("☑ PAGE", callback_data="BULK_OWNER|SP"),
+        InlineKeyboardButton("☑ ALL", callback_data="BULK_OWNER|SA"),
+        InlineKeyboardButton("☐ CLEAR", callback_data="BULK_OWNER|C"),
+    ])
+
+    rows.append([
+        InlineKeyboardButton(f"✅ APPROVE ({len(selected)})", callback_data="BULK_OWNER|A"),
+        InlineKeyboardButton(f"❌ REJECT ({len(selected)})", callback_data="BULK_OWNER|R"),
+    ])
+
+    return InlineKeyboardMarkup(rows)
+
+
+def _bulk_text(state):
+    return (
+        f"☑️ Bulk review — {len(state['ids'])} pending, {len(state['selected'])} selected\n"
+        "Tap submissions to select them."
+    )
+
+
+async def send_bulk_review(context, chat_id):
+
+    rows = await run_sheet(context, get_pending_owner_submissions) or []
+    reviewed = moderation_queue().reviewed_ids(r[0] for r in rows)
+    rows = [r for r in rows if r[0] not in reviewed]
+
+    if not rows:
+        await context.bot.send_message(chat_id=chat_id, text="No pending owner submissions.")
+        return
+
+    state = {
+        "ids": [r[0] for r in rows],
+        "labels": {r[0]: f"· {r[6]} · {r[10]}" for r in rows if len(r) > 10},
+        "workers": {r[0]: r[1] for r in rows},
+        "selected": set(),
+        "page": 0,
+    }
+
+    context.user_data["bulk_review"] = state
+
+    log_block("BULK REVIEW OPEN")
+    log_line("PENDING", len(rows))
+
+    await context.bot.send_message(
+        chat_id=chat_id,
+        text=_bulk_text(state),
+        reply_markup=_bulk_keyboard(state)
+    )
+
+
+async def _notify_workers(context, done, decision):
+
+    limiter = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+    async def notify(worker_id, owner_id):
+        if not worker_id:
+            return
+        if decision == "APPROVED":
+            text = f"✅ Your submitted yard has been approved.\nOwner ID: {owner_id}"
+        else:
+            text = "❌ Your submitted yard was rejected by admin."
+        async with limiter:
+            await context.bot.send_message(chat_id=worker_id, text=text)
+
+    results = await asyncio.gather(
+        *[notify(worker_id, owner_id) for _, owner_id, worker_id in done],
+        return_exceptions=True
+    )
+
+    failed = [r for r in results if isinstance(r, Exception)]
+
+    if failed:
+        log_block("BULK NOTIFY ERRORS")
+        log_line("FAILED", len(failed))
+        log_line("FIRST_ERROR", repr(failed[0]))
+
+
+async def bulk_review_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    query = update.callback_query
+    await query.answer()
+
+    if str(query.from_user.id) not in [str(a) for a in ADMIN_IDS]:
+        return
+
+    state = context.user_data.get("bulk_review")
+
+    if not state:
+        await query.edit_message_text("⚠️ Bulk review expired. Open it again from the Accounts menu.")
+        return
+
+    parts = query.data.split("|")
+    action = parts[1] if len(parts) > 1 else ""
+    arg = parts[2] if len(parts) > 2 else ""
+
+    selected = state["selected"]
+    page_ids = state["ids"][state["page"] * BULK_PAGE_SIZE:(state["page"] + 1) * BULK_PAGE_SIZE]
+
+    if action == "T":
+        if arg in selected:
+            selected.discard(arg)
+        else:
+            selected.add(arg)
+
+    elif action == "P":
+        try:
+            state["page"] = int(arg)
+        except ValueError:
+            pass
+
+    elif action == "SP":
+        selected.update(page_ids)
+
+    elif action == "SA":
+        selected.update(state["ids"])
+
+    elif action == "C":
+        selected.clear()
+
+    elif action in ("A", "R"):
+
+        if not selected:
+            await query.edit_message_text(
+                "⚠️ Nothing selected.\n\n" + _bulk_text(state),
+                reply_markup=_bulk_keyboard(state)
+            )
+            return
+
+        decision = "APPROVED" if action == "A" else "REJECTED"
+        chosen = [sid for sid in state["ids"] if sid in selected]
+
+        log_block("BULK REVIEW " + decision)
+        log_line("COUNT", len(chosen))
+
+        await query.edit_message_text(f"⏳ Processing {len(chosen)} submissions...")
+
+        result = None
+
+        if ENABLE_SHEETS:
+            result = await run_sheet(context, review_owner_submissions, chosen, decision)
+
+        if not result:
+            await query.edit_message_text("⚠️ Bulk review failed. Nothing was changed — try again.")
+            return
+
+        done = result["done"]
+
+        action_type = "APPROVE_OWNER" if decision == "APPROVED" else "REJECT_OWNER"
+        for sid, owner_id, _ in done:
+            queue_log_action(query.from_user.id, "ADMIN", action_type, owner_id=owner_id, details=sid)
+
+        handled = {sid for sid, _, _ in done} | set(result["skipped"])
+        moderation_queue().mark_reviewed(list(handled))
+        state["ids"] = [sid for sid in state["ids"] if sid not in handled]
+        selected.clear()
+
+        verb = "approved" if decision == "APPROVED" else "rejected"
+        summary = f"{'✅' if decision == 'APPROVED' else '❌'} {len(done)} submissions {verb}."
+
+        if result["skipped"]:
+            summary += f"\n⚠️ {len(result['skipped'])} already processed or missing."
+
+        if state["ids"]:
+            await query.edit_message_text(summary + "\n\n" + _bulk_text(state), reply_markup=_bulk_keyboard(state))
+        else:
+            context.user_data.pop("bulk_review", None)
+            await query.edit_message_text(summary)
+
+        await _notify_workers(context, done, decision)
+        return
+
+    await query.edit_message_text(_bulk_text(state), reply_markup=_bulk_keyboard(state))
@@ -0,0 +1,314 @@
+import argparse
+import json
+import sys
+import threading
+import time
+
+from gspread.exceptions import APIError
+from gspread.utils import rowcol_to_a1
+
+from config import LOCAL_DB_PATH
+from local_db import open_db
+from sheets_logger import (
+    items_ws, index_ws, ITEMS_SCHEMA, INDEX_SCHEMA, structured_updates, batch_update_cells
+)
+
+
+# ================================
+# STRUCTURED FIELD BACKFILL
+# ================================
+# Offline job: re-parses RAW_CAPTION for every ITEMS_MASTER row with the
+# current caption_parser, decodes VIN_FULL (vin_decoder) and writes back only
+# the cells that changed, then mirrors MAKE / MODEL / YEAR / VIN into TRUCK_INDEX.
+#
+#   python backfill.py                   # fill empty fields, resume from checkpoint
+#   python backfill.py --overwrite       # also replace values that differ
+#   python backfill.py --below 0.5       # only rows with PARSE_CONFIDENCE < 0.5
+#   python backfill.py --dry-run --restart
+#
+# ITEMS_MASTER is read CHUNK_ROWS rows at a time (one range read), the
+# matching TRUCK_INDEX rows with one batch_get, and each chunk's changes go
+# out as batch_update calls of at most WRITE_CHUNK ranges. The next row to
+# process is stored in the local SQLite file after every chunk, so an
+# interrupted run picks up where it stopped. All Sheets calls go through a
+# per-minute limiter and back off on 429s.
+
+JOB = "caption_backfill"
+
+CHUNK_ROWS = 500
+WRITE_CHUNK = 2500
+CALLS_PER_MINUTE = 50
+MAX_RETRIES = 6
+
+# TRUCK_INDEX columns that mirror ITEMS_MASTER
+INDEX_MIRROR = ["VIN_FULL", "VIN_LAST6", "MAKE", "MODEL", "YEAR"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backfill_checkpoint (
+    job        TEXT PRIMARY KEY,
+    next_row   INTEGER NOT NULL,
+    stats      TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class RateLimiter:
+    # spaces calls evenly so a long run stays under the per-minute quota
+
+    def __init__(self, per_minute=CALLS_PER_MINUTE, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = self.clock()
+            delay = self._next - now
+
+            if delay > 0:
+                self.sleep(delay)
+                self.waited += delay
+                now += delay
+
+            self._next = now + self.interval
+
+    def call(self, fn, *args, **kwargs):
+        # rate-limited call; 429 / 5xx retried with exponential backoff
+        for attempt in range(MAX_RETRIES):
+            self.wait()
+
+            try:
+                return fn(*args, **kwargs)
+            except APIError as e:
+                code = e.code
+                if (code != 429 and code < 500) or attempt == MAX_RETRIES - 1:
+                    raise
+
+                delay = min(64, 2 ** attempt)
+                print(f"[BACKFILL] {code} on {getattr(fn, '__name__', fn)}, retrying in {delay}s")
+                self.sleep(delay)
+                self.waited += delay
+
+
+class Checkpoint:
+
+    def __init__(self, path=LOCAL_DB_PATH, job=JOB):
+        self.job = job
+        self._db = open_db(path)
+        self._db.executescript(_SCHEMA)
+
+    def load(self):
+        rows = self._db.execute(
+            "SELECT next_row, stats FROM backfill_checkpoint WHERE job = ?", (self.job,)
+        ).fetchall()
+
+        if not rows:
+            return 2, {}
+
+        return rows[0]["next_row"], json.loads(rows[0]["stats"])
+
+    def save(self, next_row, stats):
+        self._db.execute(
+            "INSERT OR REPLACE INTO backfill_checkpoint (job, next_row, stats, updated_at) VALUES (?, ?, ?, ?)",
+            (self.job, next_row, json.dumps(stats), time.time())
+        )
+
+    def reset(self):
+        self._db.execute("DELETE FROM backfill_checkpoint WHERE job = ?", (self.job,))
+
+
+_ITEM_ID = ITEMS_SCHEMA.index("ITEM_ID")
+_CONFIDENCE = ITEMS_SCHEMA.index("PARSE_CONFIDENCE")
+
+
+def _last_col(schema):
+    return rowcol_to_a1(1, len(schema)).rstrip("1")
+
+
+def _confidence(r):
+    try:
+        return float(r[_CONFIDENCE]) if len(r) > _CONFIDENCE and r[_CONFIDENCE] else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _index_updates(item_updates, item_ids, index_rows, index_block):
+    # mirrors item cell changes onto TRUCK_INDEX, skipping cells already equal
+    col = {name: i for i, name in enumerate(INDEX_SCHEMA)}
+    out = []
+
+    for row_i, field, value in item_updates:
+        if field not in INDEX_MIRROR:
+            continue
+
+        idx_row = index_rows.get(item_ids.get(row_i))
+        if not idx_row:
+            continue
+
+        current = index_block.get(idx_row, [])
+        if len(current) > col[field] and current[col[field]] == value:
+            continue
+
+        out.append((idx_row, field, value))
+
+    return out
+
+
+def _runs(rows):
+    # sorted row numbers -> [(first, last)] of consecutive runs
+    out = []
+    for r in sorted(rows):
+        if out and r == out[-1][1] + 1:
+            out[-1][1] = r
+        else:
+            out.append([r, r])
+    return out
+
+
+def _read_index_block(limiter, idx, wanted_rows):
+    # {index_row: values} for the rows this chunk touches, one batch_get
+    if not wanted_rows:
+        return {}
+
+    last = _last_col(INDEX_SCHEMA)
+    runs = _runs(wanted_rows)
+    blocks = limiter.call(idx.batch_get, [f"A{first}:{last}{end}" for first, end in runs])
+
+    out = {}
+    for (first, _), block in zip(runs, blocks):
+        for n, r in enumerate(block):
+            out[first + n] = r
+
+    return out
+
+
+def _write(limiter, ws, schema, updates, dry_run):
+    if dry_run:
+        return 0
+
+    calls = 0
+    for start in range(0, len(updates), WRITE_CHUNK):
+        limiter.call(batch_update_cells, ws, schema, updates[start:start + WRITE_CHUNK])
+        calls += 1
+
+    return calls
+
+
+def run_backfill(
+    overwrite=False,
+    below=None,
+    chunk_rows=CHUNK_ROWS,
+    calls_per_minute=CALLS_PER_MINUTE,
+    dry_run=False,
+    restart=False,
+    checkpoint=None,
+    limiter=None,
+    max_chunks=None,
+):
+    checkpoint = checkpoint or Checkpoint()
+    limiter = limiter or RateLimiter(calls_per_minute)
+
+    if restart:
+        checkpoint.reset()
+
+    start_row, stats = checkpoint.load()
+    stats = {"rows": 0, "changed_rows": 0, "item_cells": 0, "index_cells": 0, "write_calls": 0, **stats}
+
+    ws = items_ws()
+    idx = index_ws()
+    last = _last_col(ITEMS_SCHEMA)
+
+    # ITEM_ID -> TRUCK_INDEX row, one column read for the whole run
+    index_rows = {
+        v: i for i, v in enumerate(limiter.call(idx.col_values, 1)[1:], start=2) if v
+    }
+
+    # Sheets leaves trailing empty rows out of a read, so a short (or empty)
+    # chunk is not the end of the tab: stop on an empty read past the last
+    # ITEM_ID row
+    last_row = len(limiter.call(ws.col_values, _ITEM_ID + 1))
+
+    if start_row > 2:
+        print(f"[BACKFILL] resuming at row {start_row}")
+
+    row = start_row
+    chunks = 0
+    done = False
+
+    while max_chunks is None or chunks < max_chunks:
+
+        rows = limiter.call(ws.get, f"A{row}:{last}{row + chunk_rows - 1}")
+
+        if not rows and row > last_row:
+            done = True
+            break
+
+        selected = rows
+        if below is not None:
+            # keep row numbers aligned: blank out rows we are not re-parsing
+            selected = [r if _confidence(r) < below else [] for r in rows]
+
+        updates = structured_updates(selected, first_row=row, overwrite=overwrite)
+
+        item_ids = {row + n: (r[_ITEM_ID] if len(r) > _ITEM_ID else "") for n, r in enumerate(rows)}
+        wanted = {
+            index_rows[item_ids[r]]
+            for r, field, _ in updates
+            if field in INDEX_MIRROR and item_ids[r] in index_rows
+        }
+
+        index_block = _read_index_block(limiter, idx, wanted)
+        idx_updates = _index_updates(updates, item_ids, index_rows, index_block)
+
+        stats["write_calls"] += _write(limiter, ws, ITEMS_SCHEMA, updates, dry_run)
+        stats["write_calls"] += _write(limiter, idx, INDEX_SCHEMA, idx_updates, dry_run)
+
+        stats["rows"] += len(rows)
+        stats["changed_rows"] += len({r for r, f, _ in updates if f != "PARSE_CONFIDENCE"})
+        stats["item_cells"] += len(updates)
+        stats["index_cells"] += len(idx_updates)
+
+        row += chunk_rows
+        chunks += 1
+
+        if not dry_run:
+            checkpoint.save(row, stats)
+
+        print(f"[BACKFILL] rows {row - chunk_rows}-{row - 1}: {len(updates)} item cells, {len(idx_updates)} index cells")
+
+    stats["done"] = done
+    stats["next_row"] = row
+    stats["rate_limited_seconds"] = round(limiter.waited, 1)
+
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-parse RAW_CAPTION into ITEMS_MASTER / TRUCK_INDEX fields")
+    parser.add_argument("--overwrite", action="store_true", help="replace non-empty values that differ from the parse")
+    parser.add_argument("--below", type=float, help="only rows whose PARSE_CONFIDENCE is below this")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--calls-per-minute", type=int, default=CALLS_PER_MINUTE)
+    parser.add_argument("--dry-run", action="store_true", help="count changes, write nothing (checkpoint untouched)")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    args = parser.parse_args(argv)
+
+    stats = run_backfill(
+        overwrite=args.overwrite,
+        below=args.below,
+        chunk_rows=args.chunk_rows,
+        calls_per_minute=args.calls_per_minute,
+        dry_run=args.dry_run,
+        restart=args.restart,
+    )
+
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+import re
+from datetime import datetime
+
+from utils import safe_text, is_vin_17
+
+
+# ================================
+# CAPTION PARSER
+# ================================
+# Turns a finder's free-text caption ("2019 Pete 389 X15 450k miles ...")
+# into item fields. Everything the parser knows lives in the tables below;
+# adding a make, model or engine is a data change (register_make /
+# register_model / register_engine), never a new regex.
+#
+# One compiled tokenizer pass produces the tokens; phrases of up to
+# MAX_PHRASE tokens are looked up in a single dict built from the tables.
+
+# canonical make -> aliases
+MAKES = {
+    "Peterbilt": ["PETERBILT", "PETE"],
+    "Kenworth": ["KENWORTH", "KW"],
+    "Freightliner": ["FREIGHTLINER", "FREIGHTLINER CORP"],
+    "Volvo": ["VOLVO"],
+    "International": ["INTERNATIONAL", "INTL", "NAVISTAR"],
+    "Mack": ["MACK"],
+    "Western Star": ["WESTERN STAR", "WESTERNSTAR"],
+}
+
+# canonical make -> models (a model alone is enough to infer the make)
+MODELS = {
+    "Peterbilt": ["379", "389", "386", "387", "367", "567", "579", "579X"],
+    "Kenworth": ["T680", "T880", "T800", "T660", "W900", "W900L", "W990"],
+    "Freightliner": ["CASCADIA", "COLUMBIA", "CORONADO", "M2", "122SD"],
+    "Volvo": ["VNL", "VNL 860", "VNL 760", "VNL 670", "VNL 780", "VNR", "VHD"],
+    "International": ["LT", "LT625", "LONESTAR", "PROSTAR", "9900I", "9900", "HX"],
+    "Mack": ["ANTHEM", "PINNACLE", "GRANITE", "CHU613"],
+    "Western Star": ["4900", "5700", "5700XE", "49X", "57X"],
+}
+
+# canonical engine -> aliases (brand-only aliases map to the brand)
+ENGINES = {
+    "Cummins": ["CUMMINS"],
+    "Cummins ISX": ["ISX", "ISX15"],
+    "Cummins X15": ["X15"],
+    "Detroit": ["DETROIT", "DETROIT DIESEL"],
+    "Detroit DD13": ["DD13"],
+    "Detroit DD15": ["DD15"],
+    "Detroit DD16": ["DD16"],
+    "Detroit Series 60": ["SERIES 60", "S60"],
+    "PACCAR": ["PACCAR"],
+    "PACCAR MX-13": ["MX13", "MX-13"],
+    "PACCAR MX-11": ["MX11", "MX-11"],
+    "Caterpillar": ["CAT", "CATERPILLAR"],
+    "Caterpillar C15": ["C15"],
+    "Caterpillar C13": ["C13"],
+    "Caterpillar 3406": ["3406", "3406E"],
+    "Volvo D13": ["D13"],
+    "Volvo D16": ["D16"],
+    "Mack MP8": ["MP8"],
+    "Mack MP7": ["MP7"],
+    "MaxxForce": ["MAXXFORCE"],
+}
+
+MILE_UNITS = {"MILES", "MILE", "MI", "MILLAS", "MILLA"}
+KM_UNITS = {"KM", "KMS", "KILOMETROS", "KILOMETERS"}
+THOUSAND_WORDS = {"K", "MIL"}
+
+KM_TO_MILES = 0.621371
+MAX_PHRASE = 3
+
+YEAR_MIN = 1970
+
+# confidence weight per field found; conflicts subtract
+WEIGHTS = {
+    "make": 0.25,
+    "model": 0.20,
+    "year": 0.20,
+    "miles": 0.15,
+    "engine": 0.10,
+    "vin": 0.10,
+}
+CONFLICT_PENALTY = 0.15
+
+# words, numbers with thousands separators / decimals, and k/M suffixes
+_TOKEN = re.compile(r"[A-Z0-9]+(?:[-.,][A-Z0-9]+)*")
+_NUMBER = re.compile(r"^(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?(K|M)?$")
+
+# phrase -> [(kind, canonical, make)], e.g. "VNL 860" -> [("model", "VNL 860", "Volvo")]
+_LOOKUP = {}
+
+
+def _add_phrase(text, kind, value, make=None):
+    key = " ".join(_TOKEN.findall(text.upper()))
+    entry = (kind, value, make)
+    if key and entry not in _LOOKUP.get(key, []):
+        _LOOKUP.setdefault(key, []).append(entry)
+
+
+def register_make(name, aliases=()):
+    MAKES.setdefault(name, [])
+    for alias in [name, *aliases]:
+        if alias.upper() not in MAKES[name]:
+            MAKES[name].append(alias.upper())
+        _add_phrase(alias, "make", name)
+
+
+def register_model(make, model):
+    MODELS.setdefault(make, [])
+    if model.upper() not in MODELS[make]:
+        MODELS[make].append(model.upper())
+    _add_phrase(model, "model", model.upper(), make)
+
+
+def register_engine(name, aliases=()):
+    ENGINES.setdefault(name, [])
+    for alias in [name, *aliases]:
+        if alias.upper() not in ENGINES[name]:
+            ENGINES[name].append(alias.upper())
+        _add_phrase(alias, "engine", name)
+
+
+def _build_tables():
+    _LOOKUP.clear()
+
+    for make, aliases in MAKES.items():
+        _add_phrase(make, "make", make)
+        for a in aliases:
+            _add_phrase(a, "make", make)
+
+    for make, models in MODELS.items():
+        for m in models:
+            _add_phrase(m, "model", m, make)
+
+    for engine, aliases in ENGINES.items():
+        for a in aliases:
+            _add_phrase(a, "engine", engine)
+
+
+_build_tables()
+
+
+def tokenize(caption):
+    return _TOKEN.findall(safe_text(caption).upper())
+
+
+def _number(token):
+    m = _NUMBER.match(token)
+
+    if not m:
+        return None
+
+    whole = int(m.group(1).replace(",", ""))
+    frac = m.group(2)
+    value = float(f"{whole}.{frac}") if frac else whole
+
+    if m.group(3) == "K":
+        value *= 1000
+    elif m.group(3) == "M":
+        value *= 1000000
+
+    return int(value)
+
+
+def parse_caption(caption):
+    # {"year", "make", "model", "miles", "engine", "vin", "confidence", "conflicts"}
+    tokens = tokenize(caption)
+    n = len(tokens)
+
+    found = {"make": [], "model": [], "engine": [], "year": [], "miles": [], "vin": []}
+    max_year = datetime.now().year + 1
+
+    i = 0
+    while i < n:
+        tok = tokens[i]
+
+        # ---- dictionary phrases, longest first ----
+        matched = 0
+        for size in range(min(MAX_PHRASE, n - i), 0, -1):
+            key = tok if size == 1 else " ".join(tokens[i:i + size])
+            hits = _LOOKUP.get(key)
+            if hits:
+                for kind, value, make in hits:
+                    found[kind].append((value, make))
+                matched = size
+                break
+
+        # ---- VIN ----
+        if not matched and len(tok) == 17 and is_vin_17(tok) and not tok.isdigit():
+            found["vin"].append((tok, None))
+            i += 1
+            continue
+
+        # ---- numbers: miles / km / year ----
+        value = _number(tok) if tok[0].isdigit() else None
+
+        if value is not None:
+            nxt = tokens[i + 1] if i + 1 < n else ""
+            step = 1
+
+            # "450 K MILES" / "450 MIL MILLAS"
+            if nxt in THOUSAND_WORDS and i + 2 < n and (tokens[i + 2] in MILE_UNITS or tokens[i + 2] in KM_UNITS):
+                value *= 1000
+                nxt = tokens[i + 2]
+                step = 2
+
+            if nxt in MILE_UNITS:
+                found["miles"].append((value, None))
+                i += step + 1
+                continue
+
+            if nxt in KM_UNITS:
+                found["miles"].append((int(round(value * KM_TO_MILES)), None))
+                i += step + 1
+                continue
+
+            if len(tok) == 4 and tok.isdigit() and YEAR_MIN <= value <= max_year and not matched:
+                found["year"].append((tok, None))
+
+        i += max(matched, 1)
+
+    return _resolve(found)
+
+
+def _resolve(found):
+    out = {"year": "", "make": "", "model": "", "miles": "", "engine": "", "vin": "", "conflicts": []}
+
+    makes = list(dict.fromkeys(v for v, _ in found["make"]))
+    models = list(dict.fromkeys(found["model"]))
+    engines = list(dict.fromkeys(v for v, _ in found["engine"]))
+
+    # a token can be both a year and a model ("4900"); a known model wins
+    model_tokens = {v for v, _ in models}
+    years = [v for v, _ in found["year"] if v not in model_tokens]
+
+    if makes:
+        out["make"] = makes[0]
+        if len(makes) > 1:
+            out["conflicts"].append("make")
+
+    # prefer a model that belongs to the make
+    if models:
+        fitting = [m for m in models if not out["make"] or m[1] == out["make"]]
+        pick = fitting[0] if fitting else models[0]
+        out["model"] = pick[0]
+
+        if not out["make"]:
+            out["make"] = pick[1]
+        elif pick[1] != out["make"]:
+            out["conflicts"].append("model")
+
+    # specific engine ("Cummins X15") over brand-only ("Cummins")
+    if engines:
+        out["engine"] = max(engines, key=len)
+        brands = {e.split(" ")[0] for e in engines}
+        if len(brands) > 1:
+            out["conflicts"].append("engine")
+
+    if years:
+        out["year"] = years[0]
+        if len(set(years)) > 1:
+            out["conflicts"].append("year")
+
+    if found["miles"]:
+        out["miles"] = found["miles"][0][0]
+
+    if found["vin"]:
+        out["vin"] = found["vin"][0][0]
+
+    score = sum(w for field, w in WEIGHTS.items() if out[field])
+    score -= CONFLICT_PENALTY * len(out["conflicts"])
+    out["confidence"] = round(max(0.0, min(1.0, score)), 2)
+
+    return out
+
+
+def parse_many(captions):
+    return [parse_caption(c) for c in captions]
+
+
+# item field -> parser key, for writing results back to ITEMS_MASTER
+ITEM_FIELDS = {
+    "YEAR": "year",
+    "MAKE": "make",
+    "MODEL": "model",
+    "MILES": "miles",
+    "ENGINE": "engine",
+    "PARSE_CONFIDENCE": "confidence",
+}
+
+
+def item_fields(parsed):
+    # non-empty parser output as ITEMS_MASTER values
+    return {
+        col: str(parsed[key])
+        for col, key in ITEM_FIELDS.items()
+        if parsed[key] != "" and parsed[key] is not None
+    }
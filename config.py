@@ -22,6 +22,7 @@ WORKSHEET_OWNERS = os.environ.get("WORKSHEET_OWNERS", "OWNERS_MASTER")
 WORKSHEET_USERS = os.environ.get("WORKSHEET_USERS", "USERS_ROLES")
 WORKSHEET_LOG = os.environ.get("WORKSHEET_LOG", "ACTIVITY_LOG")
 WORKSHEET_TASKS = os.environ.get("WORKSHEET_TASKS", "TASKS_TODOS")
+WORKSHEET_ITEM_PHOTOS = os.environ.get("WORKSHEET_ITEM_PHOTOS", "ITEM_PHOTOS")
 
 # Business rules
 DAYS_CONFIRM_WINDOW = 30
@@ -31,3 +32,66 @@ DAYS_AUTO_HIDE = 40
 TASK_REMINDER_FREQUENCY_MIN = 60
 TASK_POLL_SECONDS = 60
 STALE_CHECK_SECONDS = 3600
+
+# Due-time heaps are rebuilt from the sheet this often to pick up manual edits
+DUE_INDEX_REBUILD_SECONDS = 6 * 3600
+
+# Local state (moderation queue etc.) survives restarts in this SQLite file
+LOCAL_DB_PATH = os.environ.get("LOCAL_DB_PATH", "vp_bot.sqlite3")
+REVIEWED_TOMBSTONE_DAYS = 7
+
+# Gatekeeper review: an item stays checked out to one gatekeeper this long
+REVIEW_LEASE_MINUTES = 10
+
+# Optional local copy of every claimed photo (empty = disabled)
+PHOTO_ARCHIVE_DIR = os.environ.get("PHOTO_ARCHIVE_DIR", "").strip()
+PHOTO_ARCHIVE_CONCURRENCY = int(os.environ.get("PHOTO_ARCHIVE_CONCURRENCY", "4"))
+PHOTO_ARCHIVE_SECONDS = 300
+
+# Columnar snapshots of every tab (snapshot.py); the scheduled export only
+# runs when SNAPSHOT_EXPORT_SECONDS is set
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_EXPORT_SECONDS = int(os.environ.get("SNAPSHOT_EXPORT_SECONDS", "0"))
+
+# Buffered ACTIVITY_LOG rows are appended this often (one append_rows)
+LOG_FLUSH_SECONDS = 30
+
+# REPORTS daily digest to the admins, local time (LOCAL_TZ)
+REPORT_DIGEST_HOUR = int(os.environ.get("REPORT_DIGEST_HOUR", "8"))
+
+# ACTIVITY_LOG rotation (log_archive.py): rows older than LOG_KEEP_DAYS move
+# to monthly ACTIVITY_LOG_YYYY_MM tabs (in LOG_ARCHIVE_SPREADSHEET_ID when set)
+# and to compressed files under LOG_ARCHIVE_DIR. LOG_KEEP_DAYS=0 disables it.
+LOG_KEEP_DAYS = int(os.environ.get("LOG_KEEP_DAYS", "30"))
+LOG_ARCHIVE_SPREADSHEET_ID = os.environ.get("LOG_ARCHIVE_SPREADSHEET_ID", "").strip()
+LOG_ARCHIVE_DIR = os.environ.get("LOG_ARCHIVE_DIR", "log_archive")
+LOG_ROTATE_SECONDS = 24 * 3600
+
+# Sheet capacity (sheet_capacity.py). A spreadsheet holds at most
+# SHEET_CELL_LIMIT cells, counted over every tab's whole grid (rows x cols,
+# empty or not). New tabs start at TAB_INITIAL_ROWS and the capacity check
+# grows a tab by at least TAB_GROW_ROWS once fewer than TAB_HEADROOM_DAYS of
+# its growth are left, instead of the grid creeping up one append at a time.
+SHEET_CELL_LIMIT = 10_000_000
+TAB_INITIAL_ROWS = 1000
+TAB_GROW_ROWS = 5000
+TAB_HEADROOM_DAYS = 30
+CAPACITY_CHECK_SECONDS = 6 * 3600
+CAPACITY_HISTORY_DAYS = 90
+
+# Item shards: with ITEM_SHARD_BY=YEAR (or STATUS), SOLD / HIDDEN items not
+# updated for ITEM_SHARD_AFTER_DAYS move from ITEMS_MASTER to
+# ITEMS_MASTER_<year created> (or ITEMS_MASTER_<status>) tabs. Keep it set
+# once shards exist, lookups only search shards while it is.
+ITEM_SHARD_BY = os.environ.get("ITEM_SHARD_BY", "").strip().upper()
+ITEM_SHARD_AFTER_DAYS = int(os.environ.get("ITEM_SHARD_AFTER_DAYS", "180"))
+
+# Storage backend (storage.py): "sheets" keeps everything in SPREADSHEET_ID;
+# "sqlite" (STORAGE_DSN is a file path) or "postgres" (STORAGE_DSN is a
+# connection string, needs psycopg) keep the same tabs in a database. With a
+# database backend, SHEETS_MIRROR=1 replays every write on the spreadsheet
+# every MIRROR_FLUSH_SECONDS so the office keeps a (read-only) copy.
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "sheets").strip().lower()
+STORAGE_DSN = os.environ.get("STORAGE_DSN", "vp_store.sqlite3")
+SHEETS_MIRROR = os.environ.get("SHEETS_MIRROR", "").strip().lower() in ("1", "true", "yes")
+MIRROR_FLUSH_SECONDS = 15
@@ -0,0 +1,100 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+# ================================
+# DUE-TIME PRIORITY QUEUE
+# ================================
+# Min-heap of (due_time, version, key) with lazy invalidation: set() and
+# remove() are O(log n) / O(1) and never search the heap, superseded
+# entries are skipped when they surface in pop_due(). The heap is rebuilt
+# from the live entries once stale tuples outnumber them.
+
+class DueIndex:
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}          # key -> (due, version, payload)
+        self._versions = itertools.count()
+        self._lock = threading.Lock()
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    def age(self):
+        return time.monotonic() - self.loaded_at if self.loaded else None
+
+    def load(self, items):
+        # items: iterable of (key, due, payload); replaces everything
+        with self._lock:
+            self._entries = {}
+            self._heap = []
+
+            for key, due, payload in items:
+                v = next(self._versions)
+                self._entries[key] = (due, v, payload)
+                self._heap.append((due, v, key))
+
+            heapq.heapify(self._heap)
+            self.loaded_at = time.monotonic()
+
+    def set(self, key, due, payload=None):
+        with self._lock:
+            v = next(self._versions)
+            self._entries[key] = (due, v, payload)
+            heapq.heappush(self._heap, (due, v, key))
+            self._maybe_compact()
+
+    def remove(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        return (entry[0], entry[2]) if entry else None
+
+    def peek(self):
+        with self._lock:
+            self._drop_stale_top()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now, limit=None):
+        out = []
+
+        with self._lock:
+            while self._heap and (limit is None or len(out) < limit):
+                self._drop_stale_top()
+
+                if not self._heap or self._heap[0][0] > now:
+                    break
+
+                due, v, key = heapq.heappop(self._heap)
+                _, _, payload = self._entries.pop(key)
+                out.append((key, due, payload))
+
+        return out
+
+    def _drop_stale_top(self):
+        while self._heap:
+            due, v, key = self._heap[0]
+            entry = self._entries.get(key)
+
+            if entry and entry[1] == v:
+                return
+
+            heapq.heappop(self._heap)
+
+    def _maybe_compact(self):
+        if len(self._heap) > 2 * len(self._entries) + 1024:
+            self._heap = [(due, v, key) for key, (due, v, _) in self._entries.items()]
+            heapq.heapify(self._heap)
@@ -0,0 +1,282 @@
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from vin_decoder import decode_vin
+
+
+# ================================
+# DUPLICATE TRUCK INDEX
+# ================================
+# In-memory similarity index over TRUCK_INDEX. Each truck is filed under a
+# few blocking keys; a lookup only scores trucks sharing at least one key:
+#
+#   V0/V1/V2   the VIN cut in three: two typos leave one part intact
+#   L6         VIN_LAST6 (the serial, what sellers quote)
+#   MYO        make + year + owner (same truck re-posted without a VIN)
+#   MMY        make + model + year (same truck from another owner)
+#
+# Blocks larger than MAX_BLOCK (e.g. every 2019 Cascadia) are skipped; the
+# VIN keys still cover those trucks. Two different VINs that both pass the
+# check digit are two trucks: a typo almost never keeps it valid, while a
+# fleet's VINs differ only in the last digits of the serial.
+
+MAX_BLOCK = 400
+MAX_VIN_DISTANCE = 3
+MIN_SCORE = 0.5
+CLUSTER_SCORE = 0.7
+
+# make/model/year/owner/miles alone add up to _ATTRIBUTE_MAX, so clustering
+# above it only needs the VIN blocks
+_ATTRIBUTE_MAX = 0.4
+_VIN_KEYS = {"V0", "V1", "V2", "L6"}
+
+# score for a VIN edit distance of 0, 1, 2, 3
+_VIN_SCORES = [1.0, 0.8, 0.65, 0.5]
+
+
+def vin_distance(a, b, limit=MAX_VIN_DISTANCE):
+    # optimal string alignment distance (typo + adjacent swap), capped at limit + 1
+    if a == b:
+        return 0
+
+    if len(a) == len(b):
+        diff = sum(1 for x, y in zip(a, b) if x != y)
+        if diff <= 1:
+            return diff
+        # each swap fixes at most two mismatches
+        if diff > 2 * limit:
+            return limit + 1
+
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    prev2 = None
+    prev = list(range(len(b) + 1))
+
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+
+    return min(prev[-1], limit + 1)
+
+
+def _norm(value):
+    return str(value or "").strip().upper()
+
+
+def record(vin="", last6="", make="", model="", year="", owner="", miles=""):
+    vin = _norm(vin)
+    try:
+        miles = int(float(str(miles).replace(",", ""))) if miles not in ("", None) else None
+    except ValueError:
+        miles = None
+
+    return {
+        "vin": vin,
+        "vin_ok": bool(vin) and decode_vin(vin)["check_ok"],
+        "last6": _norm(last6) or (vin[-6:] if len(vin) >= 6 else ""),
+        "make": _norm(make),
+        "model": _norm(model),
+        "year": _norm(year),
+        "owner": _norm(owner),
+        "miles": miles,
+    }
+
+
+def _keys(rec):
+    keys = []
+    vin = rec["vin"]
+
+    if len(vin) == 17:
+        keys += [("V0", vin[:6]), ("V1", vin[6:11]), ("V2", vin[11:])]
+    if rec["last6"]:
+        keys.append(("L6", rec["last6"]))
+    if rec["make"] and rec["year"] and rec["owner"]:
+        keys.append(("MYO", rec["make"], rec["year"], rec["owner"]))
+    if rec["make"] and rec["model"] and rec["year"]:
+        keys.append(("MMY", rec["make"], rec["model"], rec["year"]))
+
+    return keys
+
+
+def score(a, b):
+    # (score 0..1, [reasons]) that a and b are the same truck
+    s = 0.0
+    reasons = []
+
+    if a["vin"] and b["vin"]:
+        if a["vin_ok"] and b["vin_ok"] and a["vin"] != b["vin"]:
+            return 0.0, ["different valid VINs"]
+
+        d = vin_distance(a["vin"], b["vin"])
+        if d <= MAX_VIN_DISTANCE:
+            s = _VIN_SCORES[d]
+            reasons.append("same VIN" if d == 0 else f"VIN {d} char{'s' if d > 1 else ''} off")
+        elif a["last6"] == b["last6"]:
+            s = 0.45
+            reasons.append("same VIN last 6")
+    elif a["last6"] and a["last6"] == b["last6"]:
+        s = 0.6
+        reasons.append("same VIN last 6")
+
+    for field, bonus in (("make", 0.05), ("year", 0.05), ("model", 0.05), ("owner", 0.15)):
+        if a[field] and a[field] == b[field]:
+            s += bonus
+            reasons.append(f"same {field}")
+
+    if a["miles"] and b["miles"] and abs(a["miles"] - b["miles"]) <= 0.05 * max(a["miles"], b["miles"]):
+        s += 0.1
+        reasons.append("similar miles")
+
+    return round(min(s, 1.0), 3), reasons
+
+
+class DuplicateIndex:
+
+    def __init__(self):
+        self._records = {}                  # item_id -> record
+        self._blocks = defaultdict(set)     # key -> {item_id}
+        self._lock = threading.Lock()
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    def age(self):
+        return time.monotonic() - self.loaded_at if self.loaded else None
+
+    def load(self, items):
+        # items: iterable of (item_id, record); replaces everything
+        with self._lock:
+            self._records = {}
+            self._blocks = defaultdict(set)
+
+            for item_id, rec in items:
+                self._add(item_id, rec)
+
+            self.loaded_at = time.monotonic()
+
+    def _add(self, item_id, rec):
+        self._remove(item_id)
+        self._records[item_id] = rec
+        for k in _keys(rec):
+            self._blocks[k].add(item_id)
+
+    def _remove(self, item_id):
+        old = self._records.pop(item_id, None)
+        if old:
+            for k in _keys(old):
+                self._blocks[k].discard(item_id)
+                if not self._blocks[k]:
+                    del self._blocks[k]
+
+    def add(self, item_id, rec):
+        with self._lock:
+            self._add(item_id, rec)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove(item_id)
+
+    def get(self, item_id):
+        return self._records.get(item_id)
+
+    def _candidate_ids(self, rec):
+        out = set()
+        for k in _keys(rec):
+            block = self._blocks.get(k)
+            if block and len(block) <= MAX_BLOCK:
+                out |= block
+        return out
+
+    def candidates(self, rec, exclude=None, limit=5, min_score=MIN_SCORE):
+        # [(score, item_id, reasons)] best first
+        with self._lock:
+            ids = self._candidate_ids(rec)
+            ids.discard(exclude)
+            scored = [(score(rec, self._records[i]), i) for i in ids]
+
+        out = [(s, i, reasons) for (s, reasons), i in scored if s >= min_score]
+        out.sort(key=lambda x: (-x[0], x[1]))
+        return out[:limit]
+
+    def clusters(self, min_score=CLUSTER_SCORE):
+        # groups of item_ids that look like the same truck (union-find over block pairs)
+        with self._lock:
+            parent = {}
+
+            def find(x):
+                root = parent.setdefault(x, x)
+                while parent[root] != root:
+                    root = parent[root]
+                while parent[x] != root:
+                    parent[x], x = root, parent[x]
+                return root
+
+            for key, block in self._blocks.items():
+                if len(block) < 2 or len(block) > MAX_BLOCK:
+                    continue
+                if min_score > _ATTRIBUTE_MAX and key[0] not in _VIN_KEYS:
+                    continue
+
+                members = sorted(block)
+                for n, a in enumerate(members):
+                    for b in members[n + 1:]:
+                        ra, rb = find(a), find(b)
+                        if ra == rb:
+                            continue
+
+                        if score(self._records[a], self._records[b])[0] >= min_score:
+                            parent[max(ra, rb)] = min(ra, rb)
+
+            groups = defaultdict(list)
+            for item_id in parent:
+                groups[find(item_id)].append(item_id)
+
+        return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g[0]))
+
+
+def main(argv=None):
+    # batch mode: cluster every truck in TRUCK_INDEX
+    #   python dup_index.py [--min-score 0.7] [--json clusters.json]
+    import argparse
+    import json
+    from sheets_logger import load_duplicate_index, DUP_INDEX
+
+    parser = argparse.ArgumentParser(description="Cluster likely duplicate trucks in TRUCK_INDEX")
+    parser.add_argument("--min-score", type=float, default=CLUSTER_SCORE)
+    parser.add_argument("--json", help="write clusters with their records to this file")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    n = load_duplicate_index(with_miles=True)
+    groups = DUP_INDEX.clusters(args.min_score)
+
+    print(f"{n} trucks, {len(groups)} clusters ({sum(len(g) for g in groups)} items) in {time.perf_counter() - t0:.1f}s")
+
+    for g in groups:
+        recs = [DUP_INDEX.get(i) for i in g]
+        print("  " + " | ".join(f"{i} {r['vin'] or '…' + r['last6']} {r['owner']}" for i, r in zip(g, recs)))
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump([{i: DUP_INDEX.get(i) for i in g} for g in groups], fh, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
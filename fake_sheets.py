@@ -0,0 +1,357 @@
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+from gspread.exceptions import APIError, WorksheetNotFound
+
+
+# ================================
+# IN-MEMORY GSPREAD FAKE
+# ================================
+# Drop-in replacement for the gspread client used by sheets_logger / users:
+#
+#   import sheets_logger, users
+#   fake = FakeClient(latency=0.05)
+#   sheets_logger._CLIENT = fake
+#   users._CLIENT = fake
+#
+# Every method that would hit the Sheets API goes through FakeClient._api,
+# which sleeps for the injected latency, may raise a 429 quota error and
+# counts the call as a READ or WRITE.
+
+_A1_CELL = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+def col_to_index(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+def index_to_col(n: int) -> str:
+    out = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        out = chr(65 + rem) + out
+    return out
+
+
+def parse_a1(range_name: str):
+    # returns (row1, col1, row2, col2), None meaning open-ended
+    if "!" in range_name:
+        range_name = range_name.split("!", 1)[1]
+
+    range_name = range_name.replace("$", "").upper()
+    parts = range_name.split(":")
+
+    m1 = _A1_CELL.match(parts[0])
+    m2 = _A1_CELL.match(parts[1] if len(parts) > 1 else parts[0])
+
+    if not m1 or not m2:
+        raise ValueError(f"Bad A1 range: {range_name}")
+
+    c1 = col_to_index(m1.group(1)) if m1.group(1) else 1
+    r1 = int(m1.group(2)) if m1.group(2) else 1
+    c2 = col_to_index(m2.group(1)) if m2.group(1) else None
+    r2 = int(m2.group(2)) if m2.group(2) else None
+
+    return r1, c1, r2, c2
+
+
+class _QuotaResponse:
+
+    status_code = 429
+    text = "Quota exceeded"
+
+    def json(self):
+        return {
+            "error": {
+                "code": 429,
+                "message": "Quota exceeded for quota metric 'Read requests' (fake)",
+                "status": "RESOURCE_EXHAUSTED"
+            }
+        }
+
+
+class FakeClient:
+
+    def __init__(self, latency=0.0, latency_per_kcell=0.0, quota_error_rate=0.0, seed=None):
+        self.latency = latency
+        self.latency_per_kcell = latency_per_kcell
+        self.quota_error_rate = quota_error_rate
+        self.calls = Counter()
+        self.spreadsheets = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _api(self, kind, method, cells=0):
+        delay = self.latency + self.latency_per_kcell * (cells / 1000.0)
+
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            self.calls[kind] += 1
+            self.calls[method] += 1
+
+            if self.quota_error_rate and self._rng.random() < self.quota_error_rate:
+                self.calls["QUOTA_ERROR"] += 1
+                raise APIError(_QuotaResponse())
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls.clear()
+
+    def open_by_key(self, key):
+        self._api("READ", "open_by_key")
+
+        if key not in self.spreadsheets:
+            self.spreadsheets[key] = FakeSpreadsheet(self, key)
+
+        return self.spreadsheets[key]
+
+
+class FakeSpreadsheet:
+
+    def __init__(self, client, key):
+        self.client = client
+        self.id = key
+        self._sheets = {}
+
+    def worksheet(self, title):
+        self.client._api("READ", "worksheet")
+
+        if title not in self._sheets:
+            raise WorksheetNotFound(title)
+
+        return self._sheets[title]
+
+    def worksheets(self):
+        self.client._api("READ", "worksheets")
+        return list(self._sheets.values())
+
+    def add_worksheet(self, title, rows=1000, cols=26, index=None):
+        self.client._api("WRITE", "add_worksheet")
+
+        ws = FakeWorksheet(self, title, int(rows), int(cols))
+        self._sheets[title] = ws
+        return ws
+
+    def del_worksheet(self, worksheet):
+        self.client._api("WRITE", "del_worksheet")
+        self._sheets.pop(worksheet.title, None)
+
+    def _by_id(self, sheet_id):
+        return next(ws for ws in self._sheets.values() if ws.id == sheet_id)
+
+    def values_batch_get(self, ranges, params=None):
+        # "'TAB'!A:A" ranges across tabs, shaped like the values.batchGet reply
+        out = []
+
+        for rng in ranges:
+            title = rng.split("!", 1)[0].strip("'") if "!" in rng else next(iter(self._sheets))
+            ws = self._sheets[title]
+            out.append({"range": rng, "majorDimension": "ROWS", "values": ws._slice(*parse_a1(rng))})
+
+        self.client._api("READ", "values_batch_get", sum(len(r) for v in out for r in v["values"]))
+        return {"spreadsheetId": self.id, "valueRanges": out}
+
+    def batch_update(self, body):
+        # only deleteDimension (ROWS) requests, applied in order like the API does
+        self.client._api("WRITE", "batch_update")
+
+        for request in body.get("requests", []):
+            rng = request["deleteDimension"]["range"]
+            ws = self._by_id(rng["sheetId"])
+
+            with ws._lock:
+                del ws._rows[rng["startIndex"]:rng["endIndex"]]
+                ws.row_count -= rng["endIndex"] - rng["startIndex"]
+
+        return {"spreadsheetId": self.id, "replies": [{} for _ in body.get("requests", [])]}
+
+    # ---- seeding helpers (no API cost) ----
+
+    def seed(self, title, header, rows=(), sheet_rows=5000, sheet_cols=60):
+        ws = self._sheets.get(title)
+
+        if ws is None:
+            ws = FakeWorksheet(self, title, sheet_rows, sheet_cols)
+            self._sheets[title] = ws
+
+        ws._rows = [list(header)] + [list(r) for r in rows]
+        ws.row_count = max(ws.row_count, len(ws._rows))
+        return ws
+
+
+class FakeWorksheet:
+
+    _ids = iter(range(1, 1 << 30))
+
+    def __init__(self, spreadsheet, title, rows, cols):
+        self.spreadsheet = spreadsheet
+        self.id = next(FakeWorksheet._ids)
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self._rows = []
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        return self.spreadsheet.client
+
+    def _cells(self):
+        return sum(len(r) for r in self._rows)
+
+    def _ensure(self, row, col):
+        while len(self._rows) < row:
+            self._rows.append([])
+
+        r = self._rows[row - 1]
+
+        while len(r) < col:
+            r.append("")
+
+        return r
+
+    def _slice(self, r1, c1, r2, c2):
+        r2 = r2 or len(self._rows)
+        out = []
+
+        for r in self._rows[r1 - 1:r2]:
+            part = r[c1 - 1:c2] if c2 else r[c1 - 1:]
+            part = [str(v) for v in part]
+
+            while part and part[-1] == "":
+                part.pop()
+
+            out.append(part)
+
+        while out and not out[-1]:
+            out.pop()
+
+        return out
+
+    # ---------------- READS ----------------
+
+    def row_values(self, row):
+        self.client._api("READ", "row_values")
+
+        out = self._slice(row, 1, row, None)
+        return out[0] if out else []
+
+    def col_values(self, col):
+        self.client._api("READ", "col_values", len(self._rows))
+
+        out = [str(r[col - 1]) if len(r) >= col else "" for r in self._rows]
+
+        while out and out[-1] == "":
+            out.pop()
+
+        return out
+
+    def get_all_values(self):
+        self.client._api("READ", "get_all_values", self._cells())
+
+        width = max((len(r) for r in self._rows), default=0)
+
+        return [[str(v) for v in r] + [""] * (width - len(r)) for r in self._rows]
+
+    def get(self, range_name=None):
+        if range_name is None:
+            self.client._api("READ", "get", self._cells())
+            return self._slice(1, 1, None, None)
+
+        r1, c1, r2, c2 = parse_a1(range_name)
+        out = self._slice(r1, c1, r2, c2)
+        self.client._api("READ", "get", sum(len(r) for r in out))
+        return out
+
+    def batch_get(self, ranges):
+        out = [self._slice(*parse_a1(rng)) for rng in ranges]
+        self.client._api("READ", "batch_get", sum(len(r) for block in out for r in block))
+        return out
+
+    # ---------------- WRITES ----------------
+
+    def _append_response(self, first, rows):
+        # shaped like the values.append reply gspread returns
+        width = max((len(r) for r in rows), default=1) or 1
+        last = first + len(rows) - 1
+        return {
+            "updates": {
+                "updatedRange": f"'{self.title}'!A{first}:{index_to_col(width)}{last}",
+                "updatedRows": len(rows),
+            }
+        }
+
+    def append_row(self, values, value_input_option="RAW"):
+        return self.append_rows([values], value_input_option, _method="append_row")
+
+    def append_rows(self, values, value_input_option="RAW", _method="append_rows"):
+        self.client._api("WRITE", _method)
+
+        rows = [[str(v) if v is not None else "" for v in row] for row in values]
+
+        with self._lock:
+            first = len(self._rows) + 1
+            self._rows.extend(rows)
+            self.row_count = max(self.row_count, len(self._rows))
+
+        return self._append_response(first, rows)
+
+    def update_cell(self, row, col, value):
+        self.client._api("WRITE", "update_cell")
+
+        with self._lock:
+            self._ensure(row, col)[col - 1] = str(value)
+
+    def update(self, values, range_name=None, **kwargs):
+        # gspread 6 order: values first, range defaults to the top-left cell
+        self.client._api("WRITE", "update")
+
+        with self._lock:
+            self._write_block(range_name or "A1", values)
+
+    def batch_update(self, data, **kwargs):
+        self.client._api("WRITE", "batch_update")
+
+        with self._lock:
+            for block in data:
+                self._write_block(block["range"], block["values"])
+
+    def _write_block(self, range_name, values):
+        r1, c1, _, _ = parse_a1(range_name)
+
+        for dr, row in enumerate(values):
+            for dc, v in enumerate(row):
+                self._ensure(r1 + dr, c1 + dc)[c1 + dc - 1] = str(v)
+
+        self.row_count = max(self.row_count, len(self._rows))
+
+    def add_rows(self, rows):
+        self.client._api("WRITE", "add_rows")
+        self.row_count += int(rows)
+
+    def resize(self, rows=None, cols=None):
+        self.client._api("WRITE", "resize")
+
+        if rows is not None:
+            self.row_count = int(rows)
+            del self._rows[self.row_count:]
+
+        if cols is not None:
+            self.col_count = int(cols)
+
+    def delete_rows(self, start_index, end_index=None):
+        self.client._api("WRITE", "delete_rows")
+
+        end_index = end_index or start_index
+
+        with self._lock:
+            del self._rows[start_index - 1:end_index]
+            self.row_count -= end_index - start_index + 1
@@ -0,0 +1,323 @@
+import asyncio
+import hashlib
+import itertools
+import threading
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# ================================
+# FAKE TELEGRAM OBJECTS
+# ================================
+# Just enough of the python-telegram-bot surface for route_message,
+# callback_router and the wizards in accounts.py / items.py to run
+# without a bot token. Every outgoing Bot call is counted in bot.calls.
+
+_MESSAGE_IDS = itertools.count(1000)
+_FILE_IDS = itertools.count(1)
+
+
+class FakeUser:
+
+    def __init__(self, user_id, username="", full_name=""):
+        self.id = int(user_id)
+        self.username = username or f"user{user_id}"
+        self.full_name = full_name or f"User {user_id}"
+
+
+class FakeChat:
+
+    def __init__(self, chat_id):
+        self.id = int(chat_id)
+
+
+class FakeLocation:
+
+    def __init__(self, latitude, longitude):
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+class FakePhotoSize:
+
+    def __init__(self, file_id, file_unique_id, width, height, file_size=0):
+        self.file_id = file_id
+        self.file_unique_id = file_unique_id
+        self.width = width
+        self.height = height
+        self.file_size = file_size
+
+
+def fake_photo_sizes(unique=None):
+    n = next(_FILE_IDS)
+    unique = unique or f"U{n:08d}"
+
+    # Telegram sends every size, smallest first
+    return [
+        FakePhotoSize(f"F{n:08d}-s", unique + "s", 90, 68, 1500),
+        FakePhotoSize(f"F{n:08d}-m", unique + "m", 320, 240, 18000),
+        FakePhotoSize(f"F{n:08d}-x", unique, 1280, 960, 160000),
+    ]
+
+
+def fake_photo_bytes(key):
+    # stable pseudo-JPEG payload per key
+    seed = hashlib.sha256(str(key).encode()).digest()
+    return b"\xff\xd8\xff\xe0" + seed * 64 + b"\xff\xd9"
+
+
+class FakeFile:
+
+    def __init__(self, file_id, base_url=None):
+        self.file_id = file_id
+        self.file_path = f"{base_url or 'https://api.telegram.org/file/botFAKE/photos'}/{file_id}.jpg"
+        self._local = base_url is None
+
+    async def download_as_bytearray(self, **kwargs):
+        if self._local:
+            return bytearray(fake_photo_bytes(self.file_id))
+
+        def fetch():
+            with urllib.request.urlopen(self.file_path, timeout=10) as resp:
+                return bytearray(resp.read())
+
+        return await asyncio.get_running_loop().run_in_executor(None, fetch)
+
+
+class FakeFileServer:
+    # Local HTTP server standing in for api.telegram.org/file. Serves
+    # fake_photo_bytes(content_key) for /<file_id>.jpg; `same_as` maps a
+    # file_id to another one's content (re-uploaded picture) and `broken`
+    # file_ids answer 500.
+    #
+    #   with FakeFileServer() as server:
+    #       bot = FakeBot(file_base_url=server.url)
+
+    def __init__(self):
+        self.same_as = {}
+        self.broken = set()
+        self.hits = Counter()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                file_id = self.path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+                server.hits[file_id] += 1
+
+                if file_id in server.broken:
+                    self.send_error(500)
+                    return
+
+                body = fake_photo_bytes(server.same_as.get(file_id, file_id))
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        return False
+
+
+class FakeSentMessage:
+
+    def __init__(self, bot, chat_id, text="", photo=None):
+        self.message_id = next(_MESSAGE_IDS)
+        self.chat = FakeChat(chat_id)
+        self.chat_id = int(chat_id)
+        self.text = text
+        self.photo = photo or []
+        self._bot = bot
+
+
+class FakeBot:
+
+    def __init__(self, latency=0.0, file_base_url=None):
+        self.latency = latency
+        self.file_base_url = file_base_url
+        self.calls = Counter()
+        self.sent = []
+
+    async def _api(self, method):
+        self.calls[method] += 1
+        self.calls["TOTAL"] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def reset_calls(self):
+        self.calls.clear()
+        self.sent.clear()
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await self._api("send_message")
+        msg = FakeSentMessage(self, chat_id, text)
+        self.sent.append(msg)
+        return msg
+
+    async def send_photo(self, chat_id, photo, caption=None, **kwargs):
+        await self._api("send_photo")
+        msg = FakeSentMessage(self, chat_id, caption or "")
+        self.sent.append(msg)
+        return msg
+
+    async def send_media_group(self, chat_id, media, **kwargs):
+        await self._api("send_media_group")
+        out = [FakeSentMessage(self, chat_id) for _ in media]
+        self.sent.extend(out)
+        return out
+
+    async def delete_message(self, chat_id, message_id, **kwargs):
+        await self._api("delete_message")
+        return True
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, **kwargs):
+        await self._api("edit_message_text")
+        return True
+
+    async def edit_message_reply_markup(self, chat_id=None, message_id=None, **kwargs):
+        await self._api("edit_message_reply_markup")
+        return True
+
+    async def answer_callback_query(self, callback_query_id, **kwargs):
+        await self._api("answer_callback_query")
+        return True
+
+    async def get_file(self, file_id, **kwargs):
+        await self._api("get_file")
+        return FakeFile(file_id, self.file_base_url)
+
+
+class FakeMessage:
+
+    def __init__(self, bot, user, chat, text=None, caption=None, photo=None,
+                 location=None, media_group_id=None):
+        self._bot = bot
+        self.message_id = next(_MESSAGE_IDS)
+        self.from_user = user
+        self.chat = chat
+        self.chat_id = chat.id
+        self.text = text
+        self.caption = caption
+        self.photo = photo or []
+        self.location = location
+        self.media_group_id = media_group_id
+
+    async def reply_text(self, text, **kwargs):
+        return await self._bot.send_message(self.chat.id, text, **kwargs)
+
+    async def reply_photo(self, photo, caption=None, **kwargs):
+        return await self._bot.send_photo(self.chat.id, photo, caption=caption, **kwargs)
+
+
+class FakeCallbackQuery:
+
+    def __init__(self, bot, user, message, data):
+        self._bot = bot
+        self.id = str(next(_MESSAGE_IDS))
+        self.from_user = user
+        self.message = message
+        self.data = data
+
+    async def answer(self, text=None, show_alert=False, **kwargs):
+        return await self._bot.answer_callback_query(self.id, text=text, show_alert=show_alert)
+
+    async def edit_message_text(self, text, **kwargs):
+        return await self._bot.edit_message_text(text, self.message.chat.id, self.message.message_id)
+
+    async def edit_message_reply_markup(self, reply_markup=None, **kwargs):
+        return await self._bot.edit_message_reply_markup(self.message.chat.id, self.message.message_id)
+
+    async def delete_message(self, **kwargs):
+        return await self._bot.delete_message(self.message.chat.id, self.message.message_id)
+
+
+class FakeUpdate:
+
+    def __init__(self, user, chat, message=None, callback_query=None):
+        self.effective_user = user
+        self.effective_chat = chat
+        self.message = message
+        self.callback_query = callback_query
+
+
+class FakeApplication:
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.bot_data = {}
+        self.job_queue = None
+
+
+class FakeContext:
+
+    def __init__(self, application, user_data):
+        self.application = application
+        self.bot = application.bot
+        self.bot_data = application.bot_data
+        self.user_data = user_data
+        self.error = None
+        self.job = None
+
+
+# ================================
+# SYNTHETIC UPDATE GENERATOR
+# ================================
+class UpdateFactory:
+
+    def __init__(self, bot=None):
+        self.bot = bot or FakeBot()
+        self.application = FakeApplication(self.bot)
+        self._user_data = {}
+
+    def context_for(self, user_id):
+        data = self._user_data.setdefault(str(user_id), {})
+        return FakeContext(self.application, data)
+
+    def _message(self, user_id, **kwargs):
+        user = FakeUser(user_id)
+        chat = FakeChat(user_id)
+        msg = FakeMessage(self.bot, user, chat, **kwargs)
+        return FakeUpdate(user, chat, message=msg)
+
+    def text(self, user_id, text):
+        return self._message(user_id, text=text)
+
+    def photo(self, user_id, caption=None, media_group_id=None, unique=None):
+        return self._message(
+            user_id,
+            caption=caption,
+            photo=fake_photo_sizes(unique),
+            media_group_id=media_group_id
+        )
+
+    def location(self, user_id, lat, lon):
+        return self._message(user_id, location=FakeLocation(lat, lon))
+
+    def callback(self, user_id, data, message_text=""):
+        user = FakeUser(user_id)
+        chat = FakeChat(user_id)
+        origin = FakeSentMessage(self.bot, user_id, message_text)
+        query = FakeCallbackQuery(self.bot, user, origin, data)
+        return FakeUpdate(user, chat, callback_query=query)
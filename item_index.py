@@ -0,0 +1,235 @@
+import heapq
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+
+
+# ================================
+# ITEMS_MASTER SECONDARY INDEXES
+# ================================
+# Equality indexes over a few ITEMS_SCHEMA columns. Every column keeps
+#
+#   value -> [(CREATED_AT, row), ...]   sorted, oldest first
+#
+# so a filter is answered from the smallest matching bucket, walked in
+# CREATED_AT order and checked against the other filters; nothing scans the
+# sheet. A filter value may be a list/set (IN). Sort keys are shared between
+# buckets, so each extra column costs one list slot per row.
+#
+#   idx.query({"ITEM_STATUS": "PENDING_REVIEW"}, limit=1)        # oldest pending
+#   idx.query({"FINDER_WORKER_ID": uid}, descending=True, offset=20, limit=10)
+#   idx.count({"MAKE": "Peterbilt", "YEAR": ["2019", "2020"]})
+
+
+_SLICE = 256
+
+
+class ItemIndex:
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._rows = {}                                 # row -> (key, item_id, {column: value})
+        self._buckets = {c: {} for c in self.columns}   # column -> value -> [key]
+        self._lock = threading.RLock()
+        self.loaded_at = None
+        self.version = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    def age(self):
+        return time.monotonic() - self.loaded_at if self.loaded else None
+
+    @staticmethod
+    def _value(v):
+        # low-cardinality strings: intern so 500k rows share one copy per value
+        return sys.intern(str(v).strip()) if v not in (None, "") else ""
+
+    def load(self, entries):
+        # entries: iterable of (row, item_id, created_at, {column: value}); replaces everything
+        rows = {}
+        buckets = {c: {} for c in self.columns}
+        canon = {}
+
+        for row, item_id, created_at, values in entries:
+            key = (created_at or "", row)
+            vals = {}
+
+            for c in self.columns:
+                raw = values.get(c)
+                v = canon.get(raw)
+                if v is None:
+                    v = canon[raw] = self._value(raw)
+                vals[c] = v
+
+                bucket = buckets[c].get(v)
+                if bucket is None:
+                    bucket = buckets[c][v] = []
+                bucket.append(key)
+
+            rows[row] = (key, item_id, vals)
+
+        for per_value in buckets.values():
+            for bucket in per_value.values():
+                bucket.sort()
+
+        with self._lock:
+            self._rows = rows
+            self._buckets = buckets
+            self.loaded_at = time.monotonic()
+            self.version += 1
+
+    def _unlink(self, row):
+        old = self._rows.pop(row, None)
+
+        if not old:
+            return
+
+        key, _, vals = old
+        for c, v in vals.items():
+            bucket = self._buckets[c].get(v)
+            if not bucket:
+                continue
+            i = bisect_left(bucket, key)
+            if i < len(bucket) and bucket[i] == key:
+                del bucket[i]
+            if not bucket:
+                del self._buckets[c][v]
+
+    def set(self, row, item_id, created_at, values):
+        # values: the full row's indexed columns (missing ones are indexed as "")
+        with self._lock:
+            self._unlink(row)
+
+            key = (created_at or "", row)
+            vals = {c: self._value(values.get(c)) for c in self.columns}
+            self._rows[row] = (key, item_id, vals)
+
+            for c, v in vals.items():
+                insort(self._buckets[c].setdefault(v, []), key)
+
+            self.version += 1
+
+    def update(self, row, changes):
+        # changes: {column: new value}; only indexed columns are looked at
+        with self._lock:
+            old = self._rows.get(row)
+            if not old:
+                return False
+
+            key, item_id, vals = old
+            vals = {**vals, **{c: v for c, v in changes.items() if c in self._buckets}}
+            self.set(row, item_id, key[0], vals)
+            return True
+
+    def remove(self, row):
+        with self._lock:
+            self._unlink(row)
+            self.version += 1
+
+    def get(self, row):
+        rec = self._rows.get(row)
+        return (rec[1], dict(rec[2])) if rec else None
+
+    # ---------- queries ----------
+
+    def _candidates(self, filters):
+        # (sorted keys of the most selective filter, remaining filters)
+        best, best_size, best_col = None, None, None
+
+        for c, want in filters.items():
+            per_value = self._buckets[c]
+
+            if isinstance(want, (list, tuple, set, frozenset)):
+                parts = [per_value.get(self._value(w), []) for w in set(want)]
+                size = sum(len(p) for p in parts)
+                keys = parts[0] if len(parts) == 1 else None
+            else:
+                parts = None
+                keys = per_value.get(self._value(want), [])
+                size = len(keys)
+
+            if best_size is None or size < best_size:
+                best_size, best_col = size, c
+                best = keys if keys is not None else list(heapq.merge(*parts))
+
+        rest = {c: w for c, w in filters.items() if c != best_col}
+        return best, rest
+
+    def _matches(self, vals, rest):
+        for c, want in rest.items():
+            v = vals[c]
+            if isinstance(want, (list, tuple, set, frozenset)):
+                if v not in {self._value(w) for w in want}:
+                    return False
+            elif v != self._value(want):
+                return False
+        return True
+
+    def _iter(self, filters, descending=False):
+        filters = {c: w for c, w in (filters or {}).items() if w is not None}
+
+        for c in filters:
+            if c not in self._buckets:
+                raise KeyError(f"column {c} is not indexed")
+
+        with self._lock:
+            if filters:
+                keys, rest = self._candidates(filters)
+            else:
+                keys, rest = sorted(r[0] for r in self._rows.values()), {}
+
+        # walk the live bucket in slices instead of copying it; a concurrent
+        # insert can shift a key by one slot, the row check below drops stale ones
+        n = len(keys)
+        starts = range(n - _SLICE, -_SLICE, -_SLICE) if descending else range(0, n, _SLICE)
+
+        for start in starts:
+            with self._lock:
+                chunk = keys[max(start, 0):start + _SLICE]
+
+            for key in (reversed(chunk) if descending else chunk):
+                rec = self._rows.get(key[1])
+                if rec is None or rec[0] != key:
+                    continue
+                if rest and not self._matches(rec[2], rest):
+                    continue
+                yield key[1], rec[1]
+
+    def query(self, filters=None, descending=False, offset=0, limit=None):
+        # [(row, item_id)] in CREATED_AT order
+        out = []
+
+        for n, hit in enumerate(self._iter(filters, descending)):
+            if n < offset:
+                continue
+            out.append(hit)
+            if limit is not None and len(out) >= limit:
+                break
+
+        return out
+
+    def first(self, filters=None):
+        hits = self.query(filters, limit=1)
+        return hits[0] if hits else None
+
+    def count(self, filters=None):
+        filters = {c: w for c, w in (filters or {}).items() if w is not None}
+
+        # single equality: bucket length, no walk
+        if len(filters) == 1:
+            (c, want), = filters.items()
+            if not isinstance(want, (list, tuple, set, frozenset)):
+                return len(self._buckets[c].get(self._value(want), []))
+
+        return sum(1 for _ in self._iter(filters))
+
+    def values(self, column):
+        # {value: rows} for one column, e.g. items per ITEM_STATUS
+        with self._lock:
+            return {v: len(keys) for v, keys in self._buckets[column].items()}
@@ -1,6 +1,17 @@
+import asyncio
+import time
+
 from telegram import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton, InputMediaPhoto
-from sheets_logger import create_draft, update_item_fields, get_worker_accounts
-from utils import safe_text, now_str
+from sheets_logger import (
+    create_item, touch_owner_contacted, get_worker_accounts, duplicate_candidates,
+    worker_item_page, item_index_version, confirm_item_available, ITEMS_SCHEMA
+)
+from config import ADMIN_IDS
+from utils import safe_text
+from media import photo_cache
+from caption_parser import parse_caption
+from vin_decoder import decode_vin, vin_fields
+from menus import BTN_MY_ITEMS, BTN_MY_SALES, BTN_SUBMIT_FOR_REVIEW
 
 def item_debug(label, value=""):
     print(f"[ITEM DEBUG] {label}: {value}")
@@ -17,13 +28,305 @@ ITEM_CAPTION = 5
 ITEM_CONFIRM = 6
 
 
+# ================= PHOTO INGESTION =================
+# Albums arrive as one update per photo sharing a media_group_id. Photos are
+# added to the draft as they come, the acknowledgement is debounced so a
+# whole album gets one reply.
+
+MAX_ITEM_PHOTOS = 60
+ALBUM_ACK_SECONDS = 1.5
+
+
+def _photo_ack_text(ack, total):
+    if ack["added"] == 1 and not ack["album"]:
+        text = f"Photo saved ({total})"
+    else:
+        text = f"📸 {ack['added']} photos saved ({total} total)"
+
+    if ack["duplicates"]:
+        text += f"\n↩ {ack['duplicates']} duplicate photo(s) skipped"
+
+    if ack["over_limit"]:
+        text += f"\n⚠ Limit is {MAX_ITEM_PHOTOS} photos — {ack['over_limit']} not saved"
+
+    return text
+
+
+def _cancel_album_ack(context):
+    task = context.user_data.pop("album_ack_task", None)
+
+    if task and not task.done():
+        task.cancel()
+
+    return context.user_data.pop("album_ack", None)
+
+
+async def _send_album_ack(context, chat_id):
+    await asyncio.sleep(ALBUM_ACK_SECONDS)
+
+    context.user_data.pop("album_ack_task", None)
+    ack = context.user_data.pop("album_ack", None)
+
+    if not ack:
+        return
+
+    total = len(context.user_data.get("item_draft", {}).get("photos", []))
+
+    try:
+        await context.bot.send_message(chat_id=chat_id, text=_photo_ack_text(ack, total))
+    except Exception as e:
+        item_debug("ALBUM_ACK_ERROR", repr(e))
+
+
+def draft_photo_records(draft):
+    # ITEM_PHOTOS rows for the draft, metadata from the photo cache
+    cache = photo_cache()
+    out = []
+
+    for file_id in draft.get("photos", []):
+        meta = cache.by_file_id(file_id) or {"file_id": file_id}
+        out.append({
+            "file_id": meta["file_id"],
+            "file_unique_id": meta.get("file_unique_id", ""),
+            "width": meta.get("width", ""),
+            "height": meta.get("height", ""),
+            "thumb_file_id": meta.get("thumb_file_id") or "",
+        })
+
+    return out
+
+
+def add_draft_photo(draft, sizes):
+    # "added" | "duplicate" | "over_limit"
+    meta = photo_cache().record(sizes)
+
+    if not meta:
+        return "duplicate"
+
+    uids = draft.setdefault("photo_uids", [])
+
+    if meta["file_unique_id"] in uids:
+        return "duplicate"
+
+    if len(uids) >= MAX_ITEM_PHOTOS:
+        return "over_limit"
+
+    uids.append(meta["file_unique_id"])
+    draft.setdefault("photos", []).append(meta["file_id"])
+
+    return "added"
+
+
+# ================= VIN =================
+# A make decoded from a VIN with a matching check digit wins over anything
+# the caption parser guesses later. The VIN year only fills an empty year:
+# position 10 repeats every 30 years, so it is left empty until the caption
+# year picks the cycle (vin_decoder.model_year).
+
+def apply_vin(draft, vin):
+    fields = vin_fields(vin, draft.get("year", ""))
+
+    draft["vin"] = vin
+    draft["vin_make"] = fields.get("MAKE", "")
+    draft["vin_year"] = fields.get("YEAR", "")
+
+    if draft["vin_make"]:
+        draft["make"] = draft["vin_make"]
+    if draft["vin_year"] and not draft.get("year"):
+        draft["year"] = draft["vin_year"]
+
+
+def _duplicate_text(matches):
+    lines = ["⚠ Possible duplicate truck:"]
+
+    for m in matches:
+        truck = " ".join(v for v in (m["year"], m["make"].title(), m["model"]) if v) or "—"
+        lines.append(
+            f"• {m['item_id']} · {truck} · VIN {m['vin'] or '…' + m['last6']} · {m['owner'] or 'no owner'}\n"
+            f"  {', '.join(m['reasons'])}"
+        )
+
+    lines.append("Continue anyway?")
+    return "\n".join(lines)
+
+
+def _photos_prompt(draft):
+    decoded = " ".join(v for v in (draft.get("vin_year"), draft.get("vin_make")) if v)
+    head = f"VIN: {decoded}\n" if decoded else ""
+    return f"{head}Upload truck photos.\nType DONE when finished."
+
+
+# ================= MY ITEMS / MY SALES =================
+# One message per list, edited in place by the ◀ / ▶ buttons. Each page is a
+# single batch_get of the visible rows (sheets_logger.worker_item_page);
+# rendered pages are cached until the item index changes or
+# PAGE_CACHE_SECONDS pass, so flipping back and forth costs no reads.
+
+ITEMS_PAGE_SIZE = 10
+PAGE_CACHE_SECONDS = 120
+PAGE_CACHE_MAX = 500
+
+MY_LISTS = {
+    "FINDER": BTN_MY_ITEMS,
+    "SELLER": BTN_MY_SALES,
+}
+
+_PAGE_CACHE = {}    # (kind, worker_id, page) -> (version, rendered_at, text, markup)
+_IC = {name: i for i, name in enumerate(ITEMS_SCHEMA)}
+
+
+def _field(r, name):
+    i = _IC[name]
+    return r[i].strip() if len(r) > i and r[i] else ""
+
+
+def _item_line(r):
+    truck = " ".join(v for v in (_field(r, "YEAR"), _field(r, "MAKE"), _field(r, "MODEL")) if v) or "—"
+    line = f"• {_field(r, 'ITEM_ID')} · {truck} · {_field(r, 'ITEM_STATUS') or 'DRAFT'}"
+
+    price = _field(r, "SOLD_PRICE") or _field(r, "LIST_PRICE")
+    if price:
+        line += f" · ${price}"
+
+    vin6 = _field(r, "VIN_LAST6")
+    if vin6:
+        line += f" · …{vin6}"
+
+    return line
+
+
+def _render_items_page(kind, page, total, rows):
+    title = MY_LISTS[kind]
+
+    if not total:
+        return f"{title}\n\nNothing here yet.", None
+
+    pages = (total + ITEMS_PAGE_SIZE - 1) // ITEMS_PAGE_SIZE
+    text = "\n".join([f"{title} ({total}) — page {page + 1}/{pages}", ""] + [_item_line(r) for r in rows])
+
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton("◀ PREV", callback_data=f"MY_ITEMS|{kind}|{page - 1}"))
+    if page + 1 < pages:
+        nav.append(InlineKeyboardButton("NEXT ▶", callback_data=f"MY_ITEMS|{kind}|{page + 1}"))
+
+    return text, InlineKeyboardMarkup([nav]) if nav else None
+
+
+async def send_my_items_page(context, chat_id, worker_id, kind="FINDER", page=0, query=None):
+    # query: edit the list message in place (◀ / ▶) instead of sending a new one
+    page = max(0, page)
+    key = (kind, str(worker_id), page)
+    cached = _PAGE_CACHE.get(key)
+
+    if cached and cached[0] == item_index_version() and time.monotonic() - cached[1] < PAGE_CACHE_SECONDS:
+        text, markup = cached[2], cached[3]
+
+    else:
+        try:
+            total, rows = await asyncio.to_thread(
+                worker_item_page, str(worker_id), kind, page, ITEMS_PAGE_SIZE
+            )
+        except Exception as e:
+            item_debug("MY_ITEMS_ERROR", repr(e))
+            await context.bot.send_message(chat_id=chat_id, text="⚠️ Could not load items, try again.")
+            return
+
+        # past the end (items moved away): show the last page instead
+        if total and not rows and page:
+            await send_my_items_page(context, chat_id, worker_id, kind, (total - 1) // ITEMS_PAGE_SIZE, query)
+            return
+
+        text, markup = _render_items_page(kind, page, total, rows)
+
+        if len(_PAGE_CACHE) >= PAGE_CACHE_MAX:
+            _PAGE_CACHE.pop(next(iter(_PAGE_CACHE)))
+        _PAGE_CACHE[key] = (item_index_version(), time.monotonic(), text, markup)
+
+    if query is not None:
+        try:
+            await query.edit_message_text(text, reply_markup=markup)
+            return
+        except Exception as e:
+            # "message is not modified" or too old to edit
+            item_debug("MY_ITEMS_EDIT", repr(e))
+
+    await context.bot.send_message(chat_id=chat_id, text=text, reply_markup=markup)
+
+
+async def my_items_callback(update, context):
+
+    query = update.callback_query
+    await query.answer()
+
+    try:
+        _, kind, page = query.data.split("|")
+        page = int(page)
+    except ValueError:
+        return
+
+    if kind not in MY_LISTS:
+        return
+
+    await send_my_items_page(
+        context, query.message.chat.id, query.from_user.id, kind, page, query=query
+    )
+
+
+# ================= AVAILABILITY CONFIRMATION =================
+# The stale-listing warning (scheduler.stale_listing_job) carries a
+# ✅ Still available button: the item's finder / seller (or an admin) moves
+# NEXT_CONFIRM_DUE_AT and AUTO_HIDE_AT forward with one ranged read and one
+# batch write.
+
+CONFIRM_REPLIES = {
+    "OK": "✅ {item_id} confirmed, it stays listed.",
+    "NOT_FOUND": "⚠️ {item_id} was not found.",
+    "NOT_LIVE": "ℹ️ {item_id} is no longer listed.",
+    "NOT_YOURS": "⛔ {item_id} is not one of your items.",
+}
+
+
+def confirm_item_keyboard(item_id):
+    return InlineKeyboardMarkup([[InlineKeyboardButton("✅ Still available", callback_data=f"ITEM_CONFIRM|{item_id}")]])
+
+
+async def confirm_item_callback(update, context):
+
+    query = update.callback_query
+
+    try:
+        _, item_id = query.data.split("|")
+    except ValueError:
+        await query.answer()
+        return
+
+    uid = str(query.from_user.id)
+    owner_check = None if uid in ADMIN_IDS else uid
+
+    try:
+        result = await asyncio.to_thread(confirm_item_available, item_id, owner_check)
+    except Exception as e:
+        item_debug("CONFIRM_ERROR", repr(e))
+        await query.answer("⚠️ Could not confirm, try again.")
+        return
+
+    await query.answer()
+    item_debug("CONFIRM", f"{item_id} {uid} {result}")
+
+    try:
+        await query.edit_message_text(CONFIRM_REPLIES[result].format(item_id=item_id))
+    except Exception as e:
+        item_debug("CONFIRM_EDIT_ERROR", repr(e))
+
+
 # ================= KEYBOARDS =================
 
 def items_menu():
     return ReplyKeyboardMarkup(
         [
             [KeyboardButton("📦 NEW ITEM")],
-            [KeyboardButton("🗂️ MY ITEMS")],
+            [KeyboardButton(BTN_MY_ITEMS)],
             [KeyboardButton("🔙 BACK")]
         ],
         resize_keyboard=True
@@ -43,6 +346,7 @@ def item_confirm_keyboard():
     return ReplyKeyboardMarkup(
         [
             [KeyboardButton("✅ SAVE ITEM")],
+            [KeyboardButton(BTN_SUBMIT_FOR_REVIEW)],
             [KeyboardButton("❌ CANCEL")],
             [KeyboardButton("🔙 BACK")]
         ],
@@ -99,6 +403,14 @@ async def handle_items_panel(update, context, text, role, status):
 
         return True
 
+    # ---------------- MY ITEMS / MY SALES ----------------
+    if text in (BTN_MY_ITEMS, BTN_MY_SALES) and status == "ACTIVE" and not context.user_data.get("item_state"):
+
+        kind = "SELLER" if text == BTN_MY_SALES else "FINDER"
+        await send_my_items_page(context, update.effective_chat.id, uid, kind)
+
+        return True
+
     # ---------------- NEW ITEM ----------------
     if text == "📦 NEW ITEM" and status == "ACTIVE":
 
@@ -218,49 +530,65 @@ async def handle_items_panel(update, context, text, role, status):
 
             return True
 
-        vin = safe_text(text).upper()
+        info = decode_vin(text)
+        vin = info["vin"]
 
-        if len(vin) != 17:
+        if not info["valid"]:
 
             await update.message.reply_text(
-                "VIN must be 17 characters."
+                "VIN must be 17 characters (letters I, O and Q are never used)."
             )
 
             return True
 
-        # duplicate check using TRUCK_INDEX
-        from sheets_logger import index_ws
+        # a bad check digit is almost always a typo; the same VIN sent twice is kept
+        if not info["check_ok"] and context.user_data.get("vin_unverified") != vin:
 
-        idx = index_ws()
+            context.user_data["vin_unverified"] = vin
 
-        try:
-            vin_col = idx.col_values(2)[1:] if idx.col_values(2) else []
-        except:
-            vin_col = []
+            await update.message.reply_text(
+                f"⚠ VIN check digit doesn't match: {vin}\n"
+                "Check it for a typo and send it again.\n"
+                "Send the same VIN again to keep it as is."
+            )
+
+            return True
 
-        for existing_vin in vin_col:
+        context.user_data.pop("vin_unverified", None)
 
-            existing_vin = (existing_vin or "").strip().upper()
+        # fuzzy duplicate check against TRUCK_INDEX (typo'd VINs, re-posts)
+        decoded = vin_fields(vin, draft.get("year", ""))
 
-            if existing_vin == vin:
+        try:
+            matches = duplicate_candidates(
+                vin=vin,
+                make=decoded.get("MAKE", ""),
+                year=decoded.get("YEAR", ""),
+                owner_id=draft.get("owner_id", ""),
+            )
+        except Exception as e:
+            item_debug("DUPLICATE_CHECK_FAILED", e)
+            matches = []
 
-                context.user_data["duplicate_vin"] = vin
+        if matches:
 
-                await update.message.reply_text(
-                    "⚠ Possible duplicate VIN detected.\nContinue anyway?",
-                    reply_markup=duplicate_warning_keyboard()
-                )
+            context.user_data["duplicate_vin"] = vin
 
-                return True
+            await update.message.reply_text(
+                _duplicate_text(matches),
+                reply_markup=duplicate_warning_keyboard()
+            )
+
+            return True
 
-        draft["vin"] = vin
+        apply_vin(draft, vin)
         context.user_data["item_draft"] = draft
         context.user_data.pop("duplicate_vin", None)
 
         context.user_data["item_state"] = ITEM_PHOTOS
 
         await update.message.reply_text(
-            "Upload truck photos.\nType DONE when finished.",
+            _photos_prompt(draft),
             reply_markup=wizard_back_keyboard()
         )
 
@@ -290,12 +618,12 @@ async def handle_items_panel(update, context, text, role, status):
 
             vin = context.user_data.pop("duplicate_vin")
 
-            draft["vin"] = vin
+            apply_vin(draft, vin)
 
             context.user_data["item_state"] = ITEM_PHOTOS
 
             await update.message.reply_text(
-                "Upload truck photos.\nType DONE when finished.",
+                _photos_prompt(draft),
                 reply_markup=wizard_back_keyboard()
             )
 
@@ -309,6 +637,7 @@ async def handle_items_panel(update, context, text, role, status):
 
         if text == "🔙 BACK":
 
+            _cancel_album_ack(context)
             context.user_data["item_state"] = ITEM_VIN
 
             await update.message.reply_text(
@@ -328,8 +657,12 @@ async def handle_items_panel(update, context, text, role, status):
 
             context.user_data["item_state"] = ITEM_CAPTION
 
+            # an album still waiting for its ack is reported in this reply
+            ack = _cancel_album_ack(context)
+            prefix = _photo_ack_text(ack, len(draft["photos"])) + "\n\n" if ack else ""
+
             await update.message.reply_text(
-                "Send truck description or caption:",
+                prefix + "Send truck description or caption:",
                 reply_markup=wizard_back_keyboard()
             )
 
@@ -337,15 +670,41 @@ async def handle_items_panel(update, context, text, role, status):
 
         if update.message.photo:
 
-            photo = update.message.photo[-1]
-
-            draft.setdefault("photos", [])
-            draft["photos"].append(photo.file_id)
+            result = add_draft_photo(draft, update.message.photo)
 
             context.user_data["item_draft"] = draft
 
+            ack = context.user_data.setdefault(
+                "album_ack",
+                {"added": 0, "duplicates": 0, "over_limit": 0, "album": False}
+            )
+
+            if result == "added":
+                ack["added"] += 1
+            elif result == "duplicate":
+                ack["duplicates"] += 1
+            else:
+                ack["over_limit"] += 1
+
+            # album: (re)start the debounce timer, reply once it goes quiet
+            if update.message.media_group_id:
+
+                ack["album"] = True
+
+                task = context.user_data.get("album_ack_task")
+                if task and not task.done():
+                    task.cancel()
+
+                context.user_data["album_ack_task"] = asyncio.create_task(
+                    _send_album_ack(context, update.effective_chat.id)
+                )
+
+                return True
+
+            _cancel_album_ack(context)
+
             await update.message.reply_text(
-                f"Photo saved ({len(draft['photos'])})"
+                _photo_ack_text(ack, len(draft["photos"]))
             )
 
             return True
@@ -380,33 +739,19 @@ async def handle_items_panel(update, context, text, role, status):
         # AUTO FIELD EXTRACTION
         # =========================
 
-        import re
-
-        year_match = re.search(r"(19|20)\d{2}", caption)
-        if year_match:
-            draft["year"] = year_match.group(0)
-
-        make_match = re.search(r"(Peterbilt|Kenworth|Freightliner|Volvo|International|Mack)", caption, re.IGNORECASE)
-        if make_match:
-            draft["make"] = make_match.group(0)
-
-        model_match = re.search(r"\b(389|579|379|579X|T680|W900)\b", caption)
-        if model_match:
-            draft["model"] = model_match.group(0)
-
-        miles_match = re.search(r"(\d{3,6})\s?k?\s?miles", caption, re.IGNORECASE)
-        if miles_match:
+        parsed = parse_caption(caption)
 
-            miles = miles_match.group(1)
+        for field in ("year", "make", "model", "miles", "engine"):
+            if parsed[field] != "" and (field == "year" or not draft.get(f"vin_{field}")):
+                draft[field] = parsed[field]
 
-            if "k" in caption.lower():
-                miles = int(miles) * 1000
+        # the caption year picks the VIN's 30-year cycle
+        if draft.get("vin") and parsed["year"]:
+            draft["vin_year"] = vin_fields(draft["vin"], parsed["year"]).get("YEAR", "")
 
-            draft["miles"] = miles
+        draft["parse_confidence"] = parsed["confidence"]
 
-        engine_match = re.search(r"(Detroit|Cummins|PACCAR)", caption, re.IGNORECASE)
-        if engine_match:
-            draft["engine"] = engine_match.group(0)
+        item_debug("CAPTION_PARSED", parsed)
 
         context.user_data["item_draft"] = draft
         context.user_data["item_state"] = ITEM_OWNER_PRICE
@@ -505,22 +850,23 @@ Save item?
 
             return True
 
-        if text == "✅ SAVE ITEM":
+        if text in ("✅ SAVE ITEM", BTN_SUBMIT_FOR_REVIEW):
 
-            item_id = create_draft(
+            # SAVE keeps a DRAFT; SUBMIT puts it in the gatekeepers' review queue
+            submit = text == BTN_SUBMIT_FOR_REVIEW
+            photos = draft_photo_records(draft)
+
+            item_id = create_item(
                 worker_id=uid,
                 owner_id=draft.get("owner_id"),
                 owner_type="Truck Owner",
-                owner_name_cache=""
-            )
-
-            update_item_fields(
-                item_id,
-                {
+                status="PENDING_REVIEW" if submit else "DRAFT",
+                fields={
                     "VIN_FULL": draft.get("vin"),
                     "VIN_LAST6": draft.get("vin")[-6:] if draft.get("vin") else "",
 
                     "RAW_CAPTION": draft.get("caption"),
+                    "PARSE_CONFIDENCE": draft.get("parse_confidence", 0),
                     "PHOTO_COUNT": len(draft.get("photos")),
 
                     "YEAR": draft.get("year"),
@@ -532,27 +878,22 @@ Save item?
                     "OWNER_PRICE": draft.get("owner_price"),
                     "LIST_PRICE": draft.get("list_price"),
                     "COMMISSION_RATE": draft.get("commission_rate")
-                }
+                },
+                photos=photos
             )
 
-            # update owner recent usage timestamp
-            from sheets_logger import owners_ws
-
-            ws = owners_ws()
-            rows = ws.get_all_values()
-
-            for i, r in enumerate(rows[1:], start=2):
+            cache = photo_cache()
+            for p in photos:
+                cache.claim(p["file_unique_id"], item_id)
 
-                if r and r[0] == draft.get("owner_id"):
-
-                    ws.update_cell(i, 16, now_str())
-                    break
+            # update owner recent usage timestamp
+            touch_owner_contacted(draft.get("owner_id"))
 
             context.user_data["item_state"] = ITEM_NONE
             context.user_data.pop("item_draft", None)
 
             await update.message.reply_text(
-                f"✅ Item created\n\nITEM_ID: {item_id}",
+                f"✅ Item created\n\nITEM_ID: {item_id}" + ("\n\n📤 Sent to review." if submit else ""),
                 reply_markup=items_menu()
             )
 
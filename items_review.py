@@ -0,0 +1,321 @@
+import asyncio
+import contextvars
+import time
+
+from telegram import InputMediaPhoto
+
+from accounts import run_sheet, log_block, log_line
+from menus import BTN_APPROVE_PUBLISH_NEXT, BTN_REQUEST_CHANGES, BTN_HIDE_ITEM, BTN_VIEW_PENDING
+from review_queue import review_queue
+from sheets_logger import (
+    ITEMS_SCHEMA, pending_review_queue, indexed_item, is_pending_review,
+    read_review_item, apply_review_decision, queue_log_action
+)
+
+
+# ================================
+# GATEKEEPER REVIEW
+# ================================
+# APPROVE & PUBLISH NEXT decides the item on screen and checks out the next
+# one in a single press (the first press just checks one out). Each item is
+# leased to the gatekeeper (review_queue), so two gatekeepers never get the
+# same item.
+#
+# Per press: one batch_update for the decision (only while the row still
+# holds the item in PENDING_REVIEW, see apply_review_decision), then the
+# next item's row and photos. The item after that is read in the background while the
+# current one is on screen (_PREFETCH), so the next press usually costs no
+# reads at all.
+
+REVIEW_ROLES = {"GATEKEEPER", "ADMIN"}
+REVIEW_BUTTONS = [BTN_APPROVE_PUBLISH_NEXT, BTN_REQUEST_CHANGES, BTN_HIDE_ITEM, BTN_VIEW_PENDING]
+
+# button -> (new ITEM_STATUS, LISTING_STATUS_REASON, done text, finder message)
+DECISIONS = {
+    BTN_APPROVE_PUBLISH_NEXT: ("PUBLISHED", "APPROVED", "✅ {item_id} published.", "✅ Item {item_id} was approved and published."),
+    BTN_REQUEST_CHANGES: ("DRAFT", "CHANGES_REQUESTED", "📝 {item_id} sent back to the finder.", "📝 Item {item_id} needs changes before it can be published."),
+    BTN_HIDE_ITEM: ("HIDDEN", "HIDDEN_BY_GATEKEEPER", "🙈 {item_id} hidden.", "🙈 Item {item_id} was hidden by a gatekeeper."),
+}
+
+# ACTIVITY_LOG action per decision (APPROVE_ITEM counts as an approval in REPORTS)
+DECISION_ACTIONS = {
+    BTN_APPROVE_PUBLISH_NEXT: "APPROVE_ITEM",
+    BTN_REQUEST_CHANGES: "REQUEST_CHANGES",
+    BTN_HIDE_ITEM: "HIDE_ITEM",
+}
+
+# leased items are skipped, so read this many past the active leases
+CANDIDATE_SLACK = 20
+PENDING_LIST_SIZE = 10
+MAX_REVIEW_PHOTOS = 10
+
+PREFETCH_SECONDS = 120
+PREFETCH_MAX = 50
+
+_PREFETCH = {}      # item_id -> (started_at, future of read_review_item)
+_IC = {name: i for i, name in enumerate(ITEMS_SCHEMA)}
+
+
+def review_debug(label, value=""):
+    print(f"[REVIEW DEBUG] {label}: {value}")
+
+
+def _field(r, name):
+    i = _IC[name]
+    return r[i].strip() if len(r) > i and r[i] else ""
+
+
+def _review_text(r, photos, pending, lease_minutes, notice=""):
+    truck = " ".join(v for v in (_field(r, "YEAR"), _field(r, "MAKE"), _field(r, "MODEL")) if v) or "—"
+    specs = " · ".join(v for v in (
+        f"{_field(r, 'MILES')} mi" if _field(r, "MILES") else "",
+        _field(r, "ENGINE"),
+    ) if v)
+
+    lines = [notice, ""] if notice else []
+    lines += [
+        f"🔎 REVIEW {_field(r, 'ITEM_ID')} ({pending} pending)",
+        f"🚚 {truck}" + (f" · {specs}" if specs else ""),
+        f"🔢 VIN: {_field(r, 'VIN_FULL') or '—'}",
+        f"👤 Owner: {_field(r, 'OWNER_ID') or '—'} · Finder: {_field(r, 'FINDER_WORKER_ID') or '—'}",
+        f"💰 Owner price: {_field(r, 'OWNER_PRICE') or '—'} · List: {_field(r, 'LIST_PRICE') or '—'}",
+        f"📸 Photos: {len(photos)}",
+    ]
+
+    caption = _field(r, "RAW_CAPTION")
+    if caption:
+        lines += ["", caption[:300]]
+
+    lines += ["", f"⏳ Checked out to you for {lease_minutes} min"]
+    return "\n".join(lines)
+
+
+# ---------------- PREFETCH ----------------
+
+async def _take_prefetched(row_i, item_id):
+    # waits for a read already in flight instead of issuing a second one
+    hit = _PREFETCH.pop(item_id, None)
+
+    if not hit or time.monotonic() - hit[0] > PREFETCH_SECONDS:
+        return None
+
+    try:
+        loaded = await hit[1]
+    except Exception as e:
+        review_debug("PREFETCH_ERROR", repr(e))
+        return None
+
+    # decided in the meantime
+    if not loaded or not is_pending_review(row_i, item_id):
+        return None
+
+    return loaded
+
+
+def _prefetch_next(candidates, skip):
+    # starts reading row + photos of the next free item while the current one is reviewed
+    taken = review_queue().leased_ids() | {skip}
+    now = time.monotonic()
+
+    for row_i, item_id in candidates:
+        if item_id in taken or not is_pending_review(row_i, item_id):
+            continue
+
+        hit = _PREFETCH.get(item_id)
+        if hit and now - hit[0] <= PREFETCH_SECONDS:
+            return
+
+        if len(_PREFETCH) >= PREFETCH_MAX:
+            _PREFETCH.pop(next(iter(_PREFETCH)))
+
+        # in a copy of this context, so the reads count against the caller's flow
+        future = asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, read_review_item, row_i, item_id
+        )
+        _PREFETCH[item_id] = (now, future)
+        return
+
+
+# ---------------- SCREENS ----------------
+
+async def _send_review_card(context, chat_id, r, photos, text):
+    media = [
+        InputMediaPhoto(p["thumb_file_id"] or p["file_id"])
+        for p in photos[:MAX_REVIEW_PHOTOS]
+        if p["file_id"]
+    ]
+
+    # one message: the album carries the details as its caption
+    if media:
+        try:
+            media[0] = InputMediaPhoto(media[0].media, caption=text[:1024])
+            await context.bot.send_media_group(chat_id=chat_id, media=media)
+            return
+        except Exception as e:
+            review_debug("ALBUM_ERROR", f"{_field(r, 'ITEM_ID')} {e!r}")
+
+    await context.bot.send_message(chat_id=chat_id, text=text)
+
+
+async def send_next_review(context, chat_id, gatekeeper_id, notice=""):
+    queue = review_queue()
+    gatekeeper_id = str(gatekeeper_id)
+
+    loaded = await run_sheet(context, pending_review_queue, len(queue.active()) + CANDIDATE_SLACK)
+
+    if loaded is None:
+        await context.bot.send_message(chat_id=chat_id, text="⚠️ Could not load the review queue, try again.")
+        return
+
+    pending, candidates = loaded
+
+    # a candidate can turn out stale (row moved, decided elsewhere): drop it and lease again
+    for _ in range(3):
+        # decided since the list was read (index is updated before the lease is released)
+        candidates = [c for c in candidates if is_pending_review(*c)]
+        lease = queue.lease_next(gatekeeper_id, candidates)
+
+        if not lease:
+            context.user_data.pop("review_item", None)
+            context.user_data.pop("review_row", None)
+            text = "🎉 Nothing left to review." if not pending else "🔒 Every pending item is checked out by another gatekeeper."
+            await context.bot.send_message(chat_id=chat_id, text=f"{notice}\n\n{text}" if notice else text)
+            return
+
+        item_id, row_i = lease["item_id"], lease["row_number"]
+
+        item = await _take_prefetched(row_i, item_id) or await run_sheet(context, read_review_item, row_i, item_id)
+
+        if item:
+            break
+
+        queue.release(item_id, gatekeeper_id)
+        candidates = [c for c in candidates if c[1] != item_id]
+
+    else:
+        await context.bot.send_message(chat_id=chat_id, text="⚠️ The review queue changed, press again.")
+        return
+
+    row, photos = item
+    context.user_data["review_item"] = item_id
+    context.user_data["review_row"] = row
+
+    log_block("REVIEW LEASE")
+    log_line("GATEKEEPER", gatekeeper_id)
+    log_line("ITEM_ID", item_id)
+
+    text = _review_text(row, photos, pending, queue.lease_seconds // 60, notice)
+    await _send_review_card(context, chat_id, row, photos, text)
+
+    _prefetch_next(candidates, item_id)
+
+
+async def decide_review(context, chat_id, gatekeeper_id, button, role="GATEKEEPER"):
+    # applies the decision to the item on screen, then shows the next one
+    queue = review_queue()
+    gatekeeper_id = str(gatekeeper_id)
+
+    lease = queue.held_by(gatekeeper_id)
+    shown = context.user_data.get("review_item")
+
+    if not lease or lease["item_id"] != shown:
+        # nothing on screen (first press, restart) or the lease ran out
+        notice = "⌛ Your checkout expired, the item went back to the queue." if shown and not lease else ""
+
+        if button != BTN_APPROVE_PUBLISH_NEXT and not lease:
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text=(notice + "\n\n" if notice else "") + f"No item checked out. Press {BTN_APPROVE_PUBLISH_NEXT} to start."
+            )
+            context.user_data.pop("review_item", None)
+            return
+
+        await send_next_review(context, chat_id, gatekeeper_id, notice)
+        return
+
+    status, reason, done, finder_text = DECISIONS[button]
+    item_id = lease["item_id"]
+    row = context.user_data.get("review_row") or []
+
+    saved = await run_sheet(
+        context, apply_review_decision, lease["row_number"], item_id, status, gatekeeper_id, reason, row
+    )
+
+    if saved is None:
+        await context.bot.send_message(chat_id=chat_id, text="⚠️ Could not save the decision, try again.")
+        return
+
+    queue.release(item_id, gatekeeper_id)
+    _PREFETCH.pop(item_id, None)
+
+    if not saved:
+        # decided elsewhere or the row moved since the checkout: nothing written
+        review_debug("DECISION_STALE", item_id)
+        await send_next_review(context, chat_id, gatekeeper_id, f"⚠️ {item_id} was already decided elsewhere, nothing saved.")
+        return
+    queue_log_action(gatekeeper_id, role, DECISION_ACTIONS[button], item_id=item_id, details=reason)
+
+    finder = _field(row, "FINDER_WORKER_ID")
+    if finder and finder != gatekeeper_id:
+        try:
+            await context.bot.send_message(chat_id=finder, text=finder_text.format(item_id=item_id))
+        except Exception as e:
+            review_debug("FINDER_NOTIFY_ERROR", f"{finder} {e!r}")
+
+    await send_next_review(context, chat_id, gatekeeper_id, done.format(item_id=item_id))
+
+
+async def send_pending_reviews(context, chat_id):
+    # oldest pending items straight from ITEM_INDEX, with who has them checked out
+    loaded = await run_sheet(context, pending_review_queue, PENDING_LIST_SIZE)
+
+    if loaded is None:
+        await context.bot.send_message(chat_id=chat_id, text="⚠️ Could not load the review queue, try again.")
+        return
+
+    pending, entries = loaded
+
+    if not pending:
+        await context.bot.send_message(chat_id=chat_id, text="🗂️ No items pending review.")
+        return
+
+    leases = review_queue().active()
+    lines = [f"🗂️ Pending review: {pending} (oldest first)", ""]
+
+    for row_i, item_id in entries:
+        vals = indexed_item(row_i, item_id) or {}
+        truck = " ".join(v for v in (vals.get("YEAR"), vals.get("MAKE")) if v) or "—"
+        line = f"• {item_id} · {truck}"
+        if item_id in leases:
+            line += f" · 🔒 {leases[item_id]}"
+        lines.append(line)
+
+    if pending > len(entries):
+        lines.append(f"… and {pending - len(entries)} more")
+
+    lines += ["", f"Press {BTN_APPROVE_PUBLISH_NEXT} to review the next one."]
+
+    await context.bot.send_message(chat_id=chat_id, text="\n".join(lines))
+
+
+# ---------------- MAIN HANDLER ----------------
+
+async def handle_review_panel(update, context, text, role, status):
+
+    if text not in REVIEW_BUTTONS or role not in REVIEW_ROLES or status != "ACTIVE":
+        return False
+
+    uid = str(update.effective_user.id)
+    chat_id = update.effective_chat.id
+
+    try:
+        if text == BTN_VIEW_PENDING:
+            await send_pending_reviews(context, chat_id)
+        else:
+            await decide_review(context, chat_id, uid, text, role)
+
+    except Exception as e:
+        log_block("REVIEW ERROR")
+        log_line("ERROR", repr(e))
+
+    return True
@@ -0,0 +1,21 @@
+import sqlite3
+
+
+# ================================
+# LOCAL SQLITE STATE
+# ================================
+# Shared connection settings for the small local stores (moderation queue,
+# photo cache, ...). Every store opens its own connection to LOCAL_DB_PATH;
+# WAL lets them read while another one writes.
+
+def open_db(path):
+    # handlers run on the event loop and in run_sheet worker threads
+    db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    db.row_factory = sqlite3.Row
+
+    if path != ":memory:":
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA busy_timeout=5000")
+
+    return db
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+from gspread.utils import rowcol_to_a1
+
+from config import LOG_ARCHIVE_DIR, LOG_ARCHIVE_SPREADSHEET_ID, LOG_KEEP_DAYS
+from sheets_logger import (
+    LOG_SCHEMA, log_ws, archive_log_ws, add_archive_log_ws, archive_log_title, archive_log_months,
+    delete_log_rows
+)
+from snapshot import FORMAT, write_part, read_part, to_columns, load_manifest, save_manifest
+from utils import now_local, parse_ts, TS_FORMAT
+
+
+# ================================
+# ACTIVITY_LOG ROTATION
+# ================================
+# Keeps the live ACTIVITY_LOG tab to the last LOG_KEEP_DAYS. Older rows
+# (a prefix of the tab, it is append-only) are moved per month to
+#
+#   ACTIVITY_LOG_YYYY_MM tab        (LOG_ARCHIVE_SPREADSHEET_ID, or this spreadsheet)
+#   <LOG_ARCHIVE_DIR>/YYYY-MM/part-<n>.parquet | .json/      (snapshot.py format)
+#
+# and only then deleted from the live tab. A run interrupted half way is
+# safe to repeat: rows up to the last one already archived (tab tail /
+# manifest) are not archived twice.
+#
+#   python log_archive.py                   # rotate
+#   python log_archive.py --query --since 2026-01-01 --action APPROVE_OWNER
+#
+#   query_log(start, end, {"USER_ID": uid})  -> rows from archive + live tab
+
+_WIDTH = len(LOG_SCHEMA)
+_LAST_COL = rowcol_to_a1(1, _WIDTH).rstrip("1")
+
+
+def log_archive_debug(label, value=""):
+    print(f"[LOG ARCHIVE] {label}: {value}")
+
+
+def _pad(r):
+    return [str(v) for v in r[:_WIDTH]] + [""] * (_WIDTH - len(r))
+
+
+def _after(rows, last):
+    # rows past the last occurrence of `last` (already archived); all if absent
+    if last:
+        for i in range(len(rows) - 1, -1, -1):
+            if rows[i] == last:
+                return rows[i + 1:]
+    return rows
+
+
+def _split_months(rows, fallback):
+    # {"YYYY-MM": [rows]}; a row without a readable TIMESTAMP stays with the one before it
+    out = {}
+    month = fallback
+
+    for r in rows:
+        if parse_ts(r[0]):
+            month = r[0][:7]
+        out.setdefault(month, []).append(r)
+
+    return out
+
+
+# ---------------- ROTATION ----------------
+
+def _archive_tab(month, rows):
+    ws = archive_log_ws(month)
+
+    if ws is None:
+        add_archive_log_ws(month, rows)
+        return len(rows)
+
+    n = len(ws.col_values(1))
+    tail = ws.get(f"A{n}:{_LAST_COL}{n}") if n > 1 else []
+    fresh = _after(rows, _pad(tail[0]) if tail else None)
+
+    if fresh:
+        ws.append_rows(fresh)
+
+    return len(fresh)
+
+
+def _archive_file(out_dir, month, rows, state):
+    fresh = _after(rows, state.get("last_row"))
+
+    if not fresh:
+        return state
+
+    folder = os.path.join(out_dir, month)
+    os.makedirs(folder, exist_ok=True)
+    write_part(os.path.join(folder, f"part-{state.get('rows', 0):09d}.{FORMAT}"), LOG_SCHEMA, to_columns(LOG_SCHEMA, fresh))
+
+    return {
+        "rows": state.get("rows", 0) + len(fresh),
+        "last_row": fresh[-1],
+        "tab": archive_log_title(month),
+        "spreadsheet": LOG_ARCHIVE_SPREADSHEET_ID,
+    }
+
+
+def rotate_log(keep_days=None, out_dir=None, now=None):
+    # {"archived": rows moved, "kept": rows left live, "months": {month: rows}}
+    keep_days = LOG_KEEP_DAYS if keep_days is None else keep_days
+    out_dir = out_dir or LOG_ARCHIVE_DIR
+    cutoff = (now or now_local()) - timedelta(days=keep_days)
+
+    rows = [_pad(r) for r in log_ws().batch_get([f"A2:{_LAST_COL}"])[0]]
+
+    old = 0
+    for r in rows:
+        ts = parse_ts(r[0])
+        if ts and ts >= cutoff:
+            break
+        old += 1
+
+    if not old:
+        return {"archived": 0, "kept": len(rows), "months": {}}
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    months = manifest.setdefault("months", {})
+    moved = {}
+
+    for month, chunk in _split_months(rows[:old], cutoff.strftime("%Y-%m")).items():
+        _archive_tab(month, chunk)
+        months[month] = _archive_file(out_dir, month, chunk, months.get(month, {}))
+        moved[month] = len(chunk)
+        save_manifest(out_dir, manifest)
+
+    delete_log_rows(old)
+
+    manifest["live_from"] = rows[old][0] if old < len(rows) else cutoff.strftime(TS_FORMAT)
+    manifest["rotated_at"] = time.time()
+    save_manifest(out_dir, manifest)
+
+    log_archive_debug("ROTATED", f"{old} rows {moved}")
+    return {"archived": old, "kept": len(rows) - old, "months": moved}
+
+
+# ---------------- QUERIES ----------------
+
+def _month_rows(out_dir, month, columns):
+    # archived rows of one month as {column: value} (strings, like the sheet)
+    folder = os.path.join(out_dir, month)
+    parts = sorted(f for f in os.listdir(folder) if f.startswith("part-")) if os.path.isdir(folder) else []
+
+    if parts:
+        out = []
+        for f in parts:
+            cols = read_part(os.path.join(folder, f), columns)
+            if "TIMESTAMP" in cols:
+                cols["TIMESTAMP"] = [str(v) if v is not None else "" for v in cols["TIMESTAMP"]]
+            out += [dict(zip(columns, values)) for values in zip(*(cols[c] for c in columns))]
+        return out
+
+    # no local copy (other machine / deleted): read the month's tab
+    ws = archive_log_ws(month)
+    if ws is None:
+        return []
+
+    idx = [LOG_SCHEMA.index(c) for c in columns]
+    return [{c: r[i] for c, i in zip(columns, idx)} for r in map(_pad, ws.batch_get([f"A2:{_LAST_COL}"])[0])]
+
+
+def _match(row, start, end, filters):
+    ts = row["TIMESTAMP"]
+
+    if start and ts < start:
+        return False
+    if end and ts >= end:
+        return False
+
+    for c, want in filters.items():
+        if isinstance(want, (list, tuple, set, frozenset)):
+            if row[c] not in want:
+                return False
+        elif row[c] != want:
+            return False
+
+    return True
+
+
+def archived_months(out_dir=None, manifest=None):
+    # from the local manifest; without one (fresh machine) from the archive tabs
+    manifest = manifest if manifest is not None else load_manifest(out_dir or LOG_ARCHIVE_DIR)
+    return sorted(manifest.get("months", {})) or archive_log_months()
+
+
+def query_log(start=None, end=None, filters=None, columns=None, out_dir=None, live=True):
+    # ACTIVITY_LOG rows with start <= TIMESTAMP < end ("YYYY-MM-DD[ HH:MM:SS]")
+    # matching {column: value | [values]}, oldest first, from the archive and
+    # the live tab. Only months overlapping [start, end) are read.
+    out_dir = out_dir or LOG_ARCHIVE_DIR
+    filters = {c: (str(w) if not isinstance(w, (list, tuple, set, frozenset)) else {str(v) for v in w})
+               for c, w in (filters or {}).items() if w is not None}
+    columns = list(columns or LOG_SCHEMA)
+    wanted = list(dict.fromkeys(["TIMESTAMP", *filters, *columns]))
+    manifest = load_manifest(out_dir)
+    out = []
+
+    for month in archived_months(out_dir, manifest):
+        if start and month < start[:7]:
+            continue
+        if end and month > end[:7]:
+            continue
+        out += [r for r in _month_rows(out_dir, month, wanted) if _match(r, start, end, filters)]
+
+    if live and not (end and manifest.get("live_from") and end <= manifest["live_from"]):
+        idx = [LOG_SCHEMA.index(c) for c in wanted]
+        rows = ({c: r[i] for c, i in zip(wanted, idx)} for r in map(_pad, log_ws().batch_get([f"A2:{_LAST_COL}"])[0]))
+        out += [r for r in rows if _match(r, start, end, filters)]
+
+    if columns != wanted:
+        out = [{c: r[c] for c in columns} for r in out]
+
+    return out
+
+
+def archived_events(out_dir=None):
+    # (TIMESTAMP, USER_ID, ACTION_TYPE) of every archived row, for REPORTS.
+    # Months come from the local manifest only, so a rebuild never lists tabs.
+    out_dir = out_dir or LOG_ARCHIVE_DIR
+    cols = ["TIMESTAMP", "USER_ID", "ACTION_TYPE"]
+
+    for month in sorted(load_manifest(out_dir).get("months", {})):
+        for r in _month_rows(out_dir, month, cols):
+            yield r["TIMESTAMP"], r["USER_ID"], r["ACTION_TYPE"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rotate ACTIVITY_LOG into monthly archive tabs / files, or query it")
+    parser.add_argument("--keep-days", type=int, default=LOG_KEEP_DAYS)
+    parser.add_argument("--out", default=LOG_ARCHIVE_DIR)
+    parser.add_argument("--query", action="store_true", help="print matching rows (archive + live) as JSON lines")
+    parser.add_argument("--since")
+    parser.add_argument("--until")
+    parser.add_argument("--user")
+    parser.add_argument("--action")
+    parser.add_argument("--item")
+    args = parser.parse_args(argv)
+
+    if args.query:
+        rows = query_log(args.since, args.until, {"USER_ID": args.user, "ACTION_TYPE": args.action, "ITEM_ID": args.item}, out_dir=args.out)
+        for r in rows:
+            print(json.dumps(r))
+        return 0
+
+    t0 = time.perf_counter()
+    stats = rotate_log(args.keep_days, args.out)
+
+    print(json.dumps({**stats, "seconds": round(time.perf_counter() - t0, 2)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
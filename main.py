@@ -1,3 +1,4 @@
+import asyncio
 import os
 from telegram.ext import (
     ApplicationBuilder,
@@ -11,6 +12,8 @@ from telegram.error import Conflict
 
 from accounts import start_button
 from router import route_message, callback_router
+from scheduler import schedule_jobs
+from sheets_logger import flush_log_actions
 
 TOKEN = os.environ["TELEGRAM_TOKEN"]
 
@@ -33,7 +36,19 @@ async def error_handler(update, context):
     log_line("ERROR", repr(context.error))
     log_line("UPDATE", update)
 
-app = ApplicationBuilder().token(TOKEN).build()
+# ================= SHUTDOWN =================
+
+async def flush_on_shutdown(app):
+
+    # ACTIVITY_LOG rows still queued since the last log_flush job; whatever
+    # fails stays in the local buffer for the next start
+    try:
+        written = await asyncio.to_thread(flush_log_actions)
+        print("LOG ROWS FLUSHED ON SHUTDOWN:", written)
+    except Exception as e:
+        print("LOG FLUSH ON SHUTDOWN FAILED:", repr(e))
+
+app = ApplicationBuilder().token(TOKEN).post_shutdown(flush_on_shutdown).build()
 
 print("Bot running...")
 print("Polling started")
@@ -65,6 +80,10 @@ async def debug_router(update, context):
 
 app.add_handler(MessageHandler(~filters.COMMAND, debug_router), group=2)
 
+# ================= BACKGROUND JOBS =================
+
+schedule_jobs(app)
+
 # ================= TELEGRAM POLLING =================
 
 try:
@@ -0,0 +1,204 @@
+import threading
+import time
+
+from telegram import InlineKeyboardButton
+
+from config import LOCAL_DB_PATH
+from local_db import open_db
+
+
+# ================================
+# TELEGRAM PHOTO CACHE
+# ================================
+# Telegram keeps every photo we receive; resending a file_id costs no upload.
+# Each incoming photo arrives as several PhotoSize objects. We keep, per
+# file_unique_id of the largest size:
+#
+#   file_id        full size, sent on demand
+#   thumb_file_id  largest size that fits THUMB_MAX_SIDE, sent in list views
+#   width/height/file_size
+#   first_ref      first submission / item that used the photo
+#
+# The same picture forwarded twice has the same file_unique_id, so it is
+# stored once and reported as a duplicate of first_ref.
+
+THUMB_MAX_SIDE = 320
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS photo_meta (
+    file_unique_id TEXT PRIMARY KEY,
+    file_id        TEXT NOT NULL,
+    width          INTEGER NOT NULL DEFAULT 0,
+    height         INTEGER NOT NULL DEFAULT 0,
+    file_size      INTEGER NOT NULL DEFAULT 0,
+    thumb_file_id  TEXT,
+    first_ref      TEXT,
+    created_at     REAL NOT NULL,
+    claimed_at     REAL
+);
+CREATE INDEX IF NOT EXISTS photo_meta_file_id ON photo_meta (file_id);
+CREATE INDEX IF NOT EXISTS photo_meta_thumb ON photo_meta (thumb_file_id);
+CREATE INDEX IF NOT EXISTS photo_meta_claimed ON photo_meta (claimed_at) WHERE claimed_at IS NOT NULL;
+"""
+
+
+def pick_sizes(sizes):
+    # (full, thumb) out of a message.photo list; thumb is None if only one size
+    if not sizes:
+        return None, None
+
+    ordered = sorted(sizes, key=lambda s: (s.width or 0) * (s.height or 0))
+    full = ordered[-1]
+
+    small = [s for s in ordered[:-1] if max(s.width or 0, s.height or 0) <= THUMB_MAX_SIDE]
+    thumb = small[-1] if small else (ordered[0] if len(ordered) > 1 else None)
+
+    return full, thumb
+
+
+class PhotoCache:
+
+    def __init__(self, path=LOCAL_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = open_db(path)
+        self._db.executescript(_SCHEMA)
+
+    def _exec(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def record(self, sizes, ref=None):
+        # returns the canonical record for this picture; "duplicate" is True
+        # when it was already used by a different ref
+        full, thumb = pick_sizes(sizes)
+
+        if full is None:
+            return None
+
+        self._exec(
+            """
+            INSERT OR IGNORE INTO photo_meta
+                (file_unique_id, file_id, width, height, file_size, thumb_file_id, first_ref, created_at, claimed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                full.file_unique_id,
+                full.file_id,
+                full.width or 0,
+                full.height or 0,
+                full.file_size or 0,
+                thumb.file_id if thumb else None,
+                ref,
+                time.time(),
+                time.time() if ref else None,
+            )
+        )
+
+        meta = self.by_unique_id(full.file_unique_id)
+
+        if ref and not meta["first_ref"]:
+            meta["first_ref"] = self.claim(full.file_unique_id, ref)
+
+        meta["duplicate"] = bool(ref and meta["first_ref"] and meta["first_ref"] != ref)
+        return meta
+
+    def claim(self, file_unique_id, ref):
+        # sets first_ref once; returns whoever owns the photo now
+        if not file_unique_id:
+            return None
+
+        self._exec(
+            "UPDATE photo_meta SET first_ref = ?, claimed_at = ? WHERE file_unique_id = ? AND first_ref IS NULL",
+            (ref, time.time(), file_unique_id)
+        )
+        meta = self.by_unique_id(file_unique_id)
+        return meta["first_ref"] if meta else None
+
+    def by_unique_id(self, file_unique_id):
+        rows = self._exec("SELECT * FROM photo_meta WHERE file_unique_id = ?", (file_unique_id,))
+        return dict(rows[0]) if rows else None
+
+    def by_file_id(self, file_id):
+        # accepts the full or the thumbnail file_id
+        if not file_id:
+            return None
+
+        rows = self._exec(
+            "SELECT * FROM photo_meta WHERE file_id = ? OR thumb_file_id = ? LIMIT 1",
+            (file_id, file_id)
+        )
+        return dict(rows[0]) if rows else None
+
+    def thumb_for(self, file_id):
+        # unknown photos (stored before the cache existed) go out as they are
+        meta = self.by_file_id(file_id)
+        return (meta["thumb_file_id"] or meta["file_id"]) if meta else file_id
+
+    def claimed_since(self, cursor, limit=1000):
+        # photos attributed to a submission / owner / item after `cursor`, oldest first
+        rows = self._exec(
+            """
+            SELECT * FROM photo_meta
+            WHERE claimed_at > ?
+            ORDER BY claimed_at
+            LIMIT ?
+            """,
+            (cursor, limit)
+        )
+        return [dict(r) for r in rows]
+
+    def count(self):
+        return self._exec("SELECT COUNT(*) FROM photo_meta")[0][0]
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def photo_cache():
+    global _CACHE
+
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = PhotoCache()
+
+    return _CACHE
+
+
+# ================================
+# SENDING
+# ================================
+
+def full_photo_button(file_id, label="🔍 FULL PHOTO"):
+    # callback data carries the unique id: file_ids are longer than Telegram's 64-byte limit
+    meta = photo_cache().by_file_id(file_id)
+
+    if not meta or not meta["thumb_file_id"]:
+        return None
+
+    return InlineKeyboardButton(label, callback_data=f"PHOTO_FULL|{meta['file_unique_id']}")
+
+
+async def full_photo_callback(update, context):
+
+    query = update.callback_query
+    await query.answer()
+
+    try:
+        unique_id = query.data.split("|")[1]
+    except IndexError:
+        return
+
+    meta = photo_cache().by_unique_id(unique_id)
+
+    if not meta:
+        await query.message.reply_text("⚠️ Photo no longer available.")
+        return
+
+    await context.bot.send_photo(
+        chat_id=query.message.chat.id,
+        photo=meta["file_id"],
+        reply_to_message_id=query.message.message_id
+    )
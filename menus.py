@@ -5,6 +5,7 @@ PANEL_ITEMS = "📦 ITEMS"
 PANEL_ACCOUNTS = "🏢 ACCOUNTS"
 PANEL_WORKFLOW = "🔄 WORKFLOW"
 BTN_PENDING_ACCOUNTS = "⏳ PENDING ACCOUNTS"
+BTN_BULK_REVIEW = "☑️ BULK REVIEW"
 PANEL_USERS = "👥 USERS"
 PANEL_TASKS = "📝 TASKS"
 PANEL_REPORTS = "📊 REPORTS PANEL"
@@ -25,6 +26,7 @@ BTN_EDIT_ITEM = "🏷️ EDIT ITEM"
 # Finder
 BTN_NEW_ITEM = "📦 NEW ITEM"
 BTN_MY_ITEMS = "🗂️ MY ITEMS"
+BTN_SUBMIT_FOR_REVIEW = "📤 SUBMIT FOR REVIEW"
 
 # Seller
 BTN_GET_PRICE = "💰 GET PRICE"
@@ -73,7 +75,7 @@ def accounts_menu(role=None):
     ]
 
     if role == "ADMIN":
-        rows.append([BTN_PENDING_ACCOUNTS])
+        rows.append([BTN_PENDING_ACCOUNTS, BTN_BULK_REVIEW])
 
     rows.append([PANEL_BACK])
 
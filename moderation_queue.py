@@ -0,0 +1,238 @@
+import json
+import threading
+import time
+
+from config import LOCAL_DB_PATH, REVIEWED_TOMBSTONE_DAYS
+from local_db import open_db
+
+
+# ================================
+# OWNER SUBMISSION MODERATION QUEUE
+# ================================
+# Durable replacement for the old POSTPONED_OWNER_SUBMISSIONS dict. One row
+# per submission the bot has shown to an admin:
+#
+#   SHOWN      card is on screen; chat_id / main_msg / media_msgs for cleanup
+#   POSTPONED  admin pressed POSTPONE; listed in the WORKFLOW panel
+#   REVIEWED   tombstone so the pending list skips it until the sheet catches
+#              up; deleted after REVIEWED_TOMBSTONE_DAYS
+#
+# Lookups go through the primary key or the (state, updated_at) index, so
+# listing a page costs O(page) and nothing is held in memory.
+
+SHOWN = "SHOWN"
+POSTPONED = "POSTPONED"
+REVIEWED = "REVIEWED"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submission_queue (
+    submission_id TEXT PRIMARY KEY,
+    state         TEXT NOT NULL,
+    chat_id       INTEGER,
+    main_msg      INTEGER,
+    media_msgs    TEXT NOT NULL DEFAULT '[]',
+    message       TEXT NOT NULL DEFAULT '',
+    photo         TEXT,
+    updated_at    REAL NOT NULL,
+    expires_at    REAL
+);
+CREATE INDEX IF NOT EXISTS submission_queue_state_age
+    ON submission_queue (state, updated_at);
+CREATE INDEX IF NOT EXISTS submission_queue_expiry
+    ON submission_queue (expires_at) WHERE expires_at IS NOT NULL;
+"""
+
+# SQLite caps host parameters per statement (999 on older builds)
+_IN_CHUNK = 500
+
+
+class ModerationQueue:
+
+    def __init__(self, path=LOCAL_DB_PATH, tombstone_days=REVIEWED_TOMBSTONE_DAYS):
+        self.path = path
+        self.tombstone_seconds = tombstone_days * 86400
+        self._lock = threading.Lock()
+
+        self._db = open_db(path)
+        self._db.executescript(_SCHEMA)
+        self.expire()
+
+    def _exec(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ---------- writes ----------
+
+    def mark_shown(self, submission_id, chat_id, main_msg, media_msgs=None):
+        self._exec(
+            """
+            INSERT INTO submission_queue
+                (submission_id, state, chat_id, main_msg, media_msgs, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (submission_id) DO UPDATE SET
+                state = excluded.state,
+                chat_id = excluded.chat_id,
+                main_msg = excluded.main_msg,
+                media_msgs = excluded.media_msgs,
+                updated_at = excluded.updated_at,
+                expires_at = NULL
+            """,
+            (submission_id, SHOWN, chat_id, main_msg, json.dumps(media_msgs or []), time.time())
+        )
+
+    def postpone(self, submission_id, message="", photo=None):
+        self._exec(
+            """
+            INSERT INTO submission_queue
+                (submission_id, state, message, photo, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (submission_id) DO UPDATE SET
+                state = excluded.state,
+                message = excluded.message,
+                photo = excluded.photo,
+                updated_at = excluded.updated_at,
+                expires_at = NULL
+            """,
+            (submission_id, POSTPONED, message or "", photo, time.time())
+        )
+
+    def mark_reviewed(self, submission_ids):
+        if isinstance(submission_ids, str):
+            submission_ids = [submission_ids]
+
+        now = time.time()
+        expires = now + self.tombstone_seconds
+
+        # tombstones keep no payload
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                """
+                INSERT INTO submission_queue
+                    (submission_id, state, updated_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (submission_id) DO UPDATE SET
+                    state = excluded.state,
+                    chat_id = NULL,
+                    main_msg = NULL,
+                    media_msgs = '[]',
+                    message = '',
+                    photo = NULL,
+                    updated_at = excluded.updated_at,
+                    expires_at = excluded.expires_at
+                """,
+                [(sid, REVIEWED, now, expires) for sid in submission_ids]
+            )
+            self._db.execute("COMMIT")
+
+    def expire(self, now=None):
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM submission_queue WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now or time.time(),)
+            )
+            return cur.rowcount
+
+    def clear(self):
+        self._exec("DELETE FROM submission_queue")
+
+    # ---------- reads ----------
+
+    def get(self, submission_id):
+        rows = self._exec("SELECT * FROM submission_queue WHERE submission_id = ?", (submission_id,))
+        return _record(rows[0]) if rows else None
+
+    def cleanup_info(self, submission_id):
+        # message ids of the on-screen card, shaped like the old dict entry
+        rec = self.get(submission_id)
+
+        if not rec or rec["state"] == REVIEWED:
+            return None
+
+        out = {}
+
+        if rec["main_msg"]:
+            out["chat_id"] = rec["chat_id"]
+            out["main_msg"] = rec["main_msg"]
+            out["media_msgs"] = rec["media_msgs"]
+
+        return out or None
+
+    def reviewed_ids(self, submission_ids):
+        ids = list(submission_ids)
+        out = set()
+
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start:start + _IN_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = self._exec(
+                f"SELECT submission_id FROM submission_queue WHERE state = ? AND submission_id IN ({marks})",
+                [REVIEWED, *chunk]
+            )
+            out.update(r["submission_id"] for r in rows)
+
+        return out
+
+    def count(self, state):
+        return self._exec("SELECT COUNT(*) FROM submission_queue WHERE state = ?", (state,))[0][0]
+
+    def page(self, state, after=None, size=10):
+        # oldest first, straight from the (state, updated_at) index. after is
+        # the (updated_at, submission_id) of the last record already listed:
+        # a keyset cursor, so records leaving the state meanwhile don't shift
+        # the next page past ones nobody has seen
+        if after is None:
+            rows = self._exec(
+                """
+                SELECT * FROM submission_queue
+                WHERE state = ?
+                ORDER BY updated_at, submission_id
+                LIMIT ?
+                """,
+                (state, size)
+            )
+        else:
+            updated_at, submission_id = after
+            rows = self._exec(
+                """
+                SELECT * FROM submission_queue
+                WHERE state = ?
+                  AND (updated_at > ? OR (updated_at = ? AND submission_id > ?))
+                ORDER BY updated_at, submission_id
+                LIMIT ?
+                """,
+                (state, updated_at, updated_at, submission_id, size)
+            )
+        return [_record(r) for r in rows]
+
+    def count_after(self, state, after):
+        # records of a state past a page() cursor
+        updated_at, submission_id = after
+        return self._exec(
+            """
+            SELECT COUNT(*) FROM submission_queue
+            WHERE state = ?
+              AND (updated_at > ? OR (updated_at = ? AND submission_id > ?))
+            """,
+            (state, updated_at, updated_at, submission_id)
+        )[0][0]
+
+def _record(row):
+    rec = dict(row)
+    rec["media_msgs"] = json.loads(rec["media_msgs"] or "[]")
+    return rec
+
+
+_QUEUE = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def moderation_queue():
+    global _QUEUE
+
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                _QUEUE = ModerationQueue()
+
+    return _QUEUE
@@ -0,0 +1,318 @@
+import asyncio
+import hashlib
+import io
+import os
+import threading
+import time
+
+from config import LOCAL_DB_PATH, PHOTO_ARCHIVE_DIR, PHOTO_ARCHIVE_CONCURRENCY
+from local_db import open_db
+
+try:
+    from PIL import Image
+except ImportError:     # perceptual hashing is skipped without Pillow
+    Image = None
+
+
+# ================================
+# LOCAL PHOTO ARCHIVE
+# ================================
+# Optional (PHOTO_ARCHIVE_DIR). Photos claimed by a submission / owner / item
+# are queued here and downloaded in the background via bot.get_file into a
+# content-addressed store:
+#
+#   <PHOTO_ARCHIVE_DIR>/ab/cd/abcd...<sha256>.jpg
+#
+# The queue lives in the local SQLite file, so a restart resumes where it
+# stopped. With Pillow installed each photo also gets a 64-bit dHash; hashes
+# are split into 8 byte-sized bands so a near-duplicate lookup only compares
+# photos sharing a band (any two hashes within 7 bits share one).
+
+PENDING = "PENDING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+MAX_ATTEMPTS = 5
+BATCH_SIZE = 50
+PHASH_MAX_DISTANCE = 6
+
+_BANDS = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS photo_archive (
+    file_unique_id TEXT PRIMARY KEY,
+    file_id        TEXT NOT NULL,
+    ref            TEXT NOT NULL DEFAULT '',
+    state          TEXT NOT NULL,
+    attempts       INTEGER NOT NULL DEFAULT 0,
+    sha256         TEXT,
+    size           INTEGER,
+    phash          INTEGER,
+    error          TEXT,
+    queued_at      REAL NOT NULL,
+    updated_at     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS photo_archive_state ON photo_archive (state, queued_at);
+CREATE INDEX IF NOT EXISTS photo_archive_sha ON photo_archive (sha256);
+
+CREATE TABLE IF NOT EXISTS photo_phash_band (
+    band           INTEGER NOT NULL,
+    value          INTEGER NOT NULL,
+    file_unique_id TEXT NOT NULL,
+    PRIMARY KEY (band, value, file_unique_id)
+);
+
+CREATE TABLE IF NOT EXISTS photo_archive_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def dhash(data):
+    # 64-bit difference hash of the image bytes; None without Pillow / on bad data
+    if Image is None:
+        return None
+
+    try:
+        img = Image.open(io.BytesIO(data)).convert("L").resize((9, 8))
+    except Exception:
+        return None
+
+    px = list(img.getdata())
+    bits = 0
+
+    for row in range(8):
+        for col in range(8):
+            left = px[row * 9 + col]
+            right = px[row * 9 + col + 1]
+            bits = (bits << 1) | (1 if left > right else 0)
+
+    # SQLite integers are signed 64-bit
+    return bits - (1 << 64) if bits >= (1 << 63) else bits
+
+
+def _bands(h):
+    u = h & ((1 << 64) - 1)
+    return [(i, (u >> (8 * i)) & 0xFF) for i in range(_BANDS)]
+
+
+def hamming(a, b):
+    return bin((a ^ b) & ((1 << 64) - 1)).count("1")
+
+
+def blob_path(root, sha):
+    return os.path.join(root, sha[:2], sha[2:4], f"{sha}.jpg")
+
+
+class PhotoArchive:
+
+    def __init__(self, root=PHOTO_ARCHIVE_DIR, path=LOCAL_DB_PATH, concurrency=PHOTO_ARCHIVE_CONCURRENCY):
+        self.root = root
+        self.concurrency = max(1, concurrency)
+        self._lock = threading.Lock()
+        self._db = open_db(path)
+        self._db.executescript(_SCHEMA)
+
+    def _exec(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ---------- queue ----------
+
+    def enqueue(self, photos):
+        # photos: [(file_unique_id, file_id, ref)]; known photos are ignored
+        now = time.time()
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            cur = self._db.executemany(
+                """
+                INSERT OR IGNORE INTO photo_archive
+                    (file_unique_id, file_id, ref, state, queued_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [(u, f, r or "", PENDING, now, now) for u, f, r in photos if u and f]
+            )
+            self._db.execute("COMMIT")
+            return cur.rowcount
+
+    def enqueue_from_cache(self, cache, limit=1000):
+        # pulls photos the cache has attributed to a submission / item since
+        # the last sync; the cursor is stored so restarts don't rescan
+        rows = self._exec("SELECT value FROM photo_archive_meta WHERE key = 'cache_cursor'")
+        cursor = float(rows[0]["value"]) if rows else 0.0
+
+        claimed = cache.claimed_since(cursor, limit)
+
+        if not claimed:
+            return 0
+
+        added = self.enqueue([(m["file_unique_id"], m["file_id"], m["first_ref"]) for m in claimed])
+
+        self._exec(
+            "INSERT OR REPLACE INTO photo_archive_meta (key, value) VALUES ('cache_cursor', ?)",
+            (repr(claimed[-1]["claimed_at"]),)
+        )
+
+        return added
+
+    def pending(self, limit=BATCH_SIZE):
+        rows = self._exec(
+            """
+            SELECT * FROM photo_archive
+            WHERE state = ? AND attempts < ?
+            ORDER BY queued_at
+            LIMIT ?
+            """,
+            (PENDING, MAX_ATTEMPTS, limit)
+        )
+        return [dict(r) for r in rows]
+
+    def counts(self):
+        rows = self._exec("SELECT state, COUNT(*) AS n FROM photo_archive GROUP BY state")
+        return {r["state"]: r["n"] for r in rows}
+
+    # ---------- store ----------
+
+    def _write_blob(self, data):
+        sha = hashlib.sha256(data).hexdigest()
+        path = blob_path(self.root, sha)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+
+        return sha
+
+    def _store(self, unique_id, data):
+        # file I/O and hashing, run in a worker thread
+        sha = self._write_blob(data)
+        h = dhash(data)
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                """
+                UPDATE photo_archive
+                SET state = ?, sha256 = ?, size = ?, phash = ?, error = NULL, updated_at = ?
+                WHERE file_unique_id = ?
+                """,
+                (DONE, sha, len(data), h, time.time(), unique_id)
+            )
+            if h is not None:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO photo_phash_band (band, value, file_unique_id) VALUES (?, ?, ?)",
+                    [(b, v, unique_id) for b, v in _bands(h)]
+                )
+            self._db.execute("COMMIT")
+
+        return sha, h
+
+    def _fail(self, unique_id, error):
+        self._exec(
+            """
+            UPDATE photo_archive
+            SET attempts = attempts + 1,
+                state = CASE WHEN attempts + 1 >= ? THEN ? ELSE state END,
+                error = ?, updated_at = ?
+            WHERE file_unique_id = ?
+            """,
+            (MAX_ATTEMPTS, FAILED, str(error)[:500], time.time(), unique_id)
+        )
+
+    # ---------- lookups ----------
+
+    def ref_for(self, file_unique_id):
+        rows = self._exec("SELECT ref FROM photo_archive WHERE file_unique_id = ?", (file_unique_id,))
+        return rows[0]["ref"] if rows else ""
+
+    def path_for(self, file_unique_id):
+        rows = self._exec("SELECT sha256 FROM photo_archive WHERE file_unique_id = ? AND state = ?", (file_unique_id, DONE))
+        return blob_path(self.root, rows[0]["sha256"]) if rows else None
+
+    def similar(self, file_unique_id, max_distance=PHASH_MAX_DISTANCE):
+        # [(distance, file_unique_id, ref)] of near-identical photos under another ref
+        rows = self._exec("SELECT phash, ref, sha256 FROM photo_archive WHERE file_unique_id = ?", (file_unique_id,))
+
+        if not rows:
+            return []
+
+        h, ref, sha = rows[0]["phash"], rows[0]["ref"], rows[0]["sha256"]
+        out = {}
+
+        # byte-identical files first (works without Pillow)
+        if sha:
+            for r in self._exec(
+                "SELECT file_unique_id, ref FROM photo_archive WHERE sha256 = ? AND file_unique_id != ?",
+                (sha, file_unique_id)
+            ):
+                if r["ref"] != ref:
+                    out[r["file_unique_id"]] = (0, r["file_unique_id"], r["ref"])
+
+        if h is not None:
+            clauses = " OR ".join("(b.band = ? AND b.value = ?)" for _ in range(_BANDS))
+            params = [x for pair in _bands(h) for x in pair]
+
+            for r in self._exec(
+                f"""
+                SELECT DISTINCT a.file_unique_id, a.ref, a.phash
+                FROM photo_phash_band b JOIN photo_archive a USING (file_unique_id)
+                WHERE ({clauses}) AND a.file_unique_id != ?
+                """,
+                params + [file_unique_id]
+            ):
+                d = hamming(h, r["phash"])
+                if d <= max_distance and r["ref"] != ref:
+                    out.setdefault(r["file_unique_id"], (d, r["file_unique_id"], r["ref"]))
+
+        return sorted(out.values())
+
+    # ---------- download ----------
+
+    async def run_once(self, bot, limit=BATCH_SIZE):
+        # downloads up to `limit` queued photos; returns [(unique_id, similar)] for the new ones
+        batch = self.pending(limit)
+
+        if not batch:
+            return []
+
+        limiter = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def one(rec):
+            async with limiter:
+                try:
+                    f = await bot.get_file(rec["file_id"])
+                    data = bytes(await f.download_as_bytearray())
+                    await loop.run_in_executor(None, self._store, rec["file_unique_id"], data)
+                    return rec["file_unique_id"]
+                except Exception as e:
+                    self._fail(rec["file_unique_id"], repr(e))
+                    return None
+
+        done = await asyncio.gather(*[one(r) for r in batch])
+
+        return [(u, self.similar(u)) for u in done if u]
+
+
+_ARCHIVE = None
+_ARCHIVE_LOCK = threading.Lock()
+
+
+def photo_archive():
+    # None when PHOTO_ARCHIVE_DIR is not configured
+    global _ARCHIVE
+
+    if not PHOTO_ARCHIVE_DIR:
+        return None
+
+    if _ARCHIVE is None:
+        with _ARCHIVE_LOCK:
+            if _ARCHIVE is None:
+                _ARCHIVE = PhotoArchive()
+
+    return _ARCHIVE
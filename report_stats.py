@@ -0,0 +1,262 @@
+import threading
+import time
+from collections import Counter, defaultdict
+
+
+# ================================
+# ROLLING REPORT AGGREGATES
+# ================================
+# Counters behind the REPORTS panel. Built once from three column reads
+# (ITEMS_MASTER, OWNERS_MASTER, ACTIVITY_LOG) and then kept current by the
+# write paths, so a report is a few dict lookups instead of a sheet scan.
+#
+# Every item row remembers what it contributed (status, finder, state,
+# make, created / sold day, prices); an update subtracts the old
+# contribution and adds the new one, so events cost O(1) and no total can
+# drift from the rows it came from. Money is kept in integer cents.
+#
+#   stats.set_item(row, item_id, {"ITEM_STATUS": "DRAFT", ...})
+#   stats.update_item(row, {"ITEM_STATUS": "PUBLISHED"})
+#   stats.add_event("2026-03-01 10:00:00", admin_id, "APPROVE_OWNER")
+#   stats.summary()       # totals for the panel
+#   stats.day("2026-03-01")
+
+ITEM_DIMENSIONS = ("ITEM_STATUS", "FINDER_WORKER_ID", "STATE", "MAKE")
+MONEY_COLUMNS = ("OWNER_PRICE", "LIST_PRICE", "COMMISSION_AMOUNT")
+
+# report columns read from ITEMS_MASTER
+ITEM_COLUMNS = ["CREATED_AT", "ITEM_ID", *ITEM_DIMENSIONS, *MONEY_COLUMNS, "SOLD_AT"]
+
+APPROVAL_ACTIONS = {"APPROVE_OWNER", "APPROVE_ITEM"}
+
+_EMPTY = "—"
+
+
+def _cents(value):
+    # "$45,000" / "45000.5" / "" -> 4500000 / 4500050 / 0
+    v = str(value or "").strip().replace("$", "").replace(",", "").replace(" ", "")
+
+    if not v:
+        return 0
+
+    try:
+        return int(round(float(v) * 100))
+    except ValueError:
+        return 0
+
+
+def _key(value):
+    return str(value or "").strip() or _EMPTY
+
+
+class ReportStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        self.version = 0
+        self._reset()
+
+    def _reset(self):
+        self._items = {}                            # row -> contribution tuple
+        self._counts = {d: Counter() for d in ITEM_DIMENSIONS}
+        self._money = defaultdict(lambda: [0, 0, 0, 0])   # status -> [items priced, owner, list, commission] cents
+        self._owners = {}                           # owner_id -> (finder, status)
+        self._owners_per_finder = Counter()
+        self._owner_status = Counter()
+        self._approvals = Counter()                 # user_id -> approvals, all time
+        self._actions = Counter()                   # ACTION_TYPE -> events, all time
+        self._days = defaultdict(Counter)           # "YYYY-MM-DD" -> {key: n}
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    def age(self):
+        return time.monotonic() - self.loaded_at if self.loaded else None
+
+    # ---------- items ----------
+
+    @staticmethod
+    def _contribution(item_id, values):
+        money = tuple(_cents(values.get(c)) for c in MONEY_COLUMNS)
+        return (
+            item_id,
+            *(_key(values.get(d)) for d in ITEM_DIMENSIONS),
+            str(values.get("CREATED_AT") or "")[:10],
+            str(values.get("SOLD_AT") or "")[:10],
+            money,
+            # the raw values, so a partial update can rebuild the tuple
+            {c: values.get(c, "") for c in ITEM_COLUMNS},
+        )
+
+    def _apply(self, rec, sign):
+        _, status, finder, state, make, created, sold, money, _ = rec
+
+        for d, v in zip(ITEM_DIMENSIONS, (status, finder, state, make)):
+            counts = self._counts[d]
+            counts[v] += sign
+            if counts[v] <= 0:
+                del counts[v]
+
+        totals = self._money[status]
+        if any(money):
+            totals[0] += sign
+        for i, cents in enumerate(money, start=1):
+            totals[i] += sign * cents
+        if not any(totals):
+            del self._money[status]
+
+        for day, k in ((created, "ITEMS_CREATED"), (sold, "ITEMS_SOLD")):
+            if day:
+                self._bump(day, k, sign)
+
+    def _bump(self, day, k, n=1):
+        counts = self._days[day]
+        counts[k] += n
+        if counts[k] <= 0:
+            del counts[k]
+            if not counts:
+                del self._days[day]
+
+    def _set(self, row, item_id, values):
+        old = self._items.pop(row, None)
+        if old:
+            self._apply(old, -1)
+
+        rec = self._contribution(item_id, values)
+        self._items[row] = rec
+        self._apply(rec, 1)
+
+    def set_item(self, row, item_id, values):
+        # values: {column: value} of the whole row (missing columns count as empty)
+        with self._lock:
+            self._set(row, item_id, values)
+            self.version += 1
+
+    def update_item(self, row, changes):
+        # changes: {column: new value}; False if the row is not known yet
+        with self._lock:
+            old = self._items.get(row)
+            if not old:
+                return False
+
+            if not any(c in old[-1] for c in changes):
+                return True
+
+            self._set(row, old[0], {**old[-1], **changes})
+            self.version += 1
+            return True
+
+    def remove_item(self, row):
+        with self._lock:
+            old = self._items.pop(row, None)
+            if old:
+                self._apply(old, -1)
+                self.version += 1
+
+    # ---------- owners ----------
+
+    def _set_owner(self, owner_id, finder, status):
+        old = self._owners.get(owner_id)
+        if old:
+            for counts, v in ((self._owners_per_finder, old[0]), (self._owner_status, old[1])):
+                counts[v] -= 1
+                if counts[v] <= 0:
+                    del counts[v]
+
+        rec = (_key(finder), _key(status).upper())
+        self._owners[owner_id] = rec
+        self._owners_per_finder[rec[0]] += 1
+        self._owner_status[rec[1]] += 1
+
+    def set_owner(self, owner_id, finder, status):
+        if not owner_id:
+            return
+
+        with self._lock:
+            self._set_owner(owner_id, finder, status)
+            self.version += 1
+
+    # ---------- ACTIVITY_LOG ----------
+
+    def _event(self, ts, user_id, action):
+        action = _key(action).upper()
+        day = str(ts or "")[:10]
+
+        self._actions[action] += 1
+        if action in APPROVAL_ACTIONS:
+            self._approvals[_key(user_id)] += 1
+
+        if day:
+            self._bump(day, action)
+            if action in APPROVAL_ACTIONS:
+                self._bump(day, ("APPROVED_BY", _key(user_id)))
+
+    def add_event(self, ts, user_id, action):
+        with self._lock:
+            self._event(ts, user_id, action)
+            self.version += 1
+
+    # ---------- bulk load ----------
+
+    def load(self, items, owners, events):
+        # items: (row, item_id, {column: value}); owners: (owner_id, finder, status);
+        # events: (timestamp, user_id, action). Replaces everything.
+        with self._lock:
+            self._reset()
+
+            for row, item_id, values in items:
+                self._set(row, item_id, values)
+
+            for owner_id, finder, status in owners:
+                if owner_id:
+                    self._set_owner(owner_id, finder, status)
+
+            for ts, user_id, action in events:
+                self._event(ts, user_id, action)
+
+            self.loaded_at = time.monotonic()
+            self.version += 1
+
+    # ---------- reads ----------
+
+    def summary(self):
+        # independent of the number of rows: copies of the counters
+        with self._lock:
+            money = {status: {
+                "items": t[0],
+                "owner_price": t[1] / 100,
+                "list_price": t[2] / 100,
+                "commission": t[3] / 100,
+            } for status, t in self._money.items()}
+
+            return {
+                "items": len(self._items),
+                "by_status": dict(self._counts["ITEM_STATUS"]),
+                "by_finder": dict(self._counts["FINDER_WORKER_ID"]),
+                "by_state": dict(self._counts["STATE"]),
+                "by_make": dict(self._counts["MAKE"]),
+                "money": money,
+                "owners": len(self._owners),
+                "owners_by_status": dict(self._owner_status),
+                "owners_per_finder": dict(self._owners_per_finder),
+                "approvals": dict(self._approvals),
+                "actions": dict(self._actions),
+            }
+
+    def counts(self, dimension):
+        with self._lock:
+            return dict(self._counts[dimension])
+
+    def day(self, day):
+        # {"ITEMS_CREATED": n, "ITEMS_SOLD": n, <ACTION_TYPE>: n, "approved_by": {user: n}}
+        with self._lock:
+            counts = dict(self._days.get(day, {}))
+
+        out = {k: v for k, v in counts.items() if not isinstance(k, tuple)}
+        out["approved_by"] = {k[1]: v for k, v in counts.items() if isinstance(k, tuple)}
+        return out
@@ -0,0 +1,186 @@
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from accounts import run_sheet, log_block, log_line
+from menus import PANEL_REPORTS, BTN_REPORTS_ACTION
+from sheets_logger import report_summary, report_day
+from utils import now_local
+
+
+# ================================
+# REPORTS PANEL
+# ================================
+# Everything here is read from sheets_logger.REPORTS, the rolling totals
+# kept current by the write paths. Only the first report after a restart
+# (or after REPORTS_TTL) reads the sheets: one batch_get per tab.
+
+REPORT_ROLES = {"ADMIN", "GATEKEEPER"}
+REPORT_BUTTONS = [PANEL_REPORTS, BTN_REPORTS_ACTION]
+
+TOP_OVERVIEW = 5
+TOP_DETAIL = 25
+
+# callback section -> (title, summary key)
+SECTIONS = {
+    "FINDER": ("🔎 Items per finder", "by_finder"),
+    "STATE": ("📍 Items per state", "by_state"),
+    "MAKE": ("🚚 Items per make", "by_make"),
+    "OWNERS": ("🏢 Owners per finder", "owners_per_finder"),
+    "APPROVALS": ("✅ Approvals per admin / gatekeeper", "approvals"),
+}
+
+
+def report_debug(label, value=""):
+    print(f"[REPORTS DEBUG] {label}: {value}")
+
+
+def _money(v):
+    return f"${v:,.0f}"
+
+
+def _top(counts, n):
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+def _top_line(counts, n=TOP_OVERVIEW):
+    return " · ".join(f"{k} {v}" for k, v in _top(counts, n)) or "—"
+
+
+def _money_lines(money):
+    lines = []
+
+    for status, label in (("PUBLISHED", "Listed"), ("PENDING_REVIEW", "In review"), ("SOLD", "Sold")):
+        m = money.get(status)
+        if not m:
+            continue
+        lines.append(
+            f"💰 {label}: {m['items']} priced · owner {_money(m['owner_price'])} · "
+            f"list {_money(m['list_price'])} · commission {_money(m['commission'])}"
+        )
+
+    commission = sum(m["commission"] for m in money.values())
+    lines.append(f"💵 Commission, all items: {_money(commission)}")
+    return lines
+
+
+def overview_text(s):
+    lines = [
+        "📊 REPORTS",
+        "",
+        f"📦 Items: {s['items']}",
+        f"   {_top_line(s['by_status'], 10)}",
+        *_money_lines(s["money"]),
+        "",
+        f"🏢 Owners: {s['owners']} ({_top_line(s['owners_by_status'], 3)})",
+        f"✅ Approvals: {sum(s['approvals'].values())}",
+        "",
+        f"🔎 Top finders: {_top_line(s['by_finder'])}",
+        f"📍 Top states: {_top_line(s['by_state'])}",
+        f"🚚 Top makes: {_top_line(s['by_make'])}",
+    ]
+    return "\n".join(lines)
+
+
+def section_text(s, section):
+    title, key = SECTIONS[section]
+    counts = s[key]
+    lines = [title, ""]
+
+    for k, v in _top(counts, TOP_DETAIL):
+        lines.append(f"• {k}: {v}")
+
+    if len(counts) > TOP_DETAIL:
+        lines.append(f"… and {len(counts) - TOP_DETAIL} more")
+
+    if not counts:
+        lines.append("Nothing yet.")
+
+    return "\n".join(lines)
+
+
+def day_text(d, day, title="📅 Activity"):
+    lines = [
+        f"{title} {day}",
+        "",
+        f"📦 Items created: {d.get('ITEMS_CREATED', 0)}",
+        f"💵 Items sold: {d.get('ITEMS_SOLD', 0)}",
+    ]
+
+    actions = {k: v for k, v in d.items() if k not in ("ITEMS_CREATED", "ITEMS_SOLD", "approved_by")}
+    if actions:
+        lines.append(f"📝 Logged: {_top_line(actions, 10)}")
+
+    if d["approved_by"]:
+        lines.append(f"✅ Approvals: {_top_line(d['approved_by'], 10)}")
+
+    return "\n".join(lines)
+
+
+def digest_text(day):
+    # daily digest for the admins: the day's activity + current totals
+    return day_text(report_day(day), day, "🗞️ Daily digest") + "\n\n" + overview_text(report_summary())
+
+
+def _keyboard():
+    rows = [
+        [InlineKeyboardButton("🔎 Finders", callback_data="REPORT|FINDER"),
+         InlineKeyboardButton("📍 States", callback_data="REPORT|STATE"),
+         InlineKeyboardButton("🚚 Makes", callback_data="REPORT|MAKE")],
+        [InlineKeyboardButton("🏢 Owners", callback_data="REPORT|OWNERS"),
+         InlineKeyboardButton("✅ Approvals", callback_data="REPORT|APPROVALS"),
+         InlineKeyboardButton("📅 Today", callback_data="REPORT|TODAY")],
+        [InlineKeyboardButton("📊 Overview", callback_data="REPORT|OVERVIEW")],
+    ]
+    return InlineKeyboardMarkup(rows)
+
+
+def _render(section):
+    if section == "TODAY":
+        day = now_local().strftime("%Y-%m-%d")
+        return day_text(report_day(day), day)
+
+    s = report_summary()
+    return section_text(s, section) if section in SECTIONS else overview_text(s)
+
+
+# ---------------- HANDLERS ----------------
+
+async def send_reports(context, chat_id, section="OVERVIEW", query=None):
+    text = await run_sheet(context, _render, section)
+
+    if text is None:
+        text = "⚠️ Could not load the reports, try again."
+
+    if query:
+        try:
+            await query.edit_message_text(text, reply_markup=_keyboard())
+        except Exception as e:
+            # "message is not modified" when the same section is pressed twice
+            report_debug("EDIT_ERROR", repr(e))
+        return
+
+    await context.bot.send_message(chat_id=chat_id, text=text, reply_markup=_keyboard())
+
+
+async def report_callback(update, context):
+
+    query = update.callback_query
+    await query.answer()
+
+    section = query.data.split("|", 1)[1] if "|" in query.data else "OVERVIEW"
+
+    await send_reports(context, query.message.chat.id, section, query=query)
+
+
+async def handle_reports_panel(update, context, text, role, status):
+
+    if text not in REPORT_BUTTONS or role not in REPORT_ROLES or status != "ACTIVE":
+        return False
+
+    try:
+        await send_reports(context, update.effective_chat.id)
+
+    except Exception as e:
+        log_block("REPORTS ERROR")
+        log_line("ERROR", repr(e))
+
+    return True
@@ -0,0 +1,134 @@
+from gspread.utils import rowcol_to_a1
+
+from sql_store import EntityTable
+
+
+# ================================
+# REPOSITORIES
+# ================================
+# Row lookups and writes for the bot's entities (items, owners, submissions,
+# tasks, users, roles, permissions, log), addressed by sheet row number like
+# everywhere else in the bot. Rows come back padded to the schema.
+#
+#   SheetsRepository  any gspread worksheet: a lookup is one read of the tab
+#   SqlRepository     a tab of the SQL store (sql_store.SqlWorksheet): a lookup
+#                     is an indexed query on the entity's table that reads
+#                     only the matching rows
+#
+# open_repository() picks the implementation from the worksheet it is given,
+# so callers don't branch on STORAGE_BACKEND. Writes go through the worksheet
+# on both, which keeps tab versions, the Sheets mirror and call budgets.
+#
+#   repo = open_repository(owners_ws(), OWNERS_SCHEMA, "OWNER_ID")
+#   row_i, r = repo.find("OWN-000123")
+#   repo.update(row_i, {"LAST_CONTACTED_AT": now_str()})
+
+
+class SheetsRepository:
+
+    def __init__(self, ws, schema, key=None):
+        self.ws = ws
+        self.schema = schema
+        self.key = key
+        self._col = {name: i + 1 for i, name in enumerate(schema)}
+        self._last_col = rowcol_to_a1(1, len(schema)).rstrip("1")
+
+    def row(self, cells):
+        cells = list(cells)
+        return cells + [""] * (len(self.schema) - len(cells))
+
+    def record(self, cells):
+        return dict(zip(self.schema, self.row(cells)))
+
+    # ---------- reads ----------
+
+    def find(self, value, column=None):
+        # (row_number, row) of the first row whose column (default: the key)
+        # holds value, else (None, None)
+        hits = self.find_all(column or self.key, value, limit=1)
+        return hits[0] if hits else (None, None)
+
+    def find_all(self, column, value, limit=None, newest_first=False):
+        # [(row_number, row)] whose column holds value (one read)
+        col = self._col[column] - 1
+        value = str(value)
+        rows = list(enumerate(self.ws.get_all_values()[1:], start=2))
+
+        if newest_first:
+            rows.reverse()
+
+        hits = [(i, self.row(r)) for i, r in rows if len(r) > col and r[col] == value]
+        return hits[:limit] if limit else hits
+
+    def get(self, row_numbers):
+        # rows at the given row numbers, in order (one read)
+        if not row_numbers:
+            return []
+        blocks = self.ws.batch_get([f"A{i}:{self._last_col}{i}" for i in row_numbers])
+        return [self.row(b[0] if b and b[0] else []) for b in blocks]
+
+    # ---------- writes ----------
+
+    def append(self, rows):
+        # one append_rows; the response says where the rows landed
+        if rows:
+            return self.ws.append_rows([[str(v) for v in r] for r in rows])
+
+    def update(self, row_i, changes):
+        # the changed columns of one row, one batch_update
+        data = [
+            {"range": rowcol_to_a1(row_i, self._col[name]), "values": [[str(value)]]}
+            for name, value in changes.items()
+            if name in self._col
+        ]
+        if data:
+            self.ws.batch_update(data)
+        return len(data)
+
+
+class SqlRepository(SheetsRepository):
+
+    def find_all(self, column, value, limit=None, newest_first=False):
+        return [
+            (i, self.row(r))
+            for i, r in self.ws.find_rows(self._col[column], value, limit=limit, newest_first=newest_first)
+        ]
+
+    def get(self, row_numbers):
+        return [self.row(r) for r in self.ws.rows_at(list(row_numbers))] if row_numbers else []
+
+
+def open_repository(ws, schema, key=None):
+    # SqlRepository when the worksheet answers queries (sql_store), else Sheets
+    cls = SqlRepository if hasattr(ws, "find_rows") else SheetsRepository
+    return cls(ws, schema, key)
+
+
+# ---------------- SQL ENTITY TABLES ----------------
+# The tabs storage.py keeps in their own table when STORAGE_BACKEND is a
+# database, with the columns repositories look rows up by indexed. Item
+# shards and monthly log archives share their entity's table (rows are keyed
+# by sheet_id). Every other tab stays in grid_rows.
+
+def entity_tables():
+    # imported here: sheets_logger and users import this module
+    import sheets_logger as sl
+    import users
+    from config import WORKSHEET_ITEMS, WORKSHEET_OWNERS, WORKSHEET_TASKS, WORKSHEET_LOG
+
+    archive = WORKSHEET_LOG + "_"
+
+    return [
+        EntityTable("items", sl.ITEMS_SCHEMA, ["ITEM_ID", "ITEM_STATUS", "FINDER_WORKER_ID", "OWNER_ID"],
+                    lambda t: t == WORKSHEET_ITEMS or sl._is_shard_title(t)),
+        EntityTable("owners", sl.OWNERS_SCHEMA, ["OWNER_ID", "OWNER_PHONE", "CLAIMED_BY_FINDER_ID"],
+                    {WORKSHEET_OWNERS}),
+        EntityTable("owner_submissions", sl.SUBMISSIONS_SCHEMA, ["SUBMISSION_ID", "SUBMITTED_BY", "ADMIN_STATUS"],
+                    {sl.WORKSHEET_SUBMISSIONS}),
+        EntityTable("tasks", sl.TASKS_SCHEMA, ["TASK_ID", "ASSIGNED_TO_USER_ID"], {WORKSHEET_TASKS}),
+        EntityTable("users", users.USERS_SCHEMA, ["TELEGRAM_ID"], {users.TAB_USERS}),
+        EntityTable("user_roles", users.ROLES_SCHEMA, ["TELEGRAM_ID"], {users.TAB_ROLES}),
+        EntityTable("user_permissions", users.PERMS_SCHEMA, ["TELEGRAM_ID"], {users.TAB_PERMS}),
+        EntityTable("activity_log", sl.LOG_SCHEMA, ["USER_ID", "ITEM_ID"],
+                    lambda t: t == WORKSHEET_LOG or (t.startswith(archive) and len(t) == len(archive) + 7)),
+    ]
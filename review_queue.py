@@ -0,0 +1,171 @@
+import threading
+import time
+
+from config import LOCAL_DB_PATH, REVIEW_LEASE_MINUTES
+from local_db import open_db
+
+
+# ================================
+# GATEKEEPER REVIEW LEASES
+# ================================
+# PENDING_REVIEW items are handed out oldest first (ITEM_INDEX status
+# bucket). Handing one out takes a lease: the item is checked out to that
+# gatekeeper until expires_at, so a second gatekeeper pressing
+# APPROVE & PUBLISH NEXT at the same moment gets the next item instead.
+#
+# A lease is claimed with one conditional upsert, so two claims on the same
+# item cannot both succeed, even from two bot processes sharing the file.
+# A gatekeeper holds at most one lease; an abandoned one simply expires and
+# the item goes back to the front of the queue.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_leases (
+    item_id       TEXT PRIMARY KEY,
+    row_number    INTEGER NOT NULL,
+    gatekeeper_id TEXT NOT NULL,
+    leased_at     REAL NOT NULL,
+    expires_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS review_leases_gatekeeper
+    ON review_leases (gatekeeper_id, expires_at);
+CREATE INDEX IF NOT EXISTS review_leases_expiry
+    ON review_leases (expires_at);
+"""
+
+
+class ReviewQueue:
+
+    def __init__(self, path=LOCAL_DB_PATH, lease_minutes=REVIEW_LEASE_MINUTES):
+        self.path = path
+        self.lease_seconds = lease_minutes * 60
+        self._lock = threading.Lock()
+
+        self._db = open_db(path)
+        self._db.executescript(_SCHEMA)
+
+    def _exec(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ---------- leases ----------
+
+    def _claim(self, item_id, row_number, gatekeeper_id, now):
+        # True if the item is now leased to gatekeeper_id
+        with self._lock:
+            cur = self._db.execute(
+                """
+                INSERT INTO review_leases
+                    (item_id, row_number, gatekeeper_id, leased_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (item_id) DO UPDATE SET
+                    row_number = excluded.row_number,
+                    gatekeeper_id = excluded.gatekeeper_id,
+                    leased_at = excluded.leased_at,
+                    expires_at = excluded.expires_at
+                WHERE review_leases.expires_at <= ?
+                   OR review_leases.gatekeeper_id = excluded.gatekeeper_id
+                """,
+                (item_id, row_number, str(gatekeeper_id), now, now + self.lease_seconds, now)
+            )
+            return cur.rowcount > 0
+
+    def lease_next(self, gatekeeper_id, candidates, now=None):
+        # candidates: [(row_number, item_id)] oldest first.
+        # Returns the gatekeeper's lease {"item_id", "row_number", "expires_at", ...}
+        # (the one already held, or a new one), or None if everything is taken.
+        now = now or time.time()
+
+        held = self.held_by(gatekeeper_id, now)
+        if held:
+            return held
+
+        taken = self.leased_ids(now)
+
+        for row_number, item_id in candidates:
+            if item_id in taken:
+                continue
+            if self._claim(item_id, row_number, gatekeeper_id, now):
+                return self.get(item_id)
+
+        return None
+
+    def renew(self, item_id, gatekeeper_id, now=None):
+        now = now or time.time()
+
+        with self._lock:
+            cur = self._db.execute(
+                """
+                UPDATE review_leases SET expires_at = ?
+                WHERE item_id = ? AND gatekeeper_id = ? AND expires_at > ?
+                """,
+                (now + self.lease_seconds, item_id, str(gatekeeper_id), now)
+            )
+            return cur.rowcount > 0
+
+    def release(self, item_id, gatekeeper_id=None):
+        # gatekeeper_id: only release if still held by them (a lease that
+        # expired and was re-taken stays with the new holder)
+        if gatekeeper_id is None:
+            self._exec("DELETE FROM review_leases WHERE item_id = ?", (item_id,))
+        else:
+            self._exec(
+                "DELETE FROM review_leases WHERE item_id = ? AND gatekeeper_id = ?",
+                (item_id, str(gatekeeper_id))
+            )
+
+    def expire(self, now=None):
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM review_leases WHERE expires_at <= ?", (now or time.time(),)
+            )
+            return cur.rowcount
+
+    def clear(self):
+        self._exec("DELETE FROM review_leases")
+
+    # ---------- reads ----------
+
+    def get(self, item_id):
+        rows = self._exec("SELECT * FROM review_leases WHERE item_id = ?", (item_id,))
+        return dict(rows[0]) if rows else None
+
+    def held_by(self, gatekeeper_id, now=None):
+        rows = self._exec(
+            """
+            SELECT * FROM review_leases
+            WHERE gatekeeper_id = ? AND expires_at > ?
+            ORDER BY leased_at
+            LIMIT 1
+            """,
+            (str(gatekeeper_id), now or time.time())
+        )
+        return dict(rows[0]) if rows else None
+
+    def leased_ids(self, now=None):
+        rows = self._exec(
+            "SELECT item_id FROM review_leases WHERE expires_at > ?", (now or time.time(),)
+        )
+        return {r["item_id"] for r in rows}
+
+    def active(self, now=None):
+        # {item_id: gatekeeper_id} of unexpired leases
+        rows = self._exec(
+            "SELECT item_id, gatekeeper_id FROM review_leases WHERE expires_at > ?",
+            (now or time.time(),)
+        )
+        return {r["item_id"]: r["gatekeeper_id"] for r in rows}
+
+
+_QUEUE = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def review_queue():
+    global _QUEUE
+
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                _QUEUE = ReviewQueue()
+
+    return _QUEUE
@@ -8,10 +8,24 @@ from menus import (
     accounts_menu,
     PANEL_ITEMS, PANEL_ACCOUNTS, PANEL_WORKFLOW, PANEL_USERS,
     PANEL_TASKS, PANEL_REPORTS, PANEL_SYSTEM, PANEL_BACK,
-    BTN_PENDING_ACCOUNTS
+    BTN_PENDING_ACCOUNTS,
+    BTN_BULK_REVIEW,
+    BTN_MY_ITEMS,
+    BTN_MY_SALES,
+    BTN_APPROVE_PUBLISH_NEXT,
+    BTN_REQUEST_CHANGES,
+    BTN_HIDE_ITEM,
+    BTN_VIEW_PENDING,
+    BTN_REPORTS_ACTION,
+    BTN_NEW_ITEM,
+    BTN_ADD_ACCOUNT
 )
 
-from items import handle_items_panel
+from items import handle_items_panel, my_items_callback, confirm_item_callback
+from items_review import handle_review_panel
+from reports import handle_reports_panel, report_callback
+from system_panel import handle_system_panel, system_callback
+from media import photo_cache, full_photo_callback
 
 from accounts import (
     get_cached_role,
@@ -45,24 +59,69 @@ from accounts import (
     ROLE_CACHE,
     USER_RATE_LIMIT,
     RATE_LIMIT_SECONDS,
-    POSTPONED_OWNER_SUBMISSIONS,
-    ADMIN_CACHE
+    ADMIN_CACHE,
+    ENABLE_SHEETS,
+    send_pending_page,
+    send_bulk_review,
+    send_postponed_page
 )
 
 from sheets_logger import (
     create_owner_submission,
+    create_owner_direct,
     check_nearby_accounts,
     get_pending_owner_submissions
 )
 
 from config import ADMIN_IDS
+from sheet_metrics import CALLS
+import contextlib
 import time
 
+
+# ================================
+# SHEETS CALL FLOWS
+# ================================
+# Every update runs under the sheet_metrics flow it belongs to, so
+# CALLS.counts[flow] shows the live per-flow Sheets usage that bench.py
+# budgets (FLOW_BUDGETS). Multi-step wizards are charged to their flow on
+# every step; updates outside these flows count under the default label.
+
+def message_flow(update, context):
+    text = (update.message.text or "").strip() if update.message else ""
+    wizard = context.user_data.get("account_state", ACCOUNT_NONE) != ACCOUNT_NONE
+
+    if context.user_data.get("item_state") or text == BTN_NEW_ITEM:
+        return "new_item"
+    if wizard and context.user_data.get("cached_role") == "REGISTERING":
+        return "register"
+    if wizard or text == BTN_ADD_ACCOUNT:
+        return "add_account"
+    if text == BTN_PENDING_ACCOUNTS:
+        return "pending_list"
+    return None
+
+def callback_flow(data):
+    if data.startswith("OWNER_APPROVE|"):
+        return "approve_submission"
+    if data.startswith("PENDING_PAGE|"):
+        return "pending_list"
+    return None
+
+def _flow_scope(name):
+    return CALLS.flow(name) if name else contextlib.nullcontext()
+
 async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if not update.message:
         return
 
+    with _flow_scope(message_flow(update, context)):
+        await _route_message(update, context)
+
+
+async def _route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
     # capture message text safely (buttons, captions, etc)
     raw_text = (update.message.text or update.message.caption or "").strip()
 
@@ -150,12 +209,19 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             PANEL_SYSTEM,
             PANEL_BACK,
             "📦 NEW ITEM",
-            "🗂️ MY ITEMS",
+            BTN_MY_ITEMS,
+            BTN_MY_SALES,
             "➕ ADD ACCOUNT",
             "👤 MY ACCOUNTS",
             "📍 NEARBY ACCOUNTS",
             "🔎 SEARCH ACCOUNT",
-            BTN_PENDING_ACCOUNTS
+            BTN_PENDING_ACCOUNTS,
+            BTN_BULK_REVIEW,
+            BTN_APPROVE_PUBLISH_NEXT,
+            BTN_REQUEST_CHANGES,
+            BTN_HIDE_ITEM,
+            BTN_VIEW_PENDING,
+            BTN_REPORTS_ACTION
         ]:
             await open_menu_for_role(update, context, role)
             return
@@ -523,6 +589,9 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                                 draft.get("source_link","")
                             )
 
+                            if owner_id:
+                                photo_cache().claim(draft.get("photo_unique_id"), owner_id)
+
                             submission_id = None
 
                         # WORKER → send to submission queue
@@ -544,6 +613,9 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                                 draft.get("source_link",""),
                                 draft.get("distance_warning","")
                             )
+
+                            if submission_id:
+                                photo_cache().claim(draft.get("photo_unique_id"), submission_id)
                     else:
                         print("TEST MODE — OWNER WOULD BE SAVED:", draft)
 
@@ -902,16 +974,16 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             if update.message.photo:
                 draft = context.user_data.setdefault("account_draft", {})
 
-                photo = update.message.photo[-1]
-                draft["photo_file_id"] = photo.file_id
+                # full size + thumbnail recorded once; a resent picture maps to
+                # the file_id we already have
+                meta = photo_cache().record(update.message.photo)
+                draft["photo_file_id"] = meta["file_id"]
+                draft["photo_unique_id"] = meta["file_unique_id"]
 
                 log_block("PHOTO RECEIVED")
-                log_line("FILE_ID", photo.file_id)
-
-                file = await context.bot.get_file(photo.file_id)
-                draft["photo_url"] = file.file_path
-
-                log_line("FILE_PATH", draft["photo_url"])
+                log_line("FILE_ID", meta["file_id"])
+                log_line("UNIQUE_ID", meta["file_unique_id"])
+                log_line("FIRST_USED_BY", meta["first_ref"])
 
                 if draft.get("duplicate_confirmed"):
 
@@ -1042,6 +1114,24 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # ================= ITEMS PANEL =================
     handled = await handle_items_panel(update, context, text, role, status)
 
+    if handled:
+        return
+
+    # ================= GATEKEEPER REVIEW =================
+    handled = await handle_review_panel(update, context, text, role, status)
+
+    if handled:
+        return
+
+    # ================= REPORTS =================
+    handled = await handle_reports_panel(update, context, text, role, status)
+
+    if handled:
+        return
+
+    # ================= SYSTEM (sheet capacity) =================
+    handled = await handle_system_panel(update, context, text, role, status)
+
     if handled:
         return
 
@@ -1114,188 +1204,21 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
     # ================= ADMIN PANEL NAVIGATION =================
     if role == "ADMIN":
-        if "PENDING ACCOUNTS" in btn:
+        if text == BTN_BULK_REVIEW:
 
             try:
-                rows = await run_sheet(
-                    context,
-                    get_pending_owner_submissions
-                )
-
-                log_block("PENDING LOAD DEBUG")
-
-                try:
-                    for r in rows:
-                        log_line("ROW_STATUS", r[13] if len(r) > 13 else "NO_STATUS")
-                except Exception as e:
-                    log_line("STATUS_PARSE_ERROR", repr(e))
-
-                log_block("PENDING ACCOUNTS LOAD")
-
-                if not rows:
-                    rows = []
-
-                log_line("ROWS_RETURNED", len(rows))
-
-                try:
-                    ids = [str(r[0]) for r in rows]
-                    log_line("SUBMISSION_IDS", ", ".join(ids) if ids else "NONE")
-                except Exception as e:
-                    log_line("ID_PARSE_ERROR", repr(e))
-
-                if not rows:
-                    await update.message.reply_text("No pending owner submissions.")
-                    return
-
-                await update.message.reply_text(
-                    "📋 Pending Account Submissions"
-                )
-
-                for r in rows:
-
-                    submission_id = r[0]
-
-                    # skip submissions already reviewed in this session
-                    if POSTPONED_OWNER_SUBMISSIONS.get(submission_id) == "REVIEWED":
-                        log_line("SKIP_ALREADY_REVIEWED", submission_id)
-                        continue
-
-                    worker_id = r[1]
-
-                    coords = r[3]
-                    maps_link = r[4]
-                    photo = r[5]
-
-                    name = r[6]
-                    phone = r[7]
-                    email = r[8]
-                    socials = r[9]
-                    city = r[10]
-
-                    distance_warning = r[15] if len(r) > 15 else ""
-
-                    log_block("ADMIN DUPLICATE CHECK")
-                    log_line("ROW_LENGTH", len(r))
-                    log_line("RAW_DISTANCE_WARNING", distance_warning)
-
-                    duplicate_message = ""
-                    owner_id = ""
-
-                    if distance_warning:
-
-                        parts = distance_warning.split("_OF_")
-
-                        if len(parts) == 2:
-                            meters = parts[0].replace("WITHIN_", "").replace("M", "")
-                            owner_id = parts[1]
-
-                            duplicate_message = (
-                                f"\n⚠ Possible duplicate yard detected"
-                                f"\nDistance: {meters} meters"
-                                f"\nOwner ID: {owner_id}"
-                            )
-
-                        else:
-                            duplicate_message = f"\n⚠ Possible duplicate\n{distance_warning}"
-
-                        log_line("ADMIN_WARNING_DISPLAYED", duplicate_message)
-                    else:
-                        log_line("ADMIN_WARNING_DISPLAYED", "NONE")
-
-                    caption = (
-                        "━━━━━━━━━━━━━━━━━━━━\n"
-                        "📥 SUBMISSION REVIEW\n"
-                        "━━━━━━━━━━━━━━━━━━━━\n"
-                        f"Submission ID: {submission_id}\n"
-                        f"👤 Name: {name}\n"
-                        f"📞 Phone: {phone}\n"
-                        f"📧 Email: {email}\n"
-                        f"🌐 Socials: {socials}\n"
-                        f"📍 City: {city}\n"
-                        f"🗺 Maps: {maps_link}\n"
-                        f"🆔 Finder ID: {worker_id}"
-                        f"{duplicate_message}\n\n"
-                        "Next messages below:\n"
-                        "1) submitted photo\n"
-                        "2) existing photo (if duplicate)\n"
-                        "3) map pin"
-                    )
-
-                    keyboard = InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("✅ APPROVE", callback_data=f"OWNER_APPROVE|{submission_id}|{worker_id}"),
-                            InlineKeyboardButton("❌ REJECT", callback_data=f"OWNER_REJECT|{submission_id}|{worker_id}")
-                        ]
-                    ])
-
-                    media = []
-
-                    if photo:
-                        media.append(
-                            InputMediaPhoto(
-                                media=photo
-                            )
-                        )
-
-                    existing_photo = None
-                    existing_map = ""
-
-                    if distance_warning and owner_id:
+                await send_bulk_review(context, update.effective_chat.id)
 
-                        try:
-                            from sheets_logger import get_owner_by_id
-
-                            owner_row = await run_sheet(
-                                context,
-                                get_owner_by_id,
-                                owner_id
-                            )
-
-                            if owner_row and len(owner_row) >= 11:
-                                existing_photo = owner_row[10]
-
-                            if owner_row and len(owner_row) >= 10:
-                                existing_map = owner_row[9]
-
-                        except Exception as e:
-                            log_line("OWNER_LOOKUP_ERROR", repr(e))
-
-                    if existing_photo:
-
-                        media.append(
-                            InputMediaPhoto(
-                                media=existing_photo
-                            )
-                        )
-
-                    if media:
-
-                        messages = await context.bot.send_media_group(
-                            chat_id=update.effective_chat.id,
-                            media=media
-                        )
-
-                        media_ids = [m.message_id for m in messages]
-
-                        main_msg = await update.message.reply_text(
-                            caption + f"\n\n🆕 Submitted Map:\n{maps_link}\n\n📍 Existing Map:\n{existing_map}",
-                            reply_markup=keyboard
-                        )
-
-                    else:
+            except Exception as e:
+                log_block("BULK REVIEW LOAD ERROR")
+                log_line("ERROR", repr(e))
 
-                        media_ids = []
+            return
 
-                        main_msg = await update.message.reply_text(
-                            caption + f"\n\n🆕 Submitted Map:\n{maps_link}\n\n📍 Existing Map:\n{existing_map}",
-                            reply_markup=keyboard
-                        )
+        if "PENDING ACCOUNTS" in btn:
 
-                    POSTPONED_OWNER_SUBMISSIONS[submission_id] = {
-                        "chat_id": update.effective_chat.id,
-                        "main_msg": main_msg.message_id,
-                        "media_msgs": media_ids
-                    }
+            try:
+                await send_pending_page(context, update.effective_chat.id)
 
             except Exception as e:
                 log_block("PENDING LOAD ERROR")
@@ -1315,23 +1238,12 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         if text == PANEL_WORKFLOW:
 
-            if not POSTPONED_OWNER_SUBMISSIONS:
-                await update.message.reply_text("No postponed owner submissions.")
-                return
-
-            for sid, data in POSTPONED_OWNER_SUBMISSIONS.items():
-
-                keyboard = InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton("✅ APPROVE", callback_data=f"OWNER_APPROVE|{sid}|0"),
-                        InlineKeyboardButton("❌ REJECT", callback_data=f"OWNER_REJECT|{sid}|0")
-                    ]
-                ])
+            try:
+                await send_postponed_page(context, update.effective_chat.id)
 
-                await update.message.reply_text(
-                    f"⏳ Postponed Submission\nSubmission ID: {sid}",
-                    reply_markup=keyboard
-                )
+            except Exception as e:
+                log_block("WORKFLOW LOAD ERROR")
+                log_line("ERROR", repr(e))
 
             return
 
@@ -1343,14 +1255,6 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text("📝 TASKS panel opened")
             return
 
-        if text == PANEL_REPORTS:
-            await update.message.reply_text("📊 REPORTS panel opened")
-            return
-
-        if text == PANEL_SYSTEM:
-            await update.message.reply_text("⚙️ SYSTEM panel opened")
-            return
-
     query = update.callback_query
     if not query:
         return
@@ -1384,21 +1288,58 @@ async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 f"❌ User rejected\nID: {parts[1]}"
             )
 
-from accounts import owner_review_callback
+from accounts import owner_review_callback, pending_page_callback, bulk_review_callback, workflow_page_callback
 
 async def callback_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
-    query = update.callback_query
-
-    if not query:
+    if not update.callback_query:
         return
 
+    with _flow_scope(callback_flow(update.callback_query.data or "")):
+        await _callback_router(update, context)
+
+
+async def _callback_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    query = update.callback_query
     data = query.data or ""
 
     if data.startswith("OWNER_"):
         await owner_review_callback(update, context)
         return
 
+    if data.startswith("PENDING_PAGE|"):
+        await pending_page_callback(update, context)
+        return
+
+    if data.startswith("BULK_OWNER|"):
+        await bulk_review_callback(update, context)
+        return
+
+    if data.startswith("WORKFLOW_PAGE|"):
+        await workflow_page_callback(update, context)
+        return
+
+    if data.startswith("PHOTO_FULL|"):
+        await full_photo_callback(update, context)
+        return
+
+    if data.startswith("MY_ITEMS|"):
+        await my_items_callback(update, context)
+        return
+
+    if data.startswith("ITEM_CONFIRM|"):
+        await confirm_item_callback(update, context)
+        return
+
+    if data.startswith("REPORT|"):
+        await report_callback(update, context)
+        return
+
+    if data.startswith("SYSTEM|"):
+        await system_callback(update, context)
+        return
+
     query = update.callback_query
 
     if not query:
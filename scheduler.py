@@ -0,0 +1,431 @@
+import asyncio
+from datetime import datetime, timedelta, timezone, time as dtime
+
+from config import (
+    TASK_REMINDER_FREQUENCY_MIN,
+    TASK_POLL_SECONDS,
+    STALE_CHECK_SECONDS,
+    DUE_INDEX_REBUILD_SECONDS,
+    PHOTO_ARCHIVE_SECONDS,
+    SNAPSHOT_EXPORT_SECONDS,
+    LOG_FLUSH_SECONDS,
+    LOG_KEEP_DAYS,
+    LOG_ROTATE_SECONDS,
+    REPORT_DIGEST_HOUR,
+    CAPACITY_CHECK_SECONDS,
+    TAB_HEADROOM_DAYS,
+    ITEM_SHARD_BY,
+    MIRROR_FLUSH_SECONDS,
+    ADMIN_IDS,
+)
+from sheets_logger import (
+    TASK_DUE_INDEX,
+    ITEM_DUE_INDEX,
+    load_task_due_index,
+    load_item_due_index,
+    update_task_cells,
+    update_item_cells,
+    flush_log_actions,
+    shard_items,
+)
+from accounts import run_sheet
+from items import confirm_item_keyboard
+from moderation_queue import moderation_queue
+from review_queue import review_queue
+from media import photo_cache
+from photo_archive import photo_archive
+from snapshot import export_snapshot
+from reports import digest_text
+from log_archive import rotate_log
+from sheet_capacity import check_capacity, capacity_text
+from storage import flush_mirror, mirror_enabled
+from utils import now_str, now_local, TS_FORMAT, LOCAL_TZ
+
+
+def sched_debug(label, value=""):
+    print(f"[SCHEDULER DEBUG] {label}: {value}")
+
+
+# ================= LIMITS =================
+# Ticks pop only what is due from the in-memory heaps (sheets_logger
+# TASK_DUE_INDEX / ITEM_DUE_INDEX) and write back with one batch update.
+# A full tab read happens only when a heap is (re)built. Messages are capped
+# and spaced so a backlog drains over several ticks instead of bursting
+# into Telegram's ~30 msg/s limit.
+MAX_TASK_REMINDERS_PER_TICK = 50
+MAX_ITEM_EVENTS_PER_TICK = 200
+SEND_SPACING_SECONDS = 0.05
+
+# capacity alerts to the admins: once a day while the projected time to the
+# cell limit is under this many days, or a tab could not grow
+CAPACITY_ALERT_DAYS = TAB_HEADROOM_DAYS * 3
+_CAPACITY_ALERTED = {"day": None}
+
+# first runs are offset so the two jobs never read the sheet in the same tick
+TASK_JOB_FIRST_SECONDS = 15
+STALE_JOB_FIRST_SECONDS = TASK_JOB_FIRST_SECONDS + TASK_POLL_SECONDS // 2
+
+
+def _utc_now():
+    # NEXT_CONFIRM_DUE_AT / AUTO_HIDE_AT are written in UTC by create_item
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _ensure_loaded(context, index, loader):
+    if index.loaded and index.age() < DUE_INDEX_REBUILD_SECONDS:
+        return True
+
+    count = await run_sheet(context, loader)
+
+    if count is None:
+        return index.loaded
+
+    sched_debug("DUE_INDEX_LOADED", f"{loader.__name__} {count}")
+    return True
+
+
+async def _notify(context, chat_id, text, reply_markup=None):
+    if not chat_id:
+        return False
+
+    try:
+        await context.bot.send_message(chat_id=chat_id, text=text, reply_markup=reply_markup)
+        return True
+    except Exception as e:
+        sched_debug("NOTIFY_ERROR", f"{chat_id} {e!r}")
+        return False
+    finally:
+        await asyncio.sleep(SEND_SPACING_SECONDS)
+
+
+# ================= JOBS =================
+
+async def task_reminder_job(context):
+
+    if not await _ensure_loaded(context, TASK_DUE_INDEX, load_task_due_index):
+        return
+
+    now = now_local()
+    due = TASK_DUE_INDEX.pop_due(now, MAX_TASK_REMINDERS_PER_TICK)
+
+    if not due:
+        return
+
+    stamp = now_str()
+    updates = []
+
+    for task_id, remind_at, p in due:
+
+        await _notify(
+            context,
+            p["user"],
+            "⏰ Task reminder\n\n"
+            f"{task_id}: {p['title']}\n"
+            f"Due: {p['due_at']}"
+        )
+
+        updates.append((p["row"], "LAST_REMINDER_SENT_AT", stamp))
+
+        try:
+            freq = int(p["freq"])
+        except ValueError:
+            freq = TASK_REMINDER_FREQUENCY_MIN
+
+        TASK_DUE_INDEX.set(task_id, now + timedelta(minutes=freq), p)
+
+    await run_sheet(context, update_task_cells, updates)
+
+    sched_debug("TASK_REMINDERS_SENT", len(due))
+
+
+async def stale_listing_job(context):
+
+    if not await _ensure_loaded(context, ITEM_DUE_INDEX, load_item_due_index):
+        return
+
+    due = ITEM_DUE_INDEX.pop_due(_utc_now(), MAX_ITEM_EVENTS_PER_TICK)
+
+    if not due:
+        return
+
+    hidden_items = {item_id for (kind, item_id), _, _ in due if kind == "AUTO_HIDE"}
+    utc_stamp = _utc_now().strftime(TS_FORMAT)
+    stamp = now_str()
+    updates = []
+    hides = []
+    warnings = []
+
+    for (kind, item_id), when, p in due:
+
+        row_i = p["row"]
+
+        if kind == "AUTO_HIDE":
+            updates += [
+                (row_i, "ITEM_STATUS", "HIDDEN"),
+                (row_i, "LISTING_STATUS_REASON", "AUTO_HIDE_NOT_CONFIRMED"),
+                (row_i, "LAST_UPDATED_AT", stamp),
+            ]
+            hides.append((item_id, p))
+
+        elif item_id not in hidden_items:
+            updates.append((row_i, "STALE_WARNING_AT", utc_stamp))
+            warnings.append((item_id, p))
+
+    # write first: if the batch fails nothing was sent, the events go back
+    # on the heap and the next tick retries them
+    if await run_sheet(context, update_item_cells, updates) is None:
+        for key, when, p in due:
+            ITEM_DUE_INDEX.set(key, when, p)
+        sched_debug("STALE_WRITE_FAILED", len(due))
+        return
+
+    for item_id, p in hides:
+        ITEM_DUE_INDEX.remove(("STALE_WARNING", item_id))
+
+        await _notify(
+            context,
+            p["finder"],
+            f"🙈 Item {item_id} was hidden automatically.\n"
+            "Availability was not confirmed in time."
+        )
+
+    for item_id, p in warnings:
+        await _notify(
+            context,
+            p["finder"],
+            f"⚠ Item {item_id} needs an availability confirmation.\n"
+            f"It will be hidden on {p['auto_hide_at']} (UTC).",
+            reply_markup=confirm_item_keyboard(item_id)
+        )
+
+    sched_debug("STALE_WARNINGS_SENT", len(warnings))
+    sched_debug("ITEMS_AUTO_HIDDEN", len(hides))
+
+
+async def moderation_cleanup_job(context):
+
+    removed = moderation_queue().expire()
+
+    if removed:
+        sched_debug("REVIEWED_TOMBSTONES_EXPIRED", removed)
+
+    leases = review_queue().expire()
+
+    if leases:
+        sched_debug("REVIEW_LEASES_EXPIRED", leases)
+
+
+async def photo_archive_job(context):
+
+    archive = photo_archive()
+
+    if archive is None:
+        return
+
+    queued = archive.enqueue_from_cache(photo_cache())
+
+    if queued:
+        sched_debug("PHOTOS_QUEUED_FOR_ARCHIVE", queued)
+
+    stored = await archive.run_once(context.bot)
+
+    if not stored:
+        return
+
+    sched_debug("PHOTOS_ARCHIVED", len(stored))
+
+    # same truck photographed / forwarded under another submission or item
+    for unique_id, similar in stored:
+
+        if not similar:
+            continue
+
+        rec_ref = archive.ref_for(unique_id)
+        others = ", ".join(f"{ref} ({d} bits)" for d, _, ref in similar[:5])
+
+        for admin_id in ADMIN_IDS:
+            await _notify(
+                context,
+                admin_id,
+                f"📸 Possible duplicate photo\n\n{rec_ref} matches: {others}"
+            )
+
+
+async def snapshot_export_job(context):
+
+    # full tabs + new ACTIVITY_LOG / ITEM_PHOTOS rows, one batch_get per tab
+    stats = await run_sheet(context, export_snapshot)
+
+    if stats:
+        sched_debug("SNAPSHOT_ROWS", stats)
+
+
+async def log_flush_job(context):
+
+    # ACTIVITY_LOG rows queued by the approval / review flows
+    written = await run_sheet(context, flush_log_actions)
+
+    if written:
+        sched_debug("LOG_ROWS_FLUSHED", written)
+
+
+async def log_rotation_job(context):
+
+    # ACTIVITY_LOG rows older than LOG_KEEP_DAYS -> monthly archive tabs + files
+    stats = await run_sheet(context, rotate_log)
+
+    if stats and stats["archived"]:
+        sched_debug("LOG_ROWS_ARCHIVED", stats)
+
+
+async def capacity_check_job(context):
+
+    # samples every tab, grows the ones running out of rows ahead of need
+    report = await run_sheet(context, check_capacity)
+
+    if not report:
+        return
+
+    days = report["days_to_limit"]
+    sched_debug("SHEET_CELLS", f"{report['grid_cells']} allocated, {days if days is None else round(days)} days to limit")
+
+    if not report["blocked"] and (days is None or days >= CAPACITY_ALERT_DAYS):
+        return
+
+    today = now_local().strftime("%Y-%m-%d")
+    if _CAPACITY_ALERTED["day"] == today:
+        return
+    _CAPACITY_ALERTED["day"] = today
+
+    for admin_id in ADMIN_IDS:
+        await _notify(context, admin_id, "🚨 Sheet capacity\n\n" + capacity_text(report))
+
+
+async def item_shard_job(context):
+
+    # old SOLD / HIDDEN items -> shard tabs; rows below them move up
+    stats = await run_sheet(context, shard_items)
+
+    if not stats or not stats["moved"]:
+        return
+
+    # leases carry row numbers that just changed: hand the items out again
+    review_queue().clear()
+    sched_debug("ITEMS_SHARDED", stats)
+
+
+async def mirror_flush_job(context):
+
+    # database writes -> the office copy on Google Sheets, in order
+    replayed = await run_sheet(context, flush_mirror)
+
+    if replayed:
+        sched_debug("MIRROR_WRITES_REPLAYED", replayed)
+
+
+async def report_digest_job(context):
+
+    # yesterday's activity + current totals, straight from the REPORTS counters
+    day = (now_local() - timedelta(days=1)).strftime("%Y-%m-%d")
+    text = await run_sheet(context, digest_text, day)
+
+    if not text:
+        return
+
+    for admin_id in ADMIN_IDS:
+        await _notify(context, admin_id, text)
+
+    sched_debug("REPORT_DIGEST_SENT", day)
+
+
+# ================= REGISTRATION =================
+
+def schedule_jobs(application):
+
+    jq = application.job_queue
+
+    if jq is None:
+        print("⚠ JobQueue unavailable — install python-telegram-bot[job-queue] to enable reminders")
+        return False
+
+    jq.run_repeating(
+        task_reminder_job,
+        interval=TASK_POLL_SECONDS,
+        first=TASK_JOB_FIRST_SECONDS,
+        name="task_reminders"
+    )
+
+    jq.run_repeating(
+        stale_listing_job,
+        interval=STALE_CHECK_SECONDS,
+        first=STALE_JOB_FIRST_SECONDS,
+        name="stale_listings"
+    )
+
+    jq.run_repeating(
+        moderation_cleanup_job,
+        interval=STALE_CHECK_SECONDS,
+        first=STALE_CHECK_SECONDS,
+        name="moderation_cleanup"
+    )
+
+    jq.run_repeating(
+        log_flush_job,
+        interval=LOG_FLUSH_SECONDS,
+        first=LOG_FLUSH_SECONDS,
+        name="log_flush"
+    )
+
+    jq.run_daily(
+        report_digest_job,
+        time=dtime(hour=REPORT_DIGEST_HOUR, tzinfo=LOCAL_TZ),
+        name="report_digest"
+    )
+
+    if LOG_KEEP_DAYS:
+        jq.run_repeating(
+            log_rotation_job,
+            interval=LOG_ROTATE_SECONDS,
+            first=LOG_ROTATE_SECONDS // 24,
+            name="log_rotation"
+        )
+
+    jq.run_repeating(
+        capacity_check_job,
+        interval=CAPACITY_CHECK_SECONDS,
+        first=STALE_JOB_FIRST_SECONDS + TASK_POLL_SECONDS,
+        name="capacity_check"
+    )
+
+    if ITEM_SHARD_BY:
+        jq.run_daily(
+            item_shard_job,
+            time=dtime(hour=3, tzinfo=LOCAL_TZ),
+            name="item_shards"
+        )
+
+    if mirror_enabled():
+        jq.run_repeating(
+            mirror_flush_job,
+            interval=MIRROR_FLUSH_SECONDS,
+            first=MIRROR_FLUSH_SECONDS,
+            name="sheets_mirror"
+        )
+
+    if photo_archive() is not None:
+        jq.run_repeating(
+            photo_archive_job,
+            interval=PHOTO_ARCHIVE_SECONDS,
+            first=PHOTO_ARCHIVE_SECONDS,
+            name="photo_archive"
+        )
+
+    if SNAPSHOT_EXPORT_SECONDS:
+        jq.run_repeating(
+            snapshot_export_job,
+            interval=SNAPSHOT_EXPORT_SECONDS,
+            first=SNAPSHOT_EXPORT_SECONDS,
+            name="snapshot_export"
+        )
+
+    return True
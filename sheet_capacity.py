@@ -0,0 +1,288 @@
+import math
+import threading
+import time
+from datetime import datetime
+
+from config import (
+    LOCAL_DB_PATH, SHEET_CELL_LIMIT, TAB_GROW_ROWS, TAB_HEADROOM_DAYS, CAPACITY_HISTORY_DAYS,
+    ITEM_SHARD_BY
+)
+from local_db import open_db
+from sheets_logger import sheet_tabs, used_rows
+
+
+# ================================
+# SHEET CAPACITY GUARDIAN
+# ================================
+# Google counts every cell of every tab's grid (rows x cols, filled or not)
+# against SHEET_CELL_LIMIT per spreadsheet. check_capacity() samples each
+# tab (two reads for the whole spreadsheet), keeps the samples in the local
+# SQLite file and from their trend
+#
+#   - grows a tab by at least TAB_GROW_ROWS once fewer than
+#     TAB_HEADROOM_DAYS of its growth are left (one add_rows per tab),
+#     never past the cell limit;
+#   - projects when the filled cells reach the limit (SYSTEM panel).
+#
+#   report = check_capacity()
+#   report["days_to_limit"], report["tabs"]["ITEMS_MASTER"]["rows_per_day"]
+
+DAY = 86400
+GROW_ROUND = 1000           # grow in whole thousands of rows
+MIN_SAMPLE_SPAN = 3600      # a trend needs samples at least this far apart
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS capacity_samples (
+    taken_at  REAL NOT NULL,
+    tab       TEXT NOT NULL,
+    rows      INTEGER NOT NULL,
+    grid_rows INTEGER NOT NULL,
+    grid_cols INTEGER NOT NULL,
+    PRIMARY KEY (tab, taken_at)
+);
+CREATE INDEX IF NOT EXISTS capacity_samples_taken
+    ON capacity_samples (taken_at);
+"""
+
+
+def capacity_debug(label, value=""):
+    print(f"[CAPACITY DEBUG] {label}: {value}")
+
+
+class CapacityLog:
+
+    def __init__(self, path=LOCAL_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        self._db = open_db(path)
+        self._db.executescript(_SCHEMA)
+
+    def _exec(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def record(self, tabs, now):
+        # tabs: {title: {"rows", "grid_rows", "grid_cols"}}
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO capacity_samples VALUES (?, ?, ?, ?, ?)",
+                [(now, t, v["rows"], v["grid_rows"], v["grid_cols"]) for t, v in tabs.items()]
+            )
+
+    def history(self, since):
+        # {title: [(taken_at, rows)]} oldest first
+        out = {}
+        for r in self._exec(
+            "SELECT tab, taken_at, rows FROM capacity_samples WHERE taken_at >= ? ORDER BY taken_at", (since,)
+        ):
+            out.setdefault(r["tab"], []).append((r["taken_at"], r["rows"]))
+        return out
+
+    def latest(self):
+        # (taken_at, {title: {"rows", "grid_rows", "grid_cols"}}) of the last sample, or (None, {})
+        rows = self._exec(
+            "SELECT * FROM capacity_samples WHERE taken_at = (SELECT MAX(taken_at) FROM capacity_samples)"
+        )
+        if not rows:
+            return None, {}
+        return rows[0]["taken_at"], {
+            r["tab"]: {"rows": r["rows"], "grid_rows": r["grid_rows"], "grid_cols": r["grid_cols"]} for r in rows
+        }
+
+    def prune(self, before):
+        with self._lock:
+            return self._db.execute("DELETE FROM capacity_samples WHERE taken_at < ?", (before,)).rowcount
+
+    def clear(self):
+        self._exec("DELETE FROM capacity_samples")
+
+
+_LOG = None
+_LOG_LOCK = threading.Lock()
+
+
+def capacity_log():
+    global _LOG
+
+    if _LOG is None:
+        with _LOG_LOCK:
+            if _LOG is None:
+                _LOG = CapacityLog()
+
+    return _LOG
+
+
+# ---------------- TREND ----------------
+
+def rows_per_day(samples):
+    # least-squares slope of [(taken_at, rows)], never negative (rotations /
+    # shard moves shrink tabs, that is not growth to plan for)
+    if len(samples) < 2 or samples[-1][0] - samples[0][0] < MIN_SAMPLE_SPAN:
+        return 0.0
+
+    n = len(samples)
+    mean_t = sum(t for t, _ in samples) / n
+    mean_r = sum(r for _, r in samples) / n
+    var = sum((t - mean_t) ** 2 for t, _ in samples)
+    cov = sum((t - mean_t) * (r - mean_r) for t, r in samples)
+
+    return max(cov / var * DAY, 0.0) if var else 0.0
+
+
+def grow_step(tab, rate):
+    # rows to add now, 0 if the tab has enough headroom
+    free = tab["grid_rows"] - tab["rows"]
+    need = max(rate * TAB_HEADROOM_DAYS, TAB_GROW_ROWS / 5)
+
+    if free >= need:
+        return 0
+
+    step = max(TAB_GROW_ROWS, rate * TAB_HEADROOM_DAYS)
+    return int(math.ceil(step / GROW_ROUND) * GROW_ROUND)
+
+
+def project(tabs, rates, now, grown=None, blocked=None):
+    grid_cells = sum(v["grid_rows"] * v["grid_cols"] for v in tabs.values())
+    used_cells = sum(v["rows"] * v["grid_cols"] for v in tabs.values())
+    cells_per_day = sum(rates.get(t, 0.0) * v["grid_cols"] for t, v in tabs.items())
+
+    days = (SHEET_CELL_LIMIT - used_cells) / cells_per_day if cells_per_day else None
+
+    return {
+        "taken_at": now,
+        "limit": SHEET_CELL_LIMIT,
+        "grid_cells": grid_cells,
+        "used_cells": used_cells,
+        "cells_per_day": cells_per_day,
+        "days_to_limit": max(days, 0.0) if days is not None else None,
+        "tabs": {
+            t: {
+                **v,
+                "cells": v["grid_rows"] * v["grid_cols"],
+                "rows_per_day": rates.get(t, 0.0),
+                "days_to_full": (v["grid_rows"] - v["rows"]) / rates[t] if rates.get(t) else None,
+            }
+            for t, v in tabs.items()
+        },
+        "grown": grown or {},
+        "blocked": blocked or [],
+    }
+
+
+# ---------------- CHECK ----------------
+
+def measure():
+    # ({title: {"rows", "grid_rows", "grid_cols"}}, {title: worksheet}); two reads
+    handles = {ws.title: ws for ws in sheet_tabs()}
+    filled = used_rows(handles)
+
+    tabs = {
+        t: {"rows": filled.get(t, 0), "grid_rows": ws.row_count, "grid_cols": ws.col_count}
+        for t, ws in handles.items()
+    }
+    return tabs, handles
+
+
+def check_capacity(now=None, grow=True):
+    # samples every tab, grows the ones running out of rows, returns the projection
+    now = now or time.time()
+    log = capacity_log()
+
+    tabs, handles = measure()
+    log.record(tabs, now)
+
+    history = log.history(now - CAPACITY_HISTORY_DAYS * DAY)
+    rates = {t: rows_per_day(history.get(t, [])) for t in tabs}
+
+    grown = {}
+    blocked = []
+
+    if grow:
+        spare = SHEET_CELL_LIMIT - sum(v["grid_rows"] * v["grid_cols"] for v in tabs.values())
+
+        # fastest growing first, they need the spare cells most
+        for t in sorted(tabs, key=lambda t: -rates[t] * tabs[t]["grid_cols"]):
+            v = tabs[t]
+            step = grow_step(v, rates[t])
+
+            if not step:
+                continue
+
+            fits = min(step, spare // max(v["grid_cols"], 1))
+            if fits < step:
+                blocked.append(t)
+            if fits <= 0:
+                continue
+
+            handles[t].add_rows(fits)
+            v["grid_rows"] += fits
+            spare -= fits * v["grid_cols"]
+            grown[t] = fits
+
+        if grown:
+            log.record(tabs, now)
+            capacity_debug("TABS_GROWN", grown)
+
+    log.prune(now - CAPACITY_HISTORY_DAYS * DAY)
+    return project(tabs, rates, now, grown, blocked)
+
+
+def capacity_report(max_age, now=None):
+    # the last sample when younger than max_age seconds (no reads), else a fresh check
+    now = now or time.time()
+    taken_at, tabs = capacity_log().latest()
+
+    if taken_at is None or now - taken_at > max_age:
+        return check_capacity(now)
+
+    history = capacity_log().history(taken_at - CAPACITY_HISTORY_DAYS * DAY)
+    return project(tabs, {t: rows_per_day(history.get(t, [])) for t in tabs}, taken_at)
+
+
+# ---------------- TEXT ----------------
+
+def _n(v):
+    return f"{v / 1e6:.2f}M" if v >= 1e6 else f"{v / 1e3:.0f}k" if v >= 1e4 else f"{v:,.0f}"
+
+
+def capacity_text(report, top=8):
+    limit = report["limit"]
+    days = report["days_to_limit"]
+
+    if days is None:
+        eta = "no growth measured yet"
+    else:
+        date = datetime.fromtimestamp(report["taken_at"] + days * DAY).strftime("%Y-%m-%d")
+        eta = f"~{days:,.0f} days ({date})"
+
+    lines = [
+        "⚙️ SYSTEM · sheet capacity",
+        "",
+        f"🧮 Cells allocated: {_n(report['grid_cells'])} / {_n(limit)} ({report['grid_cells'] / limit:.0%})",
+        f"📝 Cells in use: {_n(report['used_cells'])} (+{_n(report['cells_per_day'])}/day)",
+        f"⏳ Limit reached in: {eta}",
+        "",
+    ]
+
+    tabs = sorted(report["tabs"].items(), key=lambda kv: -kv[1]["cells"])
+    for t, v in tabs[:top]:
+        line = f"• {t}: {v['rows']:,} / {v['grid_rows']:,} rows × {v['grid_cols']} · {_n(v['cells'])} cells"
+        if v["rows_per_day"]:
+            line += f" · +{v['rows_per_day']:,.0f}/day"
+        lines.append(line)
+
+    if len(tabs) > top:
+        lines.append(f"… and {len(tabs) - top} smaller tabs")
+
+    if report["grown"]:
+        lines += ["", "📈 Grown: " + ", ".join(f"{t} +{n:,} rows" for t, n in report["grown"].items())]
+
+    if report["blocked"]:
+        lines += ["", "🛑 No room to grow: " + ", ".join(report["blocked"])]
+
+    if days is not None and days < TAB_HEADROOM_DAYS * 3:
+        hint = "archive old rows" if ITEM_SHARD_BY else "set ITEM_SHARD_BY / move old rows out"
+        lines += ["", f"⚠️ Under {TAB_HEADROOM_DAYS * 3} days left: {hint}."]
+
+    return "\n".join(lines)
@@ -0,0 +1,155 @@
+import threading
+from collections import Counter
+from contextvars import ContextVar
+
+
+# ================================
+# SHEETS API CALL ACCOUNTING
+# ================================
+# CountingClient wraps a gspread client (real or fake_sheets.FakeClient) and
+# counts every call that reaches the Sheets API, tagged READ or WRITE and
+# attributed to the current flow label:
+#
+#   client = CountingClient(gspread.authorize(creds))
+#   with client.flow("new_item"):
+#       ...
+#   client.counts["new_item"]  ->  Counter({"READ": 9, "WRITE": 3, ...})
+
+READ_METHODS = {
+    "open_by_key", "worksheet", "worksheets", "fetch_sheet_metadata", "values_batch_get",
+    "row_values", "col_values", "get_all_values", "get_all_records", "get_values",
+    "get", "batch_get", "acell", "cell", "find", "findall", "range",
+    "find_rows", "rows_at",
+}
+
+WRITE_METHODS = {
+    "add_worksheet", "del_worksheet", "values_append", "values_update", "values_clear",
+    "append_row", "append_rows", "insert_row", "insert_rows",
+    "update_cell", "update_cells", "update", "update_acell", "batch_update", "batch_clear",
+    "add_rows", "add_cols", "resize", "delete_rows", "delete_columns", "clear",
+    "update_title", "batch_update_if",
+}
+
+DEFAULT_FLOW = "_"
+
+
+class CallCounter:
+
+    # the flow label is per context: concurrent handlers (and the executor
+    # threads run_sheet hands their Sheets calls to, which run in a copy of
+    # the caller's context) each charge their own flow
+    def __init__(self):
+        self.counts = {}
+        self._flow = ContextVar(f"sheet_flow_{id(self)}", default=DEFAULT_FLOW)
+        self._lock = threading.Lock()
+
+    def record(self, kind, method):
+        with self._lock:
+            c = self.counts.setdefault(self._flow.get(), Counter())
+            c[kind] += 1
+            c[method] += 1
+
+    def flow(self, name):
+        return _FlowScope(self, name)
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+    def totals(self, name=None):
+        if name is not None:
+            return Counter(self.counts.get(name, Counter()))
+
+        out = Counter()
+        for c in self.counts.values():
+            out.update(c)
+        return out
+
+
+class _FlowScope:
+
+    def __init__(self, counter, name):
+        self.counter = counter
+        self.name = name
+        self.token = None
+
+    def __enter__(self):
+        self.token = self.counter._flow.set(self.name)
+        with self.counter._lock:
+            return self.counter.counts.setdefault(self.name, Counter())
+
+    def __exit__(self, *exc):
+        self.counter._flow.reset(self.token)
+        return False
+
+
+class _CountingProxy:
+
+    def __init__(self, target, counter):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+
+        if not callable(attr) or (name not in READ_METHODS and name not in WRITE_METHODS):
+            return attr
+
+        kind = "READ" if name in READ_METHODS else "WRITE"
+        counter = self._counter
+
+        def call(*args, **kwargs):
+            counter.record(kind, name)
+            result = attr(*args, **kwargs)
+            return _wrap(result, counter)
+
+        return call
+
+
+class CountingWorksheet(_CountingProxy):
+    pass
+
+
+class CountingSpreadsheet(_CountingProxy):
+    pass
+
+
+def _wrap(result, counter):
+    # keep counting on worksheets handed out by spreadsheets
+    if hasattr(result, "add_worksheet") and hasattr(result, "worksheet"):
+        return CountingSpreadsheet(result, counter)
+
+    if hasattr(result, "append_row") and hasattr(result, "update_cell"):
+        return CountingWorksheet(result, counter)
+
+    if isinstance(result, list) and result and all(hasattr(r, "append_row") for r in result):
+        return [CountingWorksheet(r, counter) for r in result]
+
+    return result
+
+
+class CountingClient(_CountingProxy):
+
+    def __init__(self, client, counter=None):
+        super().__init__(client, counter or CallCounter())
+
+    @property
+    def counter(self):
+        return self._counter
+
+    @property
+    def counts(self):
+        return self._counter.counts
+
+    def flow(self, name):
+        return self._counter.flow(name)
+
+
+# process-wide counter shared by sheets_logger and users
+CALLS = CallCounter()
+
+
+def instrument(client):
+    if isinstance(client, CountingClient):
+        return client
+    return CountingClient(client, CALLS)
@@ -1,8 +1,10 @@
 import json
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import threading
+import uuid
+from gspread.utils import rowcol_to_a1
 from datetime import datetime, timezone, timedelta
 import math
+from itertools import zip_longest, chain
 
 _OWNER_COORD_CACHE = None
 
@@ -38,11 +40,21 @@ def load_owner_coords():
     return cache
 
 from config import (
-    SPREADSHEET_ID, GOOGLE_CREDENTIALS,
-    WORKSHEET_ITEMS, WORKSHEET_OWNERS, WORKSHEET_LOG, WORKSHEET_TASKS,
-    DAYS_CONFIRM_WINDOW, DAYS_AUTO_HIDE
+    SPREADSHEET_ID,
+    WORKSHEET_ITEMS, WORKSHEET_OWNERS, WORKSHEET_LOG, WORKSHEET_TASKS, WORKSHEET_ITEM_PHOTOS,
+    LOG_ARCHIVE_SPREADSHEET_ID, TAB_INITIAL_ROWS, ITEM_SHARD_BY, ITEM_SHARD_AFTER_DAYS,
+    DAYS_CONFIRM_WINDOW, DAYS_AUTO_HIDE, TASK_REMINDER_FREQUENCY_MIN, LOCAL_DB_PATH
 )
-from utils import now_str, fmt_item_id, safe_text, is_vin_17
+from utils import now_str, now_local, fmt_item_id, safe_text, is_vin_17, parse_ts, TS_FORMAT
+from storage import open_client
+from repositories import open_repository
+from local_db import open_db
+from due_index import DueIndex
+from dup_index import DuplicateIndex, record as dup_record
+from item_index import ItemIndex
+from report_stats import ReportStats, ITEM_COLUMNS as REPORT_ITEM_COLUMNS
+from caption_parser import parse_caption, item_fields
+from vin_decoder import vin_fields
 
 # ---------------- SCHEMAS ----------------
 
@@ -160,11 +172,46 @@ TASKS_SCHEMA = [
     "RELATED_ITEM_ID"
 ]
 
+SUBMISSIONS_SCHEMA = [
+    "SUBMISSION_ID",
+    "SUBMITTED_BY",
+    "SUBMITTED_AT",
+    "LOCATION_COORDS",
+    "MAPS_LINK",
+    "PHOTO_URL",
+    "OWNER_NAME",
+    "OWNER_PHONE",
+    "OWNER_EMAIL",
+    "OWNER_SOCIALS",
+    "CITY_STATE",
+    "SOURCE_PLATFORM",
+    "SOURCE_LINK",
+    "ADMIN_STATUS",
+    "ADMIN_NOTES",
+    "DISTANCE_WARNING"
+]
+
+WORKSHEET_SUBMISSIONS = "OWNER_SUBMISSIONS"
+
+ITEM_PHOTOS_SCHEMA = [
+    "ITEM_ID",
+    "ORDINAL",
+    "FILE_ID",
+    "FILE_UNIQUE_ID",
+    "WIDTH",
+    "HEIGHT",
+    "THUMB_FILE_ID"
+]
+
+# 1-based sheet column of ADMIN_STATUS
+SUB_COL_ADMIN_STATUS = SUBMISSIONS_SCHEMA.index("ADMIN_STATUS") + 1
+
 # ---------------- CONNECT ----------------
 # ---------------- SCHEMA VALIDATION ----------------
 
-def _validate_schema(ws, expected_schema, sheet_name):
-    header = ws.row_values(1)
+def _validate_schema(ws, expected_schema, sheet_name, header=None):
+    if header is None:
+        header = ws.row_values(1)
 
     if not header:
         raise Exception(f"❌ {sheet_name} has no header row.")
@@ -188,42 +235,58 @@ Fix the sheet header manually before running the bot.
 _CLIENT = None
 
 def _client():
+    # STORAGE_BACKEND's client (storage.py): Google Sheets or the SQL store
     global _CLIENT
 
     if _CLIENT:
         return _CLIENT
 
-    creds_dict = json.loads(GOOGLE_CREDENTIALS)
+    _CLIENT = open_client()
 
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive"
-    ]
+    return _CLIENT
 
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+# worksheet handles are cached for the life of the process:
+# open_by_key + worksheet + header check cost 3 API reads per access
+_SPREADSHEET = None
+_WS_CACHE = {}
 
-    _CLIENT = gspread.authorize(creds)
+def _spreadsheet():
+    global _SPREADSHEET
 
-    return _CLIENT
+    if _SPREADSHEET is None:
+        _SPREADSHEET = _client().open_by_key(SPREADSHEET_ID)
+
+    return _SPREADSHEET
 
-def _get_ws(title: str, schema: list, rows="5000", cols="60"):
-    ss = _client().open_by_key(SPREADSHEET_ID)
+# New tabs are exactly as wide as their schema and TAB_INITIAL_ROWS tall;
+# sheet_capacity grows them ahead of need (every grid cell counts against
+# the spreadsheet's cell limit, filled or not).
+def _get_ws(title: str, schema: list, rows=None, cols=None):
+
+    if title in _WS_CACHE:
+        return _WS_CACHE[title]
+
+    ss = _spreadsheet()
 
     try:
         ws = ss.worksheet(title)
     except Exception:
-        ws = ss.add_worksheet(title=title, rows=rows, cols=cols)
+        ws = ss.add_worksheet(title=title, rows=str(rows or TAB_INITIAL_ROWS), cols=str(cols or len(schema)))
         ws.append_row(schema)
+        _WS_CACHE[title] = ws
         return ws
 
     header = ws.row_values(1)
 
     if not header:
         ws.append_row(schema)
+        _WS_CACHE[title] = ws
         return ws
 
     # validate schema instead of modifying it
-    _validate_schema(ws, schema, title)
+    _validate_schema(ws, schema, title, header)
+
+    _WS_CACHE[title] = ws
 
     return ws
 
@@ -231,43 +294,70 @@ def items_ws():
     return _get_ws(WORKSHEET_ITEMS, ITEMS_SCHEMA)
 
 def owners_ws():
-    return _get_ws(WORKSHEET_OWNERS, OWNERS_SCHEMA, cols="40")
+    return _get_ws(WORKSHEET_OWNERS, OWNERS_SCHEMA)
 
 def log_ws():
-    return _get_ws(WORKSHEET_LOG, LOG_SCHEMA, cols="20")
+    return _get_ws(WORKSHEET_LOG, LOG_SCHEMA)
 
 def tasks_ws():
-    return _get_ws(WORKSHEET_TASKS, TASKS_SCHEMA, cols="25")
+    return _get_ws(WORKSHEET_TASKS, TASKS_SCHEMA)
 
+def submissions_ws():
+    return _get_ws(WORKSHEET_SUBMISSIONS, SUBMISSIONS_SCHEMA)
+
+# rows by column (repositories.py): a tab scan on Sheets, an indexed query
+# on a database backend
+def items_repo(ws=None):
+    return open_repository(ws or items_ws(), ITEMS_SCHEMA, "ITEM_ID")
+
+def owners_repo():
+    return open_repository(owners_ws(), OWNERS_SCHEMA, "OWNER_ID")
+
+def log_repo():
+    return open_repository(log_ws(), LOG_SCHEMA)
+
+def tasks_repo():
+    return open_repository(tasks_ws(), TASKS_SCHEMA, "TASK_ID")
+
+def submissions_repo():
+    return open_repository(submissions_ws(), SUBMISSIONS_SCHEMA, "SUBMISSION_ID")
+
+
+INDEX_SCHEMA = [
+    "ITEM_ID",
+    "VIN_FULL",
+    "VIN_LAST6",
+    "OWNER_ID",
+    "OWNER_STOCK_NUMBER",
+    "MAKE",
+    "MODEL",
+    "YEAR",
+    "STATE",
+    "ROW_NUMBER"
+]
 
 def index_ws():
-    ss = _client().open_by_key(SPREADSHEET_ID)
+
+    if "TRUCK_INDEX" in _WS_CACHE:
+        return _WS_CACHE["TRUCK_INDEX"]
+
+    ss = _spreadsheet()
 
     try:
         ws = ss.worksheet("TRUCK_INDEX")
     except Exception:
-        ws = ss.add_worksheet(title="TRUCK_INDEX", rows="5000", cols="15")
-
-        ws.append_row([
-            "ITEM_ID",
-            "VIN_FULL",
-            "VIN_LAST6",
-            "OWNER_ID",
-            "OWNER_STOCK_NUMBER",
-            "MAKE",
-            "MODEL",
-            "YEAR",
-            "STATE",
-            "ROW_NUMBER"
-        ])
+        ws = ss.add_worksheet(title="TRUCK_INDEX", rows=str(TAB_INITIAL_ROWS), cols=str(len(INDEX_SCHEMA)))
+
+        ws.append_row(INDEX_SCHEMA)
+
+    _WS_CACHE["TRUCK_INDEX"] = ws
 
     return ws
 
 # ---------------- LOGGING ----------------
 
-def log_action(user_id: str, role: str, action: str, item_id="", owner_id="", details="", result="OK"):
-    ws = log_ws()
-    ws.append_row([
+def _log_row(user_id, role, action, item_id="", owner_id="", details="", result="OK"):
+    return [
         now_str(),
         str(user_id),
         str(role),
@@ -276,7 +366,125 @@ def log_action(user_id: str, role: str, action: str, item_id="", owner_id="", de
         str(owner_id),
         safe_text(details),
         str(result)
-    ])
+    ]
+
+def log_action(user_id: str, role: str, action: str, item_id="", owner_id="", details="", result="OK"):
+    row = _log_row(user_id, role, action, item_id, owner_id, details, result)
+    log_repo().append([row])
+    _report_event(row)
+
+# Events raised from flows that are already at their write budget are
+# buffered and written with one append_rows by flush_log_actions (scheduler
+# job, every LOG_FLUSH_SECONDS, and once more on shutdown). Reports count
+# them immediately. The buffer is a table in LOCAL_DB_PATH so rows queued
+# before a crash or restart are flushed by the next process.
+_LOG_BUFFER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_buffer (
+    id  INTEGER PRIMARY KEY AUTOINCREMENT,
+    row TEXT NOT NULL
+);
+"""
+
+_LOG_BUFFER_DB = None
+_LOG_BUFFER_LOCK = threading.Lock()
+
+def _log_buffer(sql, params=()):
+    global _LOG_BUFFER_DB
+
+    with _LOG_BUFFER_LOCK:
+        if _LOG_BUFFER_DB is None:
+            _LOG_BUFFER_DB = open_db(LOCAL_DB_PATH)
+            _LOG_BUFFER_DB.executescript(_LOG_BUFFER_SCHEMA)
+
+        return _LOG_BUFFER_DB.execute(sql, params).fetchall()
+
+def queued_log_rows():
+    # (id, row) oldest first
+    return [(r["id"], json.loads(r["row"])) for r in _log_buffer("SELECT id, row FROM log_buffer ORDER BY id")]
+
+def queue_log_action(user_id: str, role: str, action: str, item_id="", owner_id="", details="", result="OK"):
+    row = _log_row(user_id, role, action, item_id, owner_id, details, result)
+
+    _log_buffer("INSERT INTO log_buffer (row) VALUES (?)", (json.dumps(row),))
+
+    _report_event(row)
+
+def flush_log_actions():
+    # rows written; they leave the buffer only once the append went through,
+    # so a failed flush retries them (and rows queued meanwhile) next time
+    queued = queued_log_rows()
+
+    if not queued:
+        return 0
+
+    log_repo().append([row for _, row in queued])
+    _log_buffer("DELETE FROM log_buffer WHERE id <= ?", (queued[-1][0],))
+
+    return len(queued)
+
+def _report_event(row):
+    if REPORTS.loaded:
+        REPORTS.add_event(row[0], row[1], row[3])
+
+# ---------------- LOG ARCHIVE TABS ----------------
+# log_archive.py moves old ACTIVITY_LOG rows into one tab per month
+# (ACTIVITY_LOG_2026_01, ...), in LOG_ARCHIVE_SPREADSHEET_ID if set so the
+# archive does not weigh on this spreadsheet, else next to ACTIVITY_LOG.
+
+_ARCHIVE_SPREADSHEET = None
+
+def _archive_spreadsheet():
+    global _ARCHIVE_SPREADSHEET
+
+    if not LOG_ARCHIVE_SPREADSHEET_ID:
+        return _spreadsheet()
+
+    if _ARCHIVE_SPREADSHEET is None:
+        _ARCHIVE_SPREADSHEET = _client().open_by_key(LOG_ARCHIVE_SPREADSHEET_ID)
+
+    return _ARCHIVE_SPREADSHEET
+
+def archive_log_title(month):
+    # "2026-01" -> ACTIVITY_LOG_2026_01
+    return f"{WORKSHEET_LOG}_{month.replace('-', '_')}"
+
+def archive_log_ws(month):
+    # the month's archive tab, None if there is none yet
+    key = "archive:" + archive_log_title(month)
+
+    if key in _WS_CACHE:
+        return _WS_CACHE[key]
+
+    try:
+        ws = _archive_spreadsheet().worksheet(archive_log_title(month))
+    except Exception:
+        return None
+
+    _WS_CACHE[key] = ws
+    return ws
+
+def add_archive_log_ws(month, rows):
+    # creates the month's tab sized for rows and writes header + rows in one append
+    title = archive_log_title(month)
+    ws = _archive_spreadsheet().add_worksheet(title=title, rows=str(len(rows) + 1), cols=str(len(LOG_SCHEMA)))
+    ws.append_rows([LOG_SCHEMA] + rows)
+
+    _WS_CACHE["archive:" + title] = ws
+    return ws
+
+def archive_log_months():
+    # months that have an archive tab, e.g. ["2026-01", "2026-02"] (one read)
+    prefix = WORKSHEET_LOG + "_"
+    return sorted(
+        ws.title[len(prefix):].replace("_", "-")
+        for ws in _archive_spreadsheet().worksheets()
+        if ws.title.startswith(prefix) and len(ws.title) == len(prefix) + 7
+    )
+
+def delete_log_rows(count):
+    # drops the oldest count data rows of ACTIVITY_LOG (rows 2 .. count + 1)
+    if count > 0:
+        log_ws().delete_rows(2, count + 1)
 
 # ---------------- OWNERS ----------------
 # ---------------- DISTANCE CHECK ----------------
@@ -325,10 +533,25 @@ def check_nearby_accounts(lat, lon, radius=200):
 
     return matches
 
-def next_owner_id():
-    ws = owners_ws()
-    rows = ws.get_all_values()[1:]
-    return f"OWN-{len(rows)+1:06d}"
+# OWNER_IDs come from the store (append_numbered_rows), not from a
+# per-process counter, so bot processes sharing a database never hand out
+# the same one
+
+def fmt_owner_id(n):
+    return f"OWN-{n:06d}"
+
+def owner_id_tail():
+    return id_tail(owners_ws(), 1)
+
+def _append_owner_rows(rows, tail=None):
+    # rows: owner rows, OWNER_ID (r[0]) is filled in here. Returns the IDs
+    _, owner_ids = append_numbered_rows(owners_ws(), OWNERS_SCHEMA, "OWNER_ID", fmt_owner_id, rows, tail)
+
+    if REPORTS.loaded:
+        for r in rows:
+            REPORTS.set_owner(r[0], r[11], r[12])
+
+    return owner_ids
 
 def find_owner_matches(query: str, limit=10):
     q = safe_text(query).lower()
@@ -356,40 +579,10 @@ def create_owner_submission(
         source_link,
         distance_warning):
 
-    ss = _client().open_by_key(SPREADSHEET_ID)
-
-    try:
-        ws = ss.worksheet("OWNER_SUBMISSIONS")
-    except Exception:
-        ws = ss.add_worksheet(title="OWNER_SUBMISSIONS", rows="5000", cols="20")
-
-        schema = [
-            "SUBMISSION_ID",
-            "SUBMITTED_BY",
-            "SUBMITTED_AT",
-            "LOCATION_COORDS",
-            "MAPS_LINK",
-            "PHOTO_URL",
-            "OWNER_NAME",
-            "OWNER_PHONE",
-            "OWNER_EMAIL",
-            "OWNER_SOCIALS",
-            "CITY_STATE",
-            "SOURCE_PLATFORM",
-            "SOURCE_LINK",
-            "ADMIN_STATUS",
-            "ADMIN_NOTES",
-            "DISTANCE_WARNING"
-        ]
-
-        ws.append_row(schema)
-
-    rows = ws.get_all_values()
+    ws = submissions_ws()
 
-    submission_id = f"SUB-{len(rows):06d}"
-
-    ws.append_row([
-        submission_id,
+    row = [
+        "",
         str(submitted_by),
         now_str(),
         coords,
@@ -405,7 +598,10 @@ def create_owner_submission(
         "PENDING",
         "",
         distance_warning
-    ])
+    ]
+
+    # SUB-000007 lands on sheet row 8, see _submission_row_guess
+    _, (submission_id,) = append_numbered_rows(ws, SUBMISSIONS_SCHEMA, "SUBMISSION_ID", fmt_submission_id, [row])
 
     return submission_id
 
@@ -422,12 +618,8 @@ def create_owner_direct(
         source_platform,
         source_link):
 
-    owners = owners_ws()
-
-    owner_id = next_owner_id()
-
-    owners.append_row([
-        owner_id,
+    owner_id, = _append_owner_rows([[
+        "",
         "Truck Owner",
         owner_name,
         owner_phone,
@@ -445,7 +637,7 @@ def create_owner_direct(
         "",
         "",
         coords
-    ])
+    ]])
 
     return owner_id
 
@@ -460,25 +652,49 @@ def approve_owner(owner_id: str, approved_by: str):
     return False
 
 def get_owner(owner_id: str):
-    ws = owners_ws()
-    rows = ws.get_all_values()[1:]
-    for r in rows:
-        if r and r[0] == owner_id:
-            return r
-    return None
+    return owners_repo().find(owner_id)[1]
 
 
 def get_owner_by_id(owner_id: str):
+    return owners_repo().find(owner_id)[1]
+
+def _owner_row_guess(owner_id: str):
+    # OWN-000123 is issued as the 123rd data row -> sheet row 124
+    try:
+        return int(owner_id.split("-")[1]) + 1
+    except (IndexError, ValueError):
+        return None
+
+def get_owners_by_ids(owner_ids):
+    # one batch_get of the rows the IDs point at; a full read only if a row moved
+    wanted = {o for o in owner_ids if o}
+
+    if not wanted:
+        return {}
 
     ws = owners_ws()
+    last_col = rowcol_to_a1(1, len(OWNERS_SCHEMA)).rstrip("1")
 
-    rows = ws.get_all_values()[1:]
+    guesses = {o: _owner_row_guess(o) for o in wanted}
+    ranges = [(o, n) for o, n in guesses.items() if n]
 
-    for r in rows:
-        if r and r[0] == owner_id:
-            return r
+    found = {}
 
-    return None
+    if ranges:
+        blocks = ws.batch_get([f"A{n}:{last_col}{n}" for _, n in ranges])
+
+        for (owner_id, _), block in zip(ranges, blocks):
+            if block and block[0] and block[0][0] == owner_id:
+                found[owner_id] = list(block[0])
+
+    missing = wanted - set(found)
+
+    if missing:
+        for r in ws.get_all_values()[1:]:
+            if r and r[0] in missing:
+                found[r[0]] = r
+
+    return found
 
 def owners_recent_for_user(user_id: str, limit=10):
     ws = owners_ws()
@@ -494,29 +710,20 @@ def owners_recent_for_user(user_id: str, limit=10):
 
 def get_worker_accounts(worker_id: str):
 
-    ws = owners_ws()
-
-    rows = ws.get_all_values()[1:]
+    rows = [r for _, r in owners_repo().find_all("CLAIMED_BY_FINDER_ID", worker_id)]
 
     # sort by LAST_CONTACTED_AT (recent first)
-    try:
-        rows.sort(key=lambda r: r[15] if len(r) > 15 else "", reverse=True)
-    except:
-        pass
+    rows.sort(key=lambda r: r[15], reverse=True)
 
     results = []
 
     for r in rows:
 
-        if len(r) < 12:
-            continue
-
         owner_id = r[0]
         owner_name = r[2]
-        created_by = r[11]
-        owner_status = r[12] if len(r) > 12 else ""
+        owner_status = r[12]
 
-        if created_by == str(worker_id) and owner_status == "APPROVED":
+        if owner_status == "APPROVED":
 
             results.append({
                 "owner_id": owner_id,
@@ -525,98 +732,289 @@ def get_worker_accounts(worker_id: str):
 
     return results
 
+def touch_owner_contacted(owner_id: str):
+    repo = owners_repo()
+    row_i, _ = repo.find(owner_id)
+
+    if not row_i:
+        return False
+
+    repo.update(row_i, {"LAST_CONTACTED_AT": now_str()})
+    return True
+
 # ---------------- ITEMS ----------------
 
+def _next_item_number(ids):
+    # ids: the ITEM_ID (or TASK_ID) column, header included. Past the row
+    # count when rows were moved out to shards or deleted (the newest row
+    # always stays).
+    try:
+        last = int(ids[-1].rsplit("-", 1)[-1]) if len(ids) > 1 else 0
+    except ValueError:
+        last = 0
+    return max(len(ids), last + 1)
+
+def id_tail(ws, col):
+    # (next ID number, row the next append should land on), one read of the
+    # ID column
+    ids = ws.col_values(col)
+    return _next_item_number(ids), len(ids) + 1
+
+def append_numbered_rows(ws, schema, id_field, fmt, rows, tail=None):
+    # Appends rows numbered from the ID column tail (fills their id_field).
+    # The row the append lands on confirms the numbers: if another bot
+    # process appended in between, ours landed lower and their IDs follow
+    # the rows (one extra write, only then), so two processes never issue
+    # the same ID. Returns (first_row, ids).
+    col = schema.index(id_field)
+    first, expected = tail or id_tail(ws, col + 1)
+
+    for k, r in enumerate(rows):
+        r[col] = fmt(first + k)
+
+    if len(rows) == 1:
+        response = ws.append_row(rows[0])
+    else:
+        response = ws.append_rows(rows)
+
+    landed = _appended_rows(response)
+
+    if landed and landed[0] != expected:
+        first += landed[0] - expected
+        for k, r in enumerate(rows):
+            r[col] = fmt(first + k)
+        batch_update_cells(ws, schema, [(landed[0] + k, id_field, r[col]) for k, r in enumerate(rows)])
+        print("[SHEETS DEBUG] IDS SHIFTED:", rows[0][col], "ROW:", landed[0])
+
+    return (landed[0] if landed else expected), [r[col] for r in rows]
+
 def next_item_id():
-    ws = items_ws()
-    count = len(ws.col_values(1)) - 1
-    return fmt_item_id(count + 1)
+    return fmt_item_id(_next_item_number(items_ws().col_values(2)))
 
-def create_draft(worker_id: str, owner_id: str, owner_type: str, owner_name_cache: str):
-    ws = items_ws()
-    item_id = next_item_id()
-    now = now_str()
+def _item_row(values: dict):
+    return ["" if values.get(k) is None else str(values[k]) for k in ITEMS_SCHEMA]
 
-    # Confirmation windows
-    next_due = (datetime.now(timezone.utc) + timedelta(days=DAYS_CONFIRM_WINDOW)).strftime("%Y-%m-%d %H:%M:%S")
-    auto_hide = (datetime.now(timezone.utc) + timedelta(days=DAYS_AUTO_HIDE)).strftime("%Y-%m-%d %H:%M:%S")
+# ---------------- ITEM PHOTOS ----------------
+# One row per photo. Each item's photos go in with one append_rows, so they
+# form one contiguous block and reading them back is a single range get.
+# ITEM_PHOTO_ROWS maps ITEM_ID -> (first_row, count); it is built from one
+# read of the ITEM_ID column and then kept current from append responses.
+# At 50 photos x 100k items the column read is the only O(n) step and it
+# happens once per process.
 
-    ws.append_row([
-        now,                   # CREATED_AT
-        item_id,               # ITEM_ID
-        "DRAFT",               # ITEM_STATUS
-        "",                    # LISTING_STATUS_REASON
-        now,                   # LAST_UPDATED_AT
+ITEM_PHOTO_ROWS = {}
+_ITEM_PHOTO_ROWS_LOADED = False
+_ITEM_PHOTOS_LOCK = threading.Lock()
 
-        str(worker_id),        # FINDER_WORKER_ID
-        "",                    # SELLER_WORKER_ID
-        "",                    # GATEKEEPER_ID
+def item_photos_ws():
+    # ~10 photo rows per item: starts larger than the other tabs
+    return _get_ws(WORKSHEET_ITEM_PHOTOS, ITEM_PHOTOS_SCHEMA, rows=10 * TAB_INITIAL_ROWS)
 
-        owner_id,              # OWNER_ID
-        owner_type,            # OWNER_TYPE
-        "",                    # OWNER_STOCK_NUMBER
+def _appended_rows(response):
+    # "'ITEM_PHOTOS'!A120:G129" -> (120, 129)
+    try:
+        rng = response["updates"]["updatedRange"].split("!")[-1]
+        start, end = rng.split(":")
+        first = int("".join(ch for ch in start if ch.isdigit()))
+        last = int("".join(ch for ch in end if ch.isdigit()))
+        return first, last
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
 
-        "", "", "", "", "", "", "", "", "", "", "", "",
+def load_item_photo_index():
+    global _ITEM_PHOTO_ROWS_LOADED
 
-        "",                    # VIN_FULL
-        "",                    # VIN_LAST6
+    ids = item_photos_ws().col_values(1)
+    index = {}
 
-        "",                    # STATE
-        "",                    # CITY
-        "",                    # PUBLIC_LOCATION
-        "",                    # PUBLIC_DESCRIPTION
+    run_id, run_start, run_len = None, 0, 0
 
-        "",                    # RAW_CAPTION
-        "0",                   # PARSE_CONFIDENCE
-        "0",                   # PHOTO_COUNT
+    for i, v in enumerate(ids[1:] + [None], start=2):
 
-        "", "", "", "", "", "",
+        if v == run_id and v:
+            run_len += 1
+            continue
 
-        "0",                   # BUYER_LEADS_COUNT
+        # an item saved twice keeps its latest block
+        if run_id:
+            index[run_id] = (run_start, run_len)
 
-        "",                    # LAST_CONFIRMED_AVAILABLE_AT
-        next_due,              # NEXT_CONFIRM_DUE_AT
-        "",                    # STALE_WARNING_AT
-        auto_hide,             # AUTO_HIDE_AT
+        run_id, run_start, run_len = v, i, 1
 
-        "", "", "",
+    with _ITEM_PHOTOS_LOCK:
+        ITEM_PHOTO_ROWS.clear()
+        ITEM_PHOTO_ROWS.update(index)
+        _ITEM_PHOTO_ROWS_LOADED = True
 
-        "",                    # SHOPIFY_PRODUCT_ID
-        "",                    # SHOPIFY_HANDLE
-        "",                    # SHOPIFY_STATUS
+    return len(index)
 
-        "",                    # TELEGRAM_CHAT_ID
-        "",                    # TELEGRAM_MESSAGE_ID
-        "",                    # PUBLIC_TELEGRAM_POST_URL
-    ])
+def _photo_row(item_id, ordinal, p):
+    return [
+        item_id,
+        ordinal,
+        p.get("file_id", ""),
+        p.get("file_unique_id", ""),
+        p.get("width", ""),
+        p.get("height", ""),
+        p.get("thumb_file_id") or ""
+    ]
 
-    # -------- ADD TO TRUCK_INDEX --------
-    idx = index_ws()
+def add_item_photos(item_id: str, photos):
+    # photos: [{"file_id", "file_unique_id", "width", "height", "thumb_file_id"}]
+    global _ITEM_PHOTO_ROWS_LOADED
+
+    rows = [_photo_row(item_id, i, p) for i, p in enumerate(photos, start=1) if p.get("file_id")]
+
+    if not rows:
+        return 0
+
+    ws = item_photos_ws()
+
+    with _ITEM_PHOTOS_LOCK:
+
+        span = _appended_rows(ws.append_rows(rows))
+
+        if span and span[1] - span[0] + 1 == len(rows):
+            ITEM_PHOTO_ROWS[item_id] = (span[0], len(rows))
+        else:
+            # can't tell where the block landed; rebuild on next read
+            _ITEM_PHOTO_ROWS_LOADED = False
+
+    return len(rows)
+
+def _photo_dict(r):
+    r = list(r) + [""] * (len(ITEM_PHOTOS_SCHEMA) - len(r))
+    return {
+        "item_id": r[0],
+        "ordinal": int(r[1]) if r[1].isdigit() else 0,
+        "file_id": r[2],
+        "file_unique_id": r[3],
+        "width": int(r[4]) if r[4].isdigit() else 0,
+        "height": int(r[5]) if r[5].isdigit() else 0,
+        "thumb_file_id": r[6],
+    }
+
+def get_photos_for_items(item_ids):
+    # {item_id: [photo, ...]} with one batch_get for all the blocks
+    wanted = [i for i in dict.fromkeys(item_ids) if i]
+
+    if not wanted:
+        return {}
+
+    if not _ITEM_PHOTO_ROWS_LOADED:
+        load_item_photo_index()
+
+    ws = item_photos_ws()
+    last_col = rowcol_to_a1(1, len(ITEM_PHOTOS_SCHEMA)).rstrip("1")
+
+    def fetch(ids):
+        spans = [(i, ITEM_PHOTO_ROWS[i]) for i in ids if i in ITEM_PHOTO_ROWS]
+        if not spans:
+            return {}, []
+
+        blocks = ws.batch_get([f"A{first}:{last_col}{first + n - 1}" for _, (first, n) in spans])
+        out, stale = {}, []
+
+        for (item_id, (_, n)), block in zip(spans, blocks):
+            rows = [r for r in block if r and r[0] == item_id]
+            if len(rows) != n:
+                stale.append(item_id)
+                continue
+            out[item_id] = sorted((_photo_dict(r) for r in rows), key=lambda p: p["ordinal"])
+
+        return out, stale
 
-    row_number = len(ws.col_values(1))
+    found, stale = fetch(wanted)
 
-    idx.append_row([
+    # rows moved (manual edit / deleted rows): rebuild the index once and retry
+    if stale:
+        load_item_photo_index()
+        again, _ = fetch(stale)
+        found.update(again)
+
+    return {i: found.get(i, []) for i in wanted}
+
+def get_item_photos(item_id: str):
+    return get_photos_for_items([item_id]).get(item_id, [])
+
+def create_item(worker_id: str, owner_id: str, owner_type: str, fields=None, status="DRAFT", photos=None):
+    # Builds the full ITEMS_MASTER and TRUCK_INDEX rows in memory and writes
+    # each with a single append, so no half-filled draft is ever visible.
+    ws = items_ws()
+    now = now_str()
+
+    # Confirmation windows
+    next_due = (datetime.now(timezone.utc) + timedelta(days=DAYS_CONFIRM_WINDOW)).strftime("%Y-%m-%d %H:%M:%S")
+    auto_hide = (datetime.now(timezone.utc) + timedelta(days=DAYS_AUTO_HIDE)).strftime("%Y-%m-%d %H:%M:%S")
+
+    values = {
+        "CREATED_AT": now,
+        "ITEM_STATUS": status,
+        "LAST_UPDATED_AT": now,
+        "FINDER_WORKER_ID": str(worker_id),
+        "OWNER_ID": owner_id,
+        "OWNER_TYPE": owner_type,
+        "PARSE_CONFIDENCE": "0",
+        "PHOTO_COUNT": "0",
+        "BUYER_LEADS_COUNT": "0",
+        "NEXT_CONFIRM_DUE_AT": next_due,
+        "AUTO_HIDE_AT": auto_hide,
+    }
+
+    values.update(fields or {})
+
+    vin = safe_text(values.get("VIN_FULL")).upper()
+    if vin:
+        values["VIN_FULL"] = vin
+        values.setdefault("VIN_LAST6", vin[-6:])
+
+    row_number, (item_id,) = append_numbered_rows(ws, ITEMS_SCHEMA, "ITEM_ID", fmt_item_id, [_item_row(values)])
+    values["ITEM_ID"] = item_id
+
+    # -------- ADD TO TRUCK_INDEX --------
+    index_ws().append_row([
         item_id,
-        "",     # VIN_FULL
-        "",     # VIN_LAST6
+        values.get("VIN_FULL", ""),
+        values.get("VIN_LAST6", ""),
         owner_id,
-        "",     # OWNER_STOCK_NUMBER
-        "",     # MAKE
-        "",     # MODEL
-        "",     # YEAR
-        "",     # STATE
+        values.get("OWNER_STOCK_NUMBER", ""),
+        values.get("MAKE", ""),
+        values.get("MODEL", ""),
+        values.get("YEAR", ""),
+        values.get("STATE", ""),
         row_number
     ])
 
+    if ITEM_DUE_INDEX.loaded:
+        _index_item_row(row_number, _item_row(values))
+
+    if ITEM_INDEX.loaded:
+        ITEM_INDEX.set(row_number, item_id, now, values)
+
+    if REPORTS.loaded:
+        REPORTS.set_item(row_number, item_id, values)
+
+    if DUP_INDEX.loaded:
+        DUP_INDEX.add(item_id, dup_record(
+            vin=values.get("VIN_FULL", ""), last6=values.get("VIN_LAST6", ""),
+            make=values.get("MAKE", ""), model=values.get("MODEL", ""), year=values.get("YEAR", ""),
+            owner=owner_id, miles=values.get("MILES", ""),
+        ))
+
+    if photos:
+        add_item_photos(item_id, photos)
+
     return item_id
 
+def create_draft(worker_id: str, owner_id: str, owner_type: str, owner_name_cache: str):
+    return create_item(worker_id, owner_id, owner_type)
+
 def get_item_row(item_id: str):
-    ws = items_ws()
-    rows = ws.get_all_values()
-    header = rows[0]
-    for i, r in enumerate(rows[1:], start=2):
-        if r and r[1] == item_id:
-            return ws, header, i, r
+    # ITEMS_MASTER first, then the shard tabs (ws tells which one)
+    for ws in [items_ws()] + [item_shard_ws(t) for t in item_shard_titles()]:
+        row_i, r = items_repo(ws).find(item_id)
+        if row_i:
+            return ws, ITEMS_SCHEMA, row_i, r
     return None, None, None, None
 
 def update_item_fields(item_id: str, updates: dict):
@@ -632,6 +1030,26 @@ def update_item_fields(item_id: str, updates: dict):
         if k in col_index:
             ws.update_cell(row_i, col_index[k], str(v))
 
+    # index key: the row for ITEMS_MASTER, shard rows are offset
+    key = item_key(ws.title, row_i)
+
+    if ITEM_INDEX.loaded:
+        if not ITEM_INDEX.update(key, updates):
+            ITEM_INDEX.set(key, item_id, _col(row, _ITEM_COL, "CREATED_AT"), {
+                c: updates.get(c, _col(row, _ITEM_COL, c)) for c in ITEM_INDEX_COLUMNS
+            })
+
+    if REPORTS.loaded:
+        if not REPORTS.update_item(key, updates):
+            REPORTS.set_item(key, item_id, {**dict(zip(header, row)), **updates})
+
+    if ITEM_DUE_INDEX.loaded:
+        merged = row + [""] * (len(header) - len(row))
+        for k, v in updates.items():
+            if k in col_index:
+                merged[col_index[k] - 1] = str(v)
+        _index_item_row(key, merged)
+
     # -------- UPDATE TRUCK_INDEX --------
     idx = index_ws()
     rows = idx.get_all_values()
@@ -655,56 +1073,841 @@ def update_item_fields(item_id: str, updates: dict):
                 if field in updates:
                     idx.update_cell(i, col+1, str(updates[field]))
 
+            if DUP_INDEX.loaded:
+                merged = r + [""] * (len(INDEX_SCHEMA) - len(r))
+                for field, col in index_updates.items():
+                    if field in updates:
+                        merged[col] = str(updates[field])
+                old = DUP_INDEX.get(item_id)
+                miles = updates.get("MILES", old["miles"] if old and old["miles"] else "")
+                DUP_INDEX.add(item_id, _dup_record_from_index(merged, miles))
+
             break
 
     return True
 
 def list_items_by_status(status: str, limit=10, worker_id=None):
-    ws = items_ws()
-    rows = ws.get_all_values()[1:]
-    out = []
-    for r in reversed(rows):
-        if len(r) < 3:
-            continue
-        if r[2] != status:
+    # newest first
+    return query_items(
+        {"ITEM_STATUS": status, "FINDER_WORKER_ID": str(worker_id) if worker_id else None},
+        descending=True,
+        limit=limit
+    )
+
+def next_pending_review():
+    # oldest PENDING_REVIEW item, straight from the status bucket (no lease;
+    # gatekeepers go through review_queue)
+    rows = query_items({"ITEM_STATUS": "PENDING_REVIEW"}, limit=1)
+    return rows[0] if rows else None
+
+# ---------------- ITEM INDEXES ----------------
+# ITEM_INDEX answers item queries (by status, owner, worker, state, make,
+# year; compound filters; CREATED_AT order) without scanning ITEMS_MASTER.
+# Built from one batch_get of the indexed columns, kept current by
+# create_item / update_item_fields and rebuilt after ITEM_INDEX_TTL seconds
+# or when a fetched row no longer holds the expected item (rows moved).
+# Matching rows are then read with one batch_get of just those rows.
+
+ITEM_INDEX_COLUMNS = [
+    "ITEM_STATUS",
+    "OWNER_ID",
+    "FINDER_WORKER_ID",
+    "SELLER_WORKER_ID",
+    "STATE",
+    "MAKE",
+    "YEAR",
+]
+
+ITEM_INDEX = ItemIndex(ITEM_INDEX_COLUMNS)
+ITEM_INDEX_TTL = 600
+
+# MY ITEMS / MY SALES
+WORKER_ITEM_KINDS = {"FINDER": "FINDER_WORKER_ID", "SELLER": "SELLER_WORKER_ID"}
+
+def _col_letter(name):
+    return rowcol_to_a1(1, _ITEM_COL[name] + 1).rstrip("1")
+
+def _index_entries(title):
+    names = ["CREATED_AT", "ITEM_ID"] + ITEM_INDEX_COLUMNS
+    blocks = items_tab_ws(title).batch_get([f"{_col_letter(n)}2:{_col_letter(n)}" for n in names])
+    cols = [[r[0] if r else "" for r in block] for block in blocks]
+
+    return (
+        (item_key(title, i), values[1], values[0], dict(zip(ITEM_INDEX_COLUMNS, values[2:])))
+        for i, values in enumerate(zip_longest(*cols, fillvalue=""), start=2)
+        if values[1]
+    )
+
+def load_item_index():
+    # one batch_get for ITEMS_MASTER, one per shard tab
+    ITEM_INDEX.load(chain.from_iterable(_index_entries(t) for t in item_tab_titles()))
+    return len(ITEM_INDEX)
+
+def item_index_version():
+    # bumps on every indexed change, so rendered pages can be cached against it
+    return ITEM_INDEX.version
+
+def _ensure_item_index():
+    if not ITEM_INDEX.loaded or ITEM_INDEX.age() > ITEM_INDEX_TTL:
+        load_item_index()
+
+def _fetch_indexed_rows(hits):
+    # ([row values], all rows still hold the expected ITEM_ID)
+    if not hits:
+        return [], True
+
+    last = rowcol_to_a1(1, len(ITEMS_SCHEMA)).rstrip("1")
+    rows = [[] for _ in hits]
+
+    # one batch_get per tab the hits live in (just ITEMS_MASTER unless sharded)
+    for title, wanted in _by_item_tab((key, n) for n, (key, _) in enumerate(hits)).items():
+        blocks = items_tab_ws(title).batch_get([f"A{row_i}:{last}{row_i}" for row_i, _ in wanted])
+        for (_, n), b in zip(wanted, blocks):
+            rows[n] = b[0] if b else []
+
+    ok = all(_col(r, _ITEM_COL, "ITEM_ID") == item_id for r, (_, item_id) in zip(rows, hits))
+
+    return rows, ok
+
+def query_items(filters, descending=False, offset=0, limit=None):
+    # full ITEMS_MASTER rows matching {column: value | [values]}; None values are ignored
+    _ensure_item_index()
+
+    rows, ok = _fetch_indexed_rows(ITEM_INDEX.query(filters, descending, offset, limit))
+
+    if not ok:
+        load_item_index()
+        rows, _ = _fetch_indexed_rows(ITEM_INDEX.query(filters, descending, offset, limit))
+
+    return rows
+
+def count_items(filters=None):
+    _ensure_item_index()
+    return ITEM_INDEX.count(filters)
+
+def worker_item_count(worker_id, kind="FINDER"):
+    return count_items({WORKER_ITEM_KINDS[kind]: str(worker_id)})
+
+def worker_item_page(worker_id, kind="FINDER", page=0, size=10):
+    # (total, [item row values]) newest first; one batch_get for the page
+    filters = {WORKER_ITEM_KINDS[kind]: str(worker_id)}
+    total = count_items(filters)
+    return total, query_items(filters, descending=True, offset=page * size, limit=size)
+
+# ---------------- GATEKEEPER REVIEW ----------------
+# The review queue is the PENDING_REVIEW bucket of ITEM_INDEX, oldest first;
+# review_queue.ReviewQueue leases items out of it. A decision is one
+# batch_update of the item's status cells at the row read when it was leased,
+# written only while that row still holds the item in PENDING_REVIEW: a
+# compare-and-set on a database backend, a re-read of the row just before
+# the write on Google Sheets.
+
+REVIEW_STATUS = "PENDING_REVIEW"
+
+def pending_review_queue(limit=None):
+    # (pending total, [(row, item_id)] oldest first)
+    _ensure_item_index()
+    return ITEM_INDEX.count({"ITEM_STATUS": REVIEW_STATUS}), ITEM_INDEX.query({"ITEM_STATUS": REVIEW_STATUS}, limit=limit)
+
+def indexed_item(row_i, item_id):
+    # {column: value} from ITEM_INDEX if row_i still holds item_id
+    hit = ITEM_INDEX.get(row_i)
+    return hit[1] if hit and hit[0] == item_id else None
+
+def is_pending_review(row_i, item_id):
+    vals = indexed_item(row_i, item_id)
+    return bool(vals) and vals["ITEM_STATUS"] == REVIEW_STATUS
+
+def _check_review_row(row_i, item_id):
+    # (item row, still PENDING_REVIEW at row_i); one read. A row that moved
+    # or left review is fixed in ITEM_INDEX
+    rows, ok = _fetch_indexed_rows([(row_i, item_id)])
+
+    if not ok:
+        load_item_index()
+        return None, False
+
+    row = rows[0]
+    status = _col(row, _ITEM_COL, "ITEM_STATUS")
+
+    if status != REVIEW_STATUS:
+        # decided elsewhere (sheet edit / another process): fix the bucket
+        ITEM_INDEX.update(row_i, {"ITEM_STATUS": status})
+        return row, False
+
+    return row, True
+
+def read_review_item(row_i, item_id):
+    # (item row, [photos]) or None if the row moved or the item left review
+    row, ok = _check_review_row(row_i, item_id)
+    return (row, get_item_photos(item_id)) if ok else None
+
+def apply_review_decision(row_i, item_id, status, gatekeeper_id, reason="", row=None):
+    # row: the item row as shown to the gatekeeper, keeps the due index current.
+    # False (nothing written) if row_i no longer holds item_id in PENDING_REVIEW
+    updates = {
+        "ITEM_STATUS": status,
+        "LISTING_STATUS_REASON": reason,
+        "GATEKEEPER_ID": str(gatekeeper_id),
+        "LAST_UPDATED_AT": now_str(),
+    }
+
+    # the confirmation clock starts when the listing goes live, not at the draft
+    if status in ITEM_LIVE_STATUSES:
+        updates.update(confirm_window())
+
+    title, sheet_row = _item_location(row_i)
+    ws = items_tab_ws(title)
+    data = [
+        {"range": rowcol_to_a1(sheet_row, _ITEM_COL[k] + 1), "values": [[str(v)]]}
+        for k, v in updates.items()
+    ]
+
+    if hasattr(ws, "batch_update_if"):
+        checks = [
+            (sheet_row, _ITEM_COL["ITEM_ID"] + 1, item_id),
+            (sheet_row, _ITEM_COL["ITEM_STATUS"] + 1, REVIEW_STATUS),
+        ]
+        saved = ws.batch_update_if([(checks, data)])[0]
+        if not saved:
+            _check_review_row(row_i, item_id)
+    else:
+        saved = _check_review_row(row_i, item_id)[1]
+        if saved:
+            ws.batch_update(data)
+
+    if not saved:
+        print("[SHEETS DEBUG] REVIEW BLOCKED — no longer pending:", item_id)
+        return False
+
+    # also moves the item between ITEM_INDEX / REPORTS buckets
+    _index_item_cells([(row_i, k, v) for k, v in updates.items()])
+
+    if ITEM_DUE_INDEX.loaded and row:
+        merged = list(row) + [""] * (len(ITEMS_SCHEMA) - len(row))
+        for k, v in updates.items():
+            merged[_ITEM_COL[k]] = v
+        _index_item_row(row_i, merged)
+
+    return True
+
+# ---------------- REPORTS ----------------
+# REPORTS (report_stats.ReportStats) holds the REPORTS panel totals. Built
+# from one batch_get per tab of just the report columns (ITEMS_MASTER,
+# OWNERS_MASTER, ACTIVITY_LOG + its archive), kept current by create_item /
+# update_item_fields / update_item_cells / new owners / log_action, and
+# rebuilt after REPORTS_TTL seconds to pick up hand edits in the sheet.
+
+REPORTS = ReportStats()
+REPORTS_TTL = 6 * 3600
+
+def _read_columns(ws, schema, names):
+    # one batch_get of whole columns -> tuples of (names...) per data row, row 2 first
+    letters = [rowcol_to_a1(1, schema.index(n) + 1).rstrip("1") for n in names]
+    blocks = ws.batch_get([f"{c}2:{c}" for c in letters])
+    cols = [[r[0] if r else "" for r in block] for block in blocks]
+    return zip_longest(*cols, fillvalue="")
+
+def load_reports():
+    items = chain.from_iterable(
+        ((item_key(t, i), values) for i, values in enumerate(_read_columns(items_tab_ws(t), ITEMS_SCHEMA, REPORT_ITEM_COLUMNS), start=2))
+        for t in item_tab_titles()
+    )
+    owners = _read_columns(owners_ws(), OWNERS_SCHEMA, ["OWNER_ID", "CLAIMED_BY_FINDER_ID", "OWNER_STATUS"])
+    events = list(_read_columns(log_ws(), LOG_SCHEMA, ["TIMESTAMP", "USER_ID", "ACTION_TYPE"]))
+
+    # rows rotated out of ACTIVITY_LOG (local archive files, else the month tabs)
+    from log_archive import archived_events
+    events += archived_events()
+
+    # buffered events are not in the sheet yet
+    events += [(r[0], r[1], r[3]) for _, r in queued_log_rows()]
+
+    item_id_i = REPORT_ITEM_COLUMNS.index("ITEM_ID")
+
+    REPORTS.load(
+        (
+            (key, values[item_id_i], dict(zip(REPORT_ITEM_COLUMNS, values)))
+            for key, values in items
+            if values[item_id_i]
+        ),
+        owners,
+        events,
+    )
+    return len(REPORTS)
+
+def _ensure_reports():
+    if not REPORTS.loaded or REPORTS.age() > REPORTS_TTL:
+        load_reports()
+
+def report_summary():
+    # totals for the REPORTS panel; no sheet reads once loaded
+    _ensure_reports()
+    return REPORTS.summary()
+
+def report_day(day):
+    # day: "YYYY-MM-DD" (local time, as written in the sheets)
+    _ensure_reports()
+    return REPORTS.day(day)
+
+def validate_caption_vin(caption: str):
+    # first VIN-shaped token in the caption (same tokenizer as the item wizard)
+    return parse_caption(caption)["vin"]
+
+def structured_updates(rows, first_row=2, overwrite=False):
+    # re-parses RAW_CAPTION and decodes VIN_FULL of ITEMS_MASTER rows; returns
+    # the [(row_number, column, value)] cells that differ, for batch_update_cells.
+    # overwrite=False only fills empty cells (PARSE_CONFIDENCE is always kept current)
+    updates = []
+
+    for offset, r in enumerate(rows):
+        caption = _col(r, _ITEM_COL, "RAW_CAPTION")
+        vin = _col(r, _ITEM_COL, "VIN_FULL")
+
+        if not caption and not vin:
             continue
-        if worker_id and len(r) > 3 and r[3] != str(worker_id):
+
+        fields = {}
+
+        if caption:
+            parsed = parse_caption(caption)
+            fields = item_fields(parsed)
+
+            # VIN typed into the caption but never entered at the VIN step
+            if parsed["vin"] and not vin:
+                vin = parsed["vin"]
+                fields["VIN_FULL"] = vin
+                fields["VIN_LAST6"] = vin[-6:]
+
+        # a VIN with a valid check digit beats the caption for MAKE; its YEAR
+        # (empty when position 10 fits two cycles) only fills a row with none
+        decoded = vin_fields(vin)
+        if fields.get("YEAR") or _col(r, _ITEM_COL, "YEAR"):
+            decoded.pop("YEAR", None)
+        fields.update(decoded)
+
+        for field, value in fields.items():
+            current = _col(r, _ITEM_COL, field)
+            if current == value:
+                continue
+            if current and not overwrite and field != "PARSE_CONFIDENCE":
+                continue
+            updates.append((first_row + offset, field, value))
+
+    return updates
+
+def reparse_item_captions(overwrite=False):
+    # whole-tab re-parse: one read, one write. Like backfill.py it only fills
+    # empty cells unless overwrite, so hand corrections are kept
+    ws = items_ws()
+    updates = structured_updates(ws.get_all_values()[1:], overwrite=overwrite)
+    batch_update_cells(ws, ITEMS_SCHEMA, updates)
+    return updates
+
+# ---------------- BATCH WRITES ----------------
+
+def batch_update_cells(ws, schema, updates):
+    # updates: [(row_number, column_name, value)] written with one API call
+    col = {name: i + 1 for i, name in enumerate(schema)}
+
+    data = [
+        {"range": rowcol_to_a1(row_i, col[field]), "values": [[str(value)]]}
+        for row_i, field, value in updates
+        if field in col
+    ]
+
+    if data:
+        ws.batch_update(data)
+
+    return len(data)
+
+# ---------------- DUE-TIME INDEXES ----------------
+# In-memory heaps of what the scheduler must act on next. Built from one
+# read of each tab, then kept current by create_task / set_task_status /
+# set_task_last_reminder / create_item / update_item_fields, so a scheduler
+# tick only touches entries that are actually due.
+#   TASK_DUE_INDEX: TASK_ID -> next reminder time (local time)
+#   ITEM_DUE_INDEX: (STALE_WARNING|AUTO_HIDE, ITEM_ID) -> due time (UTC)
+
+TASK_DUE_INDEX = DueIndex()
+ITEM_DUE_INDEX = DueIndex()
+
+ITEM_CLOSED_STATUSES = {"SOLD", "HIDDEN"}
+
+# only listings buyers can see need availability confirmations; drafts and
+# items in review never get warned or auto-hidden
+ITEM_LIVE_STATUSES = {"PUBLISHED"}
+
+_TASK_COL = {name: i for i, name in enumerate(TASKS_SCHEMA)}
+_ITEM_COL = {name: i for i, name in enumerate(ITEMS_SCHEMA)}
+
+def _col(row, col, name):
+    i = col[name]
+    return row[i].strip() if len(row) > i and row[i] else ""
+
+def task_reminder_at(r):
+    if _col(r, _TASK_COL, "STATUS") != "OPEN":
+        return None
+
+    due = parse_ts(_col(r, _TASK_COL, "DUE_AT"))
+
+    if not due:
+        return None
+
+    try:
+        freq = int(_col(r, _TASK_COL, "REMINDER_FREQUENCY_MIN") or TASK_REMINDER_FREQUENCY_MIN)
+    except ValueError:
+        freq = TASK_REMINDER_FREQUENCY_MIN
+
+    last = parse_ts(_col(r, _TASK_COL, "LAST_REMINDER_SENT_AT"))
+
+    return max(due, last + timedelta(minutes=freq)) if last else due
+
+def _task_payload(row_i, r):
+    return {
+        "row": row_i,
+        "user": _col(r, _TASK_COL, "ASSIGNED_TO_USER_ID"),
+        "title": _col(r, _TASK_COL, "TITLE"),
+        "due_at": _col(r, _TASK_COL, "DUE_AT"),
+        "freq": _col(r, _TASK_COL, "REMINDER_FREQUENCY_MIN") or str(TASK_REMINDER_FREQUENCY_MIN),
+    }
+
+def item_due_events(r):
+    if _col(r, _ITEM_COL, "ITEM_STATUS") not in ITEM_LIVE_STATUSES:
+        return []
+
+    events = []
+    auto_hide = parse_ts(_col(r, _ITEM_COL, "AUTO_HIDE_AT"))
+    confirm_due = parse_ts(_col(r, _ITEM_COL, "NEXT_CONFIRM_DUE_AT"))
+
+    if confirm_due and not _col(r, _ITEM_COL, "STALE_WARNING_AT"):
+        events.append(("STALE_WARNING", confirm_due))
+
+    if auto_hide:
+        events.append(("AUTO_HIDE", auto_hide))
+
+    return events
+
+def _item_payload(row_i, r):
+    return {
+        "row": row_i,
+        "finder": _col(r, _ITEM_COL, "FINDER_WORKER_ID"),
+        "auto_hide_at": _col(r, _ITEM_COL, "AUTO_HIDE_AT"),
+    }
+
+def _index_task_row(row_i, r):
+    task_id = r[0]
+    when = task_reminder_at(r)
+
+    if when is None:
+        TASK_DUE_INDEX.remove(task_id)
+    else:
+        TASK_DUE_INDEX.set(task_id, when, _task_payload(row_i, r))
+
+def _index_item_row(row_i, r):
+    item_id = r[1]
+    events = dict(item_due_events(r))
+
+    for kind in ("STALE_WARNING", "AUTO_HIDE"):
+        if kind in events:
+            ITEM_DUE_INDEX.set((kind, item_id), events[kind], _item_payload(row_i, r))
+        else:
+            ITEM_DUE_INDEX.remove((kind, item_id))
+
+def confirm_window(now=None):
+    # the next availability deadlines (UTC, like create_item writes them);
+    # clearing STALE_WARNING_AT re-arms the warning
+    now = now or datetime.now(timezone.utc)
+    return {
+        "NEXT_CONFIRM_DUE_AT": (now + timedelta(days=DAYS_CONFIRM_WINDOW)).strftime(TS_FORMAT),
+        "AUTO_HIDE_AT": (now + timedelta(days=DAYS_AUTO_HIDE)).strftime(TS_FORMAT),
+        "STALE_WARNING_AT": "",
+    }
+
+def confirm_item_available(item_id, user_id=None):
+    # the finder says the truck is still for sale: both deadlines move forward.
+    # user_id limits it to the item's finder / seller (None: anyone, admins).
+    # Returns "OK", "NOT_FOUND", "NOT_LIVE" or "NOT_YOURS"
+    hit = ITEM_DUE_INDEX.get(("AUTO_HIDE", item_id))
+    row = None
+
+    # the due entry knows the row: one ranged read instead of the whole tab
+    if hit:
+        key = hit[1]["row"]
+        rows, ok = _fetch_indexed_rows([(key, item_id)])
+        row = rows[0] if ok else None
+
+    if row is None:
+        ws, _, row_i, row = get_item_row(item_id)
+        if not row_i:
+            return "NOT_FOUND"
+        key = item_key(ws.title, row_i)
+
+    if _col(row, _ITEM_COL, "ITEM_STATUS") not in ITEM_LIVE_STATUSES:
+        return "NOT_LIVE"
+
+    if user_id is not None and str(user_id) not in (
+        _col(row, _ITEM_COL, "FINDER_WORKER_ID"), _col(row, _ITEM_COL, "SELLER_WORKER_ID")
+    ):
+        return "NOT_YOURS"
+
+    updates = {
+        **confirm_window(),
+        "LAST_CONFIRMED_AVAILABLE_AT": datetime.now(timezone.utc).strftime(TS_FORMAT),
+        "LAST_UPDATED_AT": now_str(),
+    }
+    update_item_cells([(key, k, v) for k, v in updates.items()])
+
+    if ITEM_DUE_INDEX.loaded:
+        merged = list(row) + [""] * (len(ITEMS_SCHEMA) - len(row))
+        for k, v in updates.items():
+            merged[_ITEM_COL[k]] = v
+        _index_item_row(key, merged)
+
+    return "OK"
+
+def load_task_due_index():
+    # one read of TASKS_TODOS feeds both TASK_DUE_INDEX and TASK_INDEX
+    rows = tasks_ws().get_all_values()[1:]
+
+    entries = []
+    tasks = []
+    for row_i, r in enumerate(rows, start=2):
+        if not r or not r[0]:
             continue
-        out.append(r)
-        if len(out) >= limit:
-            break
+        when = task_reminder_at(r)
+        if when:
+            entries.append((r[0], when, _task_payload(row_i, r)))
+        tasks.append((row_i, r))
+
+    TASK_DUE_INDEX.load(entries)
+    _load_task_index(tasks)
+    return len(entries)
+
+def load_item_due_index():
+    rows = items_ws().get_all_values()[1:]
+
+    entries = []
+    for row_i, r in enumerate(rows, start=2):
+        for kind, when in (item_due_events(r) if len(r) > 1 else []):
+            entries.append(((kind, r[1]), when, _item_payload(row_i, r)))
+
+    ITEM_DUE_INDEX.load(entries)
+    return len(entries)
+
+def update_task_cells(updates):
+    return batch_update_cells(tasks_ws(), TASKS_SCHEMA, updates)
+
+def update_item_cells(updates):
+    # updates: [(index key, column, value)]; one batch_update per tab
+    written = sum(
+        batch_update_cells(items_tab_ws(title), ITEMS_SCHEMA, [(row_i, field, value) for row_i, (field, value) in rows])
+        for title, rows in _by_item_tab((key, (field, value)) for key, field, value in updates).items()
+    )
+
+    _index_item_cells(updates)
+
+    return written
+
+def _index_item_cells(updates):
+    # keep the in-memory indexes on the written values (status changes from
+    # the review panel / auto-hide)
+    changes = {}
+    for row_i, field, value in updates:
+        changes.setdefault(row_i, {})[field] = str(value)
+
+    for row_i, c in changes.items():
+        if ITEM_INDEX.loaded and any(k in ITEM_INDEX_COLUMNS for k in c):
+            ITEM_INDEX.update(row_i, c)
+        if REPORTS.loaded:
+            REPORTS.update_item(row_i, c)
+
+# ---------------- ITEM SHARDS ----------------
+# With ITEM_SHARD_BY set, shard_items() moves SOLD / HIDDEN items nobody
+# touched for ITEM_SHARD_AFTER_DAYS out of ITEMS_MASTER into
+#
+#   ITEMS_MASTER_<year of CREATED_AT>    (ITEM_SHARD_BY=YEAR)
+#   ITEMS_MASTER_<status>                (ITEM_SHARD_BY=STATUS)
+#
+# tabs with the same columns, so ITEMS_MASTER only holds the live stock.
+# Lookups by item (get_item_row, update_item_fields, query_items and
+# friends, REPORTS) cover the shards too. The in-memory indexes key an
+# ITEMS_MASTER row by its row number and a shard row by
+# shard number * SHARD_ROW_BASE + row (item_key / _item_location).
+# The newest ITEMS_MASTER row is never moved, so item ids keep counting.
+
+SHARD_ROW_BASE = 10_000_000
+_SHARD_PREFIX = WORKSHEET_ITEMS + "_"
+_SHARD_STATUSES = sorted(ITEM_CLOSED_STATUSES)
+_STATUS_SHARD_BASE = 20000          # shard numbers: 1 + year, or this + status position
+
+_ITEM_SHARDS = None                 # titles of the existing shard tabs
+
+def _is_shard_title(title):
+    suffix = title[len(_SHARD_PREFIX):] if title.startswith(_SHARD_PREFIX) else ""
+    return (len(suffix) == 4 and suffix.isdigit()) or suffix in _SHARD_STATUSES
+
+def _shard_number(title):
+    suffix = title[len(_SHARD_PREFIX):]
+    return 1 + int(suffix) if suffix.isdigit() else _STATUS_SHARD_BASE + _SHARD_STATUSES.index(suffix)
+
+def _shard_title(number):
+    if number >= _STATUS_SHARD_BASE:
+        return _SHARD_PREFIX + _SHARD_STATUSES[number - _STATUS_SHARD_BASE]
+    return f"{_SHARD_PREFIX}{number - 1:04d}"
+
+def item_shard_title(r):
+    # shard tab an ITEMS_MASTER row moves to
+    if ITEM_SHARD_BY == "STATUS":
+        return _SHARD_PREFIX + _col(r, _ITEM_COL, "ITEM_STATUS")
+    year = _col(r, _ITEM_COL, "CREATED_AT")[:4]
+    return _SHARD_PREFIX + (year if year.isdigit() else "0000")
+
+def item_key(title, row_i):
+    return row_i if title == WORKSHEET_ITEMS else _shard_number(title) * SHARD_ROW_BASE + row_i
+
+def _item_location(key):
+    # index key -> (tab title, row)
+    if key < SHARD_ROW_BASE:
+        return WORKSHEET_ITEMS, key
+    number, row_i = divmod(key, SHARD_ROW_BASE)
+    return _shard_title(number), row_i
+
+def _by_item_tab(keyed):
+    # [(index key, x)] -> {tab title: [(row, x)]}
+    out = {}
+    for key, x in keyed:
+        title, row_i = _item_location(key)
+        out.setdefault(title, []).append((row_i, x))
     return out
 
-def next_pending_review():
+def item_shard_titles(refresh=False):
+    # existing shard tabs, listed once (one read); none while ITEM_SHARD_BY is off
+    global _ITEM_SHARDS
+
+    if not ITEM_SHARD_BY:
+        return []
+
+    if _ITEM_SHARDS is None or refresh:
+        _ITEM_SHARDS = sorted(ws.title for ws in _spreadsheet().worksheets() if _is_shard_title(ws.title))
+
+    return _ITEM_SHARDS
+
+def item_tab_titles():
+    return [WORKSHEET_ITEMS] + item_shard_titles()
+
+def item_shard_ws(title):
+    return _get_ws(title, ITEMS_SCHEMA)
+
+def items_tab_ws(title):
+    return items_ws() if title == WORKSHEET_ITEMS else item_shard_ws(title)
+
+def _add_item_shard_ws(title, rows):
+    # creates the shard sized for rows (+ room to grow), header + rows in one append
+    ws = _spreadsheet().add_worksheet(title=title, rows=str(len(rows) + 1 + TAB_INITIAL_ROWS), cols=str(len(ITEMS_SCHEMA)))
+    ws.append_rows([ITEMS_SCHEMA] + rows)
+
+    _WS_CACHE[title] = ws
+    _ITEM_SHARDS.append(title)
+    _ITEM_SHARDS.sort()
+    return ws
+
+def _delete_item_rows(ws, rows):
+    # drops the given ITEMS_MASTER rows with one batch_update, bottom run first
+    runs = []
+    for row_i in sorted(rows, reverse=True):
+        if runs and runs[-1][0] == row_i + 1:
+            runs[-1][0] = row_i
+        else:
+            runs.append([row_i, row_i])
+
+    _spreadsheet().batch_update({"requests": [
+        {"deleteDimension": {"range": {
+            "sheetId": ws.id, "dimension": "ROWS", "startIndex": first - 1, "endIndex": last,
+        }}}
+        for first, last in runs
+    ]})
+    return len(runs)
+
+def shard_items(after_days=None, now=None):
+    # {"moved": n, "tabs": {title: n}}. Rows are copied first, deleted after;
+    # a run interrupted in between is safe to repeat (items already in the
+    # shard are not copied twice). Row numbers shift, so the item indexes are
+    # dropped and reload on next use; callers drop review leases.
+    if not ITEM_SHARD_BY:
+        return {"moved": 0, "tabs": {}}
+
+    after_days = ITEM_SHARD_AFTER_DAYS if after_days is None else after_days
+    cutoff = (now or now_local()) - timedelta(days=after_days)
+
     ws = items_ws()
-    rows = ws.get_all_values()[1:]
-    # oldest first
-    for r in rows:
-        if len(r) > 2 and r[2] == "PENDING_REVIEW":
-            return r
-    return None
+    last = rowcol_to_a1(1, len(ITEMS_SCHEMA)).rstrip("1")
+    rows = ws.batch_get([f"A2:{last}"])[0]
+    width = len(ITEMS_SCHEMA)
 
-def validate_caption_vin(caption: str):
-    # If vin present in caption in a simple way, you can improve later
-    # For now: extract any 17-alnum token
-    tokens = [t.strip().upper() for t in safe_text(caption).replace("\n", " ").split(" ")]
-    for t in tokens:
-        if is_vin_17(t):
-            return t
-    return ""
+    moving = {}
+    for row_i, r in enumerate(rows[:-1], start=2):
+        if len(r) < 2 or not r[1] or _col(r, _ITEM_COL, "ITEM_STATUS") not in ITEM_CLOSED_STATUSES:
+            continue
+        touched = parse_ts(_col(r, _ITEM_COL, "LAST_UPDATED_AT")) or parse_ts(_col(r, _ITEM_COL, "CREATED_AT"))
+        if touched and touched < cutoff:
+            moving.setdefault(item_shard_title(r), []).append((row_i, r[:width] + [""] * (width - len(r))))
+
+    if not moving:
+        return {"moved": 0, "tabs": {}}
+
+    existing = set(item_shard_titles(refresh=True))
+
+    for title, chunk in moving.items():
+        if title not in existing:
+            _add_item_shard_ws(title, [r for _, r in chunk])
+            continue
+
+        shard = item_shard_ws(title)
+        present = set(shard.col_values(2))
+        fresh = [r for _, r in chunk if r[1] not in present]
+        if fresh:
+            shard.append_rows(fresh)
+
+    _delete_item_rows(ws, [row_i for chunk in moving.values() for row_i, _ in chunk])
+
+    for index in (ITEM_INDEX, ITEM_DUE_INDEX, REPORTS):
+        index.loaded_at = None
+
+    stats = {title: len(chunk) for title, chunk in moving.items()}
+    return {"moved": sum(stats.values()), "tabs": stats}
+
+# ---------------- CAPACITY ----------------
+# Raw numbers for sheet_capacity: grid sizes of every tab and how many rows
+# are filled, two reads for the whole spreadsheet.
+
+def sheet_tabs():
+    # every worksheet (row_count / col_count = its grid), one read
+    return _spreadsheet().worksheets()
+
+def used_rows(titles):
+    # {title: rows with a value in column A, header included}, one read
+    titles = list(titles)
+    reply = _spreadsheet().values_batch_get([f"'{t}'!A:A" for t in titles])
+    return {t: len(v.get("values", [])) for t, v in zip(titles, reply.get("valueRanges", []))}
+
+# ---------------- DUPLICATE INDEX ----------------
+# Similarity index over TRUCK_INDEX for the ITEM_VIN step. Built from one
+# read, kept current by create_item / update_item_fields, and rebuilt after
+# DUP_INDEX_TTL seconds to pick up hand edits in the sheet.
+
+DUP_INDEX = DuplicateIndex()
+DUP_INDEX_TTL = 900
+
+_INDEX_COL = {name: i for i, name in enumerate(INDEX_SCHEMA)}
+
+def _dup_record_from_index(r, miles=""):
+    return dup_record(
+        vin=_col(r, _INDEX_COL, "VIN_FULL"),
+        last6=_col(r, _INDEX_COL, "VIN_LAST6"),
+        make=_col(r, _INDEX_COL, "MAKE"),
+        model=_col(r, _INDEX_COL, "MODEL"),
+        year=_col(r, _INDEX_COL, "YEAR"),
+        owner=_col(r, _INDEX_COL, "OWNER_ID"),
+        miles=miles,
+    )
+
+def load_duplicate_index(with_miles=False):
+    # with_miles also reads ITEMS_MASTER ITEM_ID / MILES (batch clustering);
+    # TRUCK_INDEX has no MILES column
+    rows = index_ws().get_all_values()[1:]
+    miles = {}
+
+    if with_miles:
+        id_col = rowcol_to_a1(1, _ITEM_COL["ITEM_ID"] + 1).rstrip("1")
+        miles_col = rowcol_to_a1(1, _ITEM_COL["MILES"] + 1).rstrip("1")
+        ids, values = items_ws().batch_get([f"{id_col}2:{id_col}", f"{miles_col}2:{miles_col}"])
+        values = list(values) + [[]] * (len(ids) - len(values))
+        miles = {i[0]: (m[0] if m else "") for i, m in zip(ids, values) if i}
+
+    DUP_INDEX.load(
+        (r[0], _dup_record_from_index(r, miles.get(r[0], "")))
+        for r in rows if r and r[0]
+    )
+    return len(DUP_INDEX)
+
+def duplicate_candidates(vin="", make="", year="", owner_id="", model="", exclude=None, limit=3):
+    # [{"item_id", "score", "reasons", "vin", "make", "model", "year", "owner"}] best first
+    if not DUP_INDEX.loaded or DUP_INDEX.age() > DUP_INDEX_TTL:
+        load_duplicate_index()
+
+    rec = dup_record(vin=vin, make=make, model=model, year=year, owner=owner_id)
+    out = []
+
+    for score, item_id, reasons in DUP_INDEX.candidates(rec, exclude=exclude, limit=limit):
+        out.append({"item_id": item_id, "score": score, "reasons": reasons, **DUP_INDEX.get(item_id)})
+
+    return out
 
 # ---------------- TASKS ----------------
 
+def fmt_task_id(n):
+    return f"TASK-{n:06d}"
+
 def next_task_id():
-    ws = tasks_ws()
-    count = len(ws.get_all_values())
-    return f"TASK-{count:06d}"
+    # past the last TASK_ID, never a reused one when rows were deleted
+    return fmt_task_id(_next_item_number(tasks_ws().col_values(1)))
+
+# ---------------- TASK INDEX ----------------
+# TASK_INDEX: open tasks per assignee (ItemIndex over ASSIGNED_TO_USER_ID /
+# STATUS) and _TASK_ROWS: TASK_ID -> sheet row, built by load_task_due_index.
+# Listing a user's open tasks or writing a task's status / reminder reads
+# just the rows involved instead of the whole tab.
+
+TASK_INDEX_COLUMNS = ["ASSIGNED_TO_USER_ID", "STATUS"]
+TASK_INDEX = ItemIndex(TASK_INDEX_COLUMNS)
+_TASK_ROWS = {}
+
+def _task_values(r):
+    return {c: _col(r, _TASK_COL, c) for c in TASK_INDEX_COLUMNS}
+
+def _load_task_index(tasks):
+    # tasks: [(row_i, row)]
+    global _TASK_ROWS
+
+    TASK_INDEX.load((row_i, r[0], _col(r, _TASK_COL, "CREATED_AT"), _task_values(r)) for row_i, r in tasks)
+    _TASK_ROWS = {r[0]: row_i for row_i, r in tasks}
+
+def _index_task(row_i, r):
+    if TASK_INDEX.loaded:
+        TASK_INDEX.set(row_i, r[0], _col(r, _TASK_COL, "CREATED_AT"), _task_values(r))
+        _TASK_ROWS[r[0]] = row_i
+
+def _ensure_task_index():
+    if not TASK_INDEX.loaded or TASK_INDEX.age() > ITEM_INDEX_TTL:
+        load_task_due_index()
+
+def _read_task_rows(row_numbers):
+    # full rows (padded to the schema), one batch_get
+    return tasks_repo().get(row_numbers)
+
+def _task_row(task_id):
+    # (row_i, row) of a task: one ranged read; the index is rebuilt once if
+    # the row moved (hand edit in the sheet). (None, None) if there is none
+    _ensure_task_index()
+
+    for attempt in range(2):
+        row_i = _TASK_ROWS.get(task_id)
+
+        if row_i:
+            r = _read_task_rows([row_i])[0]
+            if r[0] == task_id:
+                return row_i, r
+
+        if attempt == 0:
+            load_task_due_index()
+
+    return None, None
 
 def create_task(created_by, assigned_to, task_type, title, description, due_at, related_owner_id="", related_item_id=""):
     ws = tasks_ws()
-    task_id = next_task_id()
-    ws.append_row([
-        task_id,
+    row = [
+        "",
         now_str(),
         str(created_by),
         str(assigned_to),
@@ -717,97 +1920,213 @@ def create_task(created_by, assigned_to, task_type, title, description, due_at,
         "60",
         related_owner_id,
         related_item_id
-    ])
+    ]
+    row_i, (task_id,) = append_numbered_rows(ws, TASKS_SCHEMA, "TASK_ID", fmt_task_id, [row])
+
+    if TASK_DUE_INDEX.loaded:
+        _index_task_row(row_i, row)
+    _index_task(row_i, row)
+
     return task_id
 
 def open_tasks_for_user(user_id: str, limit=15):
-    ws = tasks_ws()
-    rows = ws.get_all_values()[1:]
-    out = []
-    for r in rows:
-        if len(r) > 8 and r[3] == str(user_id) and r[8] == "OPEN":
-            out.append(r)
-    return out[:limit]
+    # oldest first, from TASK_INDEX + one batch_get of those rows
+    _ensure_task_index()
+
+    hits = TASK_INDEX.query({"ASSIGNED_TO_USER_ID": str(user_id), "STATUS": "OPEN"}, limit=limit)
+    rows = _read_task_rows([row_i for row_i, _ in hits])
+
+    if all(r[0] == task_id for r, (_, task_id) in zip(rows, hits)):
+        return rows
+
+    # rows moved under the index: rebuild it and answer from the fresh read
+    load_task_due_index()
+    hits = TASK_INDEX.query({"ASSIGNED_TO_USER_ID": str(user_id), "STATUS": "OPEN"}, limit=limit)
+    return _read_task_rows([row_i for row_i, _ in hits])
+
+def _set_task_cell(task_id, column, value):
+    row_i, r = _task_row(task_id)
+    if not row_i:
+        return False
+
+    tasks_ws().update_cell(row_i, _TASK_COL[column] + 1, value)
+    r[_TASK_COL[column]] = value
+
+    _index_task(row_i, r)
+    if TASK_DUE_INDEX.loaded:
+        _index_task_row(row_i, r)
+
+    return True
 
 def set_task_status(task_id: str, status: str):
-    ws = tasks_ws()
-    rows = ws.get_all_values()
-    header = rows[0]
-    idx = {h: i+1 for i, h in enumerate(header)}
-    for i, r in enumerate(rows[1:], start=2):
-        if r and r[0] == task_id:
-            ws.update_cell(i, idx["STATUS"], status)
-            return True
-    return False
+    return _set_task_cell(task_id, "STATUS", status)
 
 def set_task_last_reminder(task_id: str):
-    ws = tasks_ws()
-    rows = ws.get_all_values()
-    header = rows[0]
-    idx = {h: i+1 for i, h in enumerate(header)}
-    for i, r in enumerate(rows[1:], start=2):
-        if r and r[0] == task_id:
-            ws.update_cell(i, idx["LAST_REMINDER_SENT_AT"], now_str())
-            return True
-    return False
+    return _set_task_cell(task_id, "LAST_REMINDER_SENT_AT", now_str())
 
-def approve_owner_submission(submission_id):
+# ---------------- OWNER SUBMISSIONS ----------------
 
-    ss = _client().open_by_key(SPREADSHEET_ID)
-    ws = ss.worksheet("OWNER_SUBMISSIONS")
+# serialises status checks so two admins can't approve the same submission
+_SUBMISSION_LOCK = threading.Lock()
 
-    rows = ws.get_all_values()
+def fmt_submission_id(n):
+    return f"SUB-{n:06d}"
 
-    for i, r in enumerate(rows[1:], start=2):
+def _submission_row_guess(submission_id: str):
+    # SUB-000007 is issued as the 7th data row -> sheet row 8
+    try:
+        return int(submission_id.split("-")[1]) + 1
+    except (IndexError, ValueError):
+        return None
 
+def find_owner_submission(submission_id: str):
+    # single-row read at the row the ID maps to; a lookup by ID if it moved
+    repo = submissions_repo()
+    row_i = _submission_row_guess(submission_id)
+
+    if row_i:
+        r = repo.get([row_i])[0]
         if r[0] == submission_id:
+            return repo.ws, row_i, r
+
+    row_i, r = repo.find(submission_id)
+    return repo.ws, row_i, r
+
+def _owner_row_from_submission(owner_id, r):
+    # r[5] contains the TELEGRAM photo file_id
+    return [
+        owner_id,
+        "Truck Owner",
+        r[6],
+        r[7],
+        r[8],
+        r[9],
+        r[10],
+        r[11],
+        r[12],
+        r[4],
+        r[5],   # store TELEGRAM file_id
+        r[1],
+        "APPROVED",
+        "ADMIN",
+        now_str(),
+        "",
+        "",
+        r[3]
+    ]
+
+def approve_owner_submission(submission_id):
+    # returns (owner_id, submitted_by), or False if missing / already processed
+    # (None stays free for run_sheet's "the call failed")
+
+    with _SUBMISSION_LOCK:
+
+        ws, row_i, r = find_owner_submission(submission_id)
+
+        if not row_i:
+            print("[SHEETS DEBUG] APPROVE FAILED — submission not found:", submission_id)
+            return False
+
+        status = r[13].strip().upper()
+
+        print("[SHEETS DEBUG] APPROVE CHECK:", submission_id, "STATUS:", status)
+
+        if status != "PENDING":
+            print("[SHEETS DEBUG] APPROVE BLOCKED — already processed")
+            return False
+
+        tail = owner_id_tail()
+        guess = fmt_owner_id(tail[0])
+
+        if not _claim_submissions(ws, [(row_i, _owner_note(guess))]):
+            print("[SHEETS DEBUG] APPROVE BLOCKED — claimed by another process")
+            return False
+
+        owner_id, = _approve_claimed(ws, [(row_i, guess)], [_owner_row_from_submission("", r)], tail)
+
+        return owner_id, r[1]
+
+# Every decision claims ADMIN_STATUS (PENDING -> APPROVED / REJECTED) before
+# acting on it, so two admins or two bot processes never both decide one
+# submission, and an approval claims it before the owner row exists (a retry
+# after a failed write finds it APPROVED, not PENDING). On a database backend
+# the claim is a compare-and-set under the tab's write lock. Google Sheets has
+# none: the claim's ADMIN_NOTES carries a per-call token and is read back,
+# and only the call whose token survived goes on.
+_STATUS_COL = rowcol_to_a1(1, SUB_COL_ADMIN_STATUS).rstrip("1")
+_NOTES_COL = rowcol_to_a1(1, SUB_COL_ADMIN_STATUS + 1).rstrip("1")
+
+def _owner_note(owner_id):
+    return f"OWNER {owner_id}"
+
+def _claim_submissions(ws, claims, status="APPROVED"):
+    # claims: [(row_number, ADMIN_NOTES)], each moved from PENDING to status.
+    # Returns the row numbers this call won
+    if hasattr(ws, "batch_update_if"):
+        done = ws.batch_update_if([
+            (
+                [(row_i, SUB_COL_ADMIN_STATUS, "PENDING")],
+                [{"range": f"{_STATUS_COL}{row_i}:{_NOTES_COL}{row_i}", "values": [[status, note]]}]
+            )
+            for row_i, note in claims
+        ])
+        return [row_i for (row_i, _), ok in zip(claims, done) if ok]
+
+    # one write, one read back
+    token = uuid.uuid4().hex[:8]
+    notes = {row_i: f"{note} #{token}" for row_i, note in claims}
 
-            status = r[13].strip().upper()
+    batch_update_cells(ws, SUBMISSIONS_SCHEMA, [
+        update
+        for row_i, note in notes.items()
+        for update in ((row_i, "ADMIN_STATUS", status), (row_i, "ADMIN_NOTES", note))
+    ])
 
-            print("[SHEETS DEBUG] APPROVE CHECK:", submission_id, "STATUS:", status)
+    won = []
+    rows = list(notes)
 
-            if status != "PENDING":
-                print("[SHEETS DEBUG] APPROVE BLOCKED — already processed")
-                return None
+    for start in range(0, len(rows), SUBMISSION_BATCH_GET_CHUNK):
+        chunk = rows[start:start + SUBMISSION_BATCH_GET_CHUNK]
+        blocks = ws.batch_get([f"{_STATUS_COL}{n}:{_NOTES_COL}{n}" for n in chunk])
 
-            # mark processing immediately
-            ws.update_cell(i, 13, "PROCESSING")
+        for n, block in zip(chunk, blocks):
+            cells = list(block[0]) if block and block[0] else []
+            if cells[1:2] == [notes[n]]:
+                won.append(n)
 
-            owner_id = next_owner_id()
+    return won
 
-            owners = owners_ws()
+def _settle_claims(ws, claims, owner_ids):
+    # claims: [(row_number, owner_id_guess)] in append order. Notes are
+    # rewritten only where the append moved the IDs
+    fixes = [
+        (row_i, "ADMIN_NOTES", _owner_note(owner_id))
+        for (row_i, guess), owner_id in zip(claims, owner_ids)
+        if owner_id != guess
+    ]
+    batch_update_cells(ws, SUBMISSIONS_SCHEMA, fixes)
 
-            # r[5] contains the TELEGRAM photo file_id
-            owners.append_row([
-                owner_id,
-                "Truck Owner",
-                r[6],
-                r[7],
-                r[8],
-                r[9],
-                r[10],
-                r[11],
-                r[12],
-                r[4],
-                r[5],   # store TELEGRAM file_id
-                r[1],
-                "APPROVED",
-                "ADMIN",
-                now_str(),
-                "",
-                "",
-                r[3]
-            ])
+def _release_claims(ws, rows):
+    # the owner append failed: back to PENDING so the admin can retry
+    batch_update_cells(ws, SUBMISSIONS_SCHEMA, [
+        update for row_i in rows
+        for update in ((row_i, "ADMIN_STATUS", "PENDING"), (row_i, "ADMIN_NOTES", ""))
+    ])
 
-            # finalize status
-            ws.update_cell(i, 13, "APPROVED")
+def _approve_claimed(ws, claims, owner_rows, tail):
+    # claims / owner_rows: the rows this call won, in the same order
+    try:
+        owner_ids = _append_owner_rows(owner_rows, tail)
+    except Exception:
+        _release_claims(ws, [row_i for row_i, _ in claims])
+        raise
 
-            return owner_id
+    _settle_claims(ws, claims, owner_ids)
+    return owner_ids
 
 def get_pending_owner_submissions():
 
-    ss = _client().open_by_key(SPREADSHEET_ID)
-    ws = ss.worksheet("OWNER_SUBMISSIONS")
+    ws = submissions_ws()
 
     rows = ws.get("A2:P")
 
@@ -833,30 +2152,124 @@ def get_pending_owner_submissions():
     return pending
 
 def reject_owner_submission(submission_id):
+    # returns (True, submitted_by), or False if missing / already processed;
+    # submitted_by may be empty
 
-    ss = _client().open_by_key(SPREADSHEET_ID)
-    ws = ss.worksheet("OWNER_SUBMISSIONS")
+    with _SUBMISSION_LOCK:
 
-    rows = ws.get_all_values()
+        ws, row_i, r = find_owner_submission(submission_id)
 
-    for i, r in enumerate(rows[1:], start=2):
+        if not row_i:
+            print("[SHEETS DEBUG] REJECT FAILED — submission not found:", submission_id)
+            return False
 
-        if r[0] == submission_id:
+        status = r[13].strip().upper()
 
-            status = r[13].strip().upper()
+        print("[SHEETS DEBUG] REJECT CHECK:", submission_id, "STATUS:", status)
 
-            print("[SHEETS DEBUG] REJECT CHECK:", submission_id, "STATUS:", status)
+        if status != "PENDING":
+            print("[SHEETS DEBUG] REJECT BLOCKED — already processed")
+            return False
 
-            if status != "PENDING":
-                print("[SHEETS DEBUG] REJECT BLOCKED — already processed")
-                return False
+        if not _claim_submissions(ws, [(row_i, "REJECTED")], "REJECTED"):
+            print("[SHEETS DEBUG] REJECT BLOCKED — claimed by another process")
+            return False
 
-            ws.update_cell(i, 13, "REJECTED")
+        print("[SHEETS DEBUG] REJECT SUCCESS:", submission_id)
 
-            print("[SHEETS DEBUG] REJECT SUCCESS:", submission_id)
+        return True, r[1]
 
-            return True
+# ---------------- BULK REVIEW ----------------
+# ranges per batch_get request, keeps the GET url well under Google's limit
+SUBMISSION_BATCH_GET_CHUNK = 200
+
+def find_owner_submissions(submission_ids):
+    # {submission_id: (row_number, row)} via batch_get of the guessed rows;
+    # one ID-column read only for IDs that are not where expected
+    ws = submissions_ws()
+    last_col = rowcol_to_a1(1, len(SUBMISSIONS_SCHEMA)).rstrip("1")
+    width = len(SUBMISSIONS_SCHEMA)
+
+    def fetch(targets):
+        out = {}
+        for start in range(0, len(targets), SUBMISSION_BATCH_GET_CHUNK):
+            chunk = targets[start:start + SUBMISSION_BATCH_GET_CHUNK]
+            blocks = ws.batch_get([f"A{n}:{last_col}{n}" for _, n in chunk])
+
+            for (sid, n), block in zip(chunk, blocks):
+                r = list(block[0]) if block and block[0] else []
+                if r and r[0] == sid:
+                    out[sid] = (n, r + [""] * (width - len(r)))
+        return out
+
+    wanted = list(dict.fromkeys(s for s in submission_ids if s))
+    guesses = [(sid, _submission_row_guess(sid)) for sid in wanted]
+
+    found = fetch([(sid, n) for sid, n in guesses if n])
+
+    missing = {sid for sid in wanted if sid not in found}
+
+    if missing:
+        ids = ws.col_values(1)
+        moved = [(v, i) for i, v in enumerate(ids[1:], start=2) if v in missing]
+        found.update(fetch(moved))
+
+    return ws, found
+
+def review_owner_submissions(submission_ids, decision):
+    # decision: APPROVED | REJECTED
+    # one batch_get (per 200 rows) to check status, one claim write + read
+    # back (see _claim_submissions), and for approvals one append_rows.
+    # returns {"done": [(submission_id, owner_id, submitted_by)], "skipped": [submission_id]}
+    decision = decision.upper()
+
+    if decision not in ("APPROVED", "REJECTED"):
+        raise ValueError(f"Unknown review decision: {decision}")
+
+    with _SUBMISSION_LOCK:
+
+        ws, found = find_owner_submissions(submission_ids)
+
+        skipped = []
+        pending = []
+
+        for sid in dict.fromkeys(submission_ids):
+
+            hit = found.get(sid)
+
+            if not hit or hit[1][13].strip().upper() != "PENDING":
+                skipped.append(sid)
+                continue
+
+            pending.append((sid, *hit))
+
+        if decision == "REJECTED" and pending:
+            won = set(_claim_submissions(ws, [(row_i, "REJECTED") for _, row_i, _ in pending], "REJECTED"))
+            skipped.extend(sid for sid, row_i, _ in pending if row_i not in won)
+            done = [(sid, "", r[1]) for sid, row_i, r in pending if row_i in won]
+
+        elif pending:
+            tail = owner_id_tail()
+            claims = [(row_i, fmt_owner_id(tail[0] + k)) for k, (_, row_i, _) in enumerate(pending)]
+
+            won = set(_claim_submissions(ws, [(row_i, _owner_note(guess)) for row_i, guess in claims]))
+            skipped.extend(sid for sid, row_i, _ in pending if row_i not in won)
+            pending = [p for p in pending if p[1] in won]
+
+            # the notes written for the rows still ours, in append order
+            guesses = dict(claims)
+            claims = [(row_i, guesses[row_i]) for _, row_i, _ in pending]
+
+            owner_ids = []
+            if pending:
+                owner_rows = [_owner_row_from_submission("", r) for _, _, r in pending]
+                owner_ids = _approve_claimed(ws, claims, owner_rows, tail)
+
+            done = [(sid, owner_id, r[1]) for (sid, _, r), owner_id in zip(pending, owner_ids)]
+
+        else:
+            done = []
 
-    print("[SHEETS DEBUG] REJECT FAILED — submission not found:", submission_id)
+        print("[SHEETS DEBUG] BULK REVIEW:", decision, "DONE:", len(done), "SKIPPED:", len(skipped))
 
-    return False
\ No newline at end of file
+        return {"done": done, "skipped": skipped}
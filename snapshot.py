@@ -0,0 +1,347 @@
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+from functools import partial
+
+from gspread.utils import rowcol_to_a1
+
+from config import SNAPSHOT_DIR
+from sheets_logger import (
+    items_ws, owners_ws, log_ws, tasks_ws, submissions_ws, item_photos_ws, index_ws,
+    item_shard_titles, item_shard_ws,
+    ITEMS_SCHEMA, OWNERS_SCHEMA, LOG_SCHEMA, TASKS_SCHEMA, SUBMISSIONS_SCHEMA,
+    ITEM_PHOTOS_SCHEMA, INDEX_SCHEMA
+)
+from utils import parse_ts
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:     # snapshots fall back to one gzip'd JSON file per column without pyarrow
+    pa = None
+    pq = None
+
+
+# ================================
+# COLUMNAR SNAPSHOTS
+# ================================
+# Offline copy of the spreadsheet for reports and ad-hoc analysis. Each tab
+# is read with one batch_get, typed per column and written as
+#
+#   <SNAPSHOT_DIR>/<TAB>/part-<first row>.parquet             (pyarrow installed)
+#   <SNAPSHOT_DIR>/<TAB>/part-<first row>.json/<COLUMN>.json.gz (fallback, a
+#                                                   file per column, so readers
+#                                                   only decode what they ask for)
+#
+# Append-only tabs (ACTIVITY_LOG, ITEM_PHOTOS) are exported incrementally:
+# only rows past the last export are read and written as a new part. The
+# last exported row is re-read with them. When it is no longer there,
+# log_archive has rotated rows off the top: the cursor follows the row's
+# content up the tab (the shift is kept as "rotated" in the manifest) and
+# the parts already written stay. Only if the row is gone altogether (edited
+# by hand) is the tab exported in full.
+#
+#   python snapshot.py                      # incremental
+#   python snapshot.py --full --tabs ITEMS_MASTER ACTIVITY_LOG
+#
+#   read_snapshot("ITEMS_MASTER")  -> {column: [typed values]}
+
+TABS = {
+    "ITEMS_MASTER": (items_ws, ITEMS_SCHEMA),
+    "OWNERS_MASTER": (owners_ws, OWNERS_SCHEMA),
+    "ACTIVITY_LOG": (log_ws, LOG_SCHEMA),
+    "TASKS_TODOS": (tasks_ws, TASKS_SCHEMA),
+    "OWNER_SUBMISSIONS": (submissions_ws, SUBMISSIONS_SCHEMA),
+    "ITEM_PHOTOS": (item_photos_ws, ITEM_PHOTOS_SCHEMA),
+    "TRUCK_INDEX": (index_ws, INDEX_SCHEMA),
+}
+
+APPEND_ONLY = {"ACTIVITY_LOG", "ITEM_PHOTOS"}
+
+
+def tab_sources():
+    # TABS plus the item shard tabs (ITEMS_MASTER_2025, ...) when items are sharded
+    return {**TABS, **{t: (partial(item_shard_ws, t), ITEMS_SCHEMA) for t in item_shard_titles()}}
+
+
+def _schema(tab):
+    return TABS[tab][1] if tab in TABS else ITEMS_SCHEMA
+
+# everything else stays a string (ids, phone numbers, VINs, free text)
+FLOAT_COLUMNS = {
+    "OWNER_PRICE", "LIST_PRICE", "COMMISSION_RATE", "COMMISSION_AMOUNT",
+    "SELLER_COMMISSION_AMOUNT", "NET_TO_OWNER", "SOLD_PRICE", "PARSE_CONFIDENCE",
+}
+INT_COLUMNS = {
+    "YEAR", "MILES", "PHOTO_COUNT", "BUYER_LEADS_COUNT", "ORDINAL", "WIDTH", "HEIGHT",
+    "ROW_NUMBER", "REMINDER_FREQUENCY_MIN",
+}
+
+MANIFEST = "manifest.json"
+FORMAT = "parquet" if pa is not None else "json"
+
+
+def column_type(name):
+    if name in FLOAT_COLUMNS:
+        return "float"
+    if name in INT_COLUMNS:
+        return "int"
+    if name == "TIMESTAMP" or name.endswith("_AT"):
+        return "timestamp"
+    return "string"
+
+
+def _number(value):
+    # "$45,000" / "45000.0" / "" -> 45000.0 / None
+    v = str(value or "").strip().replace("$", "").replace(",", "").replace(" ", "")
+
+    if not v:
+        return None
+
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+def _convert(kind, values):
+    if kind == "float":
+        return [_number(v) for v in values]
+
+    if kind == "int":
+        out = []
+        for v in values:
+            n = _number(v)
+            out.append(int(n) if n is not None else None)
+        return out
+
+    if kind == "timestamp":
+        return [parse_ts(v) for v in values]
+
+    return [v or "" for v in values]
+
+
+def to_columns(schema, rows):
+    # sheet rows -> {column: [typed values]}
+    width = len(schema)
+    padded = [r[:width] + [""] * (width - len(r)) for r in rows]
+    raw = list(zip(*padded)) if padded else [()] * width
+
+    return {name: _convert(column_type(name), list(col)) for name, col in zip(schema, raw)}
+
+
+# ---------------- FILES ----------------
+
+def _arrow_schema(schema):
+    types = {"float": pa.float64(), "int": pa.int64(), "timestamp": pa.timestamp("s"), "string": pa.string()}
+    return pa.schema([(name, types[column_type(name)]) for name in schema])
+
+
+def write_part(path, schema, columns):
+    tmp = path + ".tmp"
+
+    if pa is not None:
+        pq.write_table(pa.table(columns, schema=_arrow_schema(schema)), tmp, compression="zstd")
+    else:
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        for name, col in columns.items():
+            if column_type(name) == "timestamp":
+                # datetime str() is "YYYY-MM-DD HH:MM:SS", which parse_ts reads back
+                col = [str(v) if v is not None else None for v in col]
+            with gzip.open(os.path.join(tmp, f"{name}.json.gz"), "wb", compresslevel=5) as fh:
+                fh.write(json.dumps(col, separators=(",", ":")).encode("utf-8"))
+
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+
+    os.replace(tmp, path)
+
+
+def _read_json_column(path, name):
+    try:
+        with gzip.open(os.path.join(path, f"{name}.json.gz"), "rb") as fh:
+            return json.loads(fh.read())
+    except FileNotFoundError:
+        return []
+
+
+def read_part(path, columns):
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns).to_pydict()
+
+    if os.path.isdir(path):
+        encoded = {name: _read_json_column(path, name) for name in columns}
+    else:
+        # single-file parts written before the per-column layout
+        with gzip.open(path, "rb") as fh:
+            encoded = json.loads(fh.read())
+
+    return {
+        name: [parse_ts(v) for v in encoded.get(name, [])] if column_type(name) == "timestamp" else encoded.get(name, [])
+        for name in columns
+    }
+
+
+def _parts(out_dir, tab):
+    folder = os.path.join(out_dir, tab)
+
+    if not os.path.isdir(folder):
+        return []
+
+    return sorted(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if f.startswith("part-") and f.endswith((".parquet", ".json", ".json.gz"))
+    )
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+# ---------------- EXPORT ----------------
+
+def _last_col(schema):
+    return rowcol_to_a1(1, len(schema)).rstrip("1")
+
+
+def _find_row(rows, row):
+    # index of the last of rows starting with row, else None
+    for i in range(len(rows) - 1, -1, -1):
+        if rows[i][:len(row)] == row:
+            return i
+    return None
+
+
+def _append_part(folder, schema, state, last_at, rows):
+    # rows: what follows the last exported row, which now sits at row last_at
+    first = last_at + 1
+
+    if rows:
+        write_part(os.path.join(folder, f"part-{state['rows'] + 2:09d}.{FORMAT}"), schema, to_columns(schema, rows))
+
+    return {
+        **state,
+        "rows": state["rows"] + len(rows),
+        "next_row": first + len(rows),
+        "rotated": state.get("rotated", 0) + state["next_row"] - first,
+        "last_row": (rows[-1] if rows else state["last_row"]),
+        "exported_at": time.time(),
+    }, len(rows)
+
+
+def _export_tab(tab, out_dir, state, full, sources):
+    ws_fn, schema = sources[tab]
+    ws = ws_fn()
+    last = _last_col(schema)
+    folder = os.path.join(out_dir, tab)
+
+    incremental = tab in APPEND_ONLY and not full and state.get("format") == FORMAT and state.get("next_row", 2) > 2
+
+    if incremental:
+        # re-read the last exported row to make sure nothing above it moved
+        start = state["next_row"] - 1
+        block = ws.batch_get([f"A{start}:{last}"])[0]
+        width = len(state["last_row"])
+
+        if block and block[0][:width] == state["last_row"]:
+            return _append_part(folder, schema, state, start, block[1:])
+
+        # rows deleted from the top: find the last exported row higher up
+        rows = ws.batch_get([f"A2:{last}"])[0]
+        anchor = _find_row(rows[:start - 1], state["last_row"])
+
+        if anchor is not None:
+            print(f"[SNAPSHOT] {tab}: {start - anchor - 2} rows rotated out since the last export")
+            return _append_part(folder, schema, state, anchor + 2, rows[anchor + 1:])
+
+        print(f"[SNAPSHOT] {tab}: last exported row not found, exporting in full")
+
+    else:
+        rows = ws.batch_get([f"A2:{last}"])[0]
+
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder, exist_ok=True)
+    write_part(os.path.join(folder, f"part-{2:09d}.{FORMAT}"), schema, to_columns(schema, rows))
+
+    return {
+        "format": FORMAT,
+        "rows": len(rows),
+        "next_row": 2 + len(rows),
+        "last_row": rows[-1] if rows else [],
+        "exported_at": time.time(),
+    }, len(rows)
+
+
+def export_snapshot(tabs=None, out_dir=None, full=False):
+    # {tab: rows written this run}; one batch_get per tab
+    out_dir = out_dir or SNAPSHOT_DIR
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest = load_manifest(out_dir)
+    sources = tab_sources()
+    stats = {}
+
+    for tab in tabs or sources:
+        manifest[tab], stats[tab] = _export_tab(tab, out_dir, manifest.get(tab, {}), full, sources)
+        save_manifest(out_dir, manifest)
+
+    return stats
+
+
+def read_snapshot(tab, out_dir=None, columns=None):
+    # {column: [typed values]} across all parts, in sheet order; only the
+    # requested columns are decoded
+    out_dir = out_dir or SNAPSHOT_DIR
+    columns = list(columns or _schema(tab))
+    out = {name: [] for name in columns}
+
+    for path in _parts(out_dir, tab):
+        part = read_part(path, columns)
+        for name in columns:
+            out[name].extend(part.get(name, []))
+
+    return out
+
+
+def read_table(tab, out_dir=None, columns=None):
+    # pyarrow.Table of the whole tab (requires pyarrow)
+    if pa is None:
+        raise RuntimeError("pyarrow is not installed; use read_snapshot()")
+
+    parts = [pq.read_table(p, columns=columns) for p in _parts(out_dir or SNAPSHOT_DIR, tab)]
+    return pa.concat_tables(parts) if parts else _arrow_schema(_schema(tab)).empty_table()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the spreadsheet tabs to columnar snapshot files")
+    parser.add_argument("--out", default=SNAPSHOT_DIR)
+    parser.add_argument("--tabs", nargs="+", help=f"default: {' '.join(TABS)} + item shards")
+    parser.add_argument("--full", action="store_true", help="re-export append-only tabs from the top")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    stats = export_snapshot(args.tabs, args.out, args.full)
+
+    print(json.dumps({"format": FORMAT, "seconds": round(time.perf_counter() - t0, 2), "rows": stats}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
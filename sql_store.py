@@ -0,0 +1,689 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from gspread.exceptions import WorksheetNotFound, GSpreadException
+from gspread.utils import a1_range_to_grid_range, rowcol_to_a1
+
+from local_db import open_db
+
+try:
+    import psycopg
+except ImportError:     # only needed for STORAGE_BACKEND=postgres
+    psycopg = None
+
+
+# ================================
+# SQL GRID STORE
+# ================================
+# The spreadsheet, kept in SQLite or PostgreSQL. sheets_logger / users /
+# backfill / log_archive address rows by sheet row number everywhere (item
+# indexes, due heaps, review leases), so this store keeps the same shape:
+# tabs of numbered rows, served through the gspread calls they already
+# make (open_by_key, worksheet, batch_get, append_rows, batch_update, ...).
+#
+#   grid_tabs     one row per tab: grid size, a version bumped by every write
+#                 and the version of the last row delete / resize (layout)
+#   <entity>      tabs of a registered EntityTable (items, owners, users, ...,
+#                 see repositories.py): (sheet_id, row_no) -> one TEXT column
+#                 per schema column, indexed on the lookup columns, so
+#                 find_rows / rows_at answer with the matching rows only
+#   grid_rows     any other tab: (sheet_id, row_no) -> cells as a JSON list
+#   mirror_queue  writes waiting to be replayed on Google Sheets (storage.py)
+#
+# Every row carries the version that last wrote it. Writes touch only their
+# rows. Whole-tab reads (get_all_values, get, ...) load the tab into memory
+# once and then compare its version first (one indexed lookup): writes from
+# another bot process sharing the database are picked up by reading just the
+# rows stamped with a newer version; only a delete / resize since then (rows
+# shifted) reloads the whole tab.
+#
+#   client = SqlClient(SqlDb("vp_store.sqlite3"), tables=repositories.entity_tables())
+#   ws = client.open_by_key(SPREADSHEET_ID).worksheet("ITEMS_MASTER")
+
+_SCHEMA = {
+    "sqlite": [
+        """CREATE TABLE IF NOT EXISTS grid_tabs (
+            spreadsheet TEXT NOT NULL,
+            title       TEXT NOT NULL,
+            sheet_id    INTEGER NOT NULL UNIQUE,
+            row_count   INTEGER NOT NULL,
+            col_count   INTEGER NOT NULL,
+            version     INTEGER NOT NULL DEFAULT 0,
+            layout      INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (spreadsheet, title)
+        )""",
+        """CREATE TABLE IF NOT EXISTS grid_rows (
+            sheet_id INTEGER NOT NULL,
+            row_no   INTEGER NOT NULL,
+            cells    TEXT NOT NULL,
+            version  INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (sheet_id, row_no)
+        )""",
+        "CREATE INDEX IF NOT EXISTS grid_rows_version ON grid_rows (sheet_id, version)",
+        """CREATE TABLE IF NOT EXISTS mirror_queue (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            spreadsheet TEXT NOT NULL,
+            title       TEXT NOT NULL,
+            op          TEXT NOT NULL,
+            args        TEXT NOT NULL,
+            queued_at   REAL NOT NULL
+        )""",
+    ],
+    "postgres": [
+        """CREATE TABLE IF NOT EXISTS grid_tabs (
+            spreadsheet TEXT NOT NULL,
+            title       TEXT NOT NULL,
+            sheet_id    INTEGER NOT NULL UNIQUE,
+            row_count   INTEGER NOT NULL,
+            col_count   INTEGER NOT NULL,
+            version     BIGINT NOT NULL DEFAULT 0,
+            layout      BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (spreadsheet, title)
+        )""",
+        """CREATE TABLE IF NOT EXISTS grid_rows (
+            sheet_id INTEGER NOT NULL,
+            row_no   INTEGER NOT NULL,
+            cells    TEXT NOT NULL,
+            version  BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (sheet_id, row_no)
+        )""",
+        "CREATE INDEX IF NOT EXISTS grid_rows_version ON grid_rows (sheet_id, version)",
+        """CREATE TABLE IF NOT EXISTS mirror_queue (
+            id          BIGSERIAL PRIMARY KEY,
+            spreadsheet TEXT NOT NULL,
+            title       TEXT NOT NULL,
+            op          TEXT NOT NULL,
+            args        TEXT NOT NULL,
+            queued_at   DOUBLE PRECISION NOT NULL
+        )""",
+    ],
+}
+
+
+class SqlDb:
+    # one connection shared by the event loop and the run_sheet threads
+
+    def __init__(self, dsn, kind="sqlite"):
+        self.kind = kind
+        self._lock = threading.RLock()
+        self._depth = 0
+
+        if kind == "postgres":
+            if psycopg is None:
+                raise RuntimeError("STORAGE_BACKEND=postgres needs psycopg (pip install psycopg)")
+            self._conn = psycopg.connect(dsn, autocommit=True)
+        else:
+            self._conn = open_db(dsn)
+
+        for stmt in _SCHEMA[kind]:
+            self._conn.execute(stmt)
+
+    @property
+    def for_update(self):
+        # row lock for read-modify-write (SQLite locks the file on BEGIN IMMEDIATE)
+        return " FOR UPDATE" if self.kind == "postgres" else ""
+
+    def _sql(self, sql):
+        return sql.replace("?", "%s") if self.kind == "postgres" else sql
+
+    def execute(self, sql, params=()):
+        with self._lock:
+            self._conn.execute(self._sql(sql), params)
+
+    def executemany(self, sql, seq):
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.executemany(self._sql(sql), seq)
+
+    def all(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(self._sql(sql), params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            self._depth = 1
+            try:
+                if self.kind == "postgres":
+                    with self._conn.transaction():
+                        yield
+                else:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        yield
+                    except BaseException:
+                        self._conn.execute("ROLLBACK")
+                        raise
+                    self._conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+
+def _grid(range_name):
+    # "A2:C" / "'TAB'!A:A" -> (row1, col1, row2, col2), 1-based, None = open-ended
+    if "!" in range_name:
+        range_name = range_name.rsplit("!", 1)[1]
+
+    g = a1_range_to_grid_range(range_name.replace("$", ""))
+    return (
+        g.get("startRowIndex", 0) + 1,
+        g.get("startColumnIndex", 0) + 1,
+        g.get("endRowIndex"),
+        g.get("endColumnIndex"),
+    )
+
+
+def _trim(row):
+    row = ["" if v is None else str(v) for v in row]
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+# ---------------- ROW STORAGE ----------------
+# Where a tab's rows live: the JSON cells of grid_rows, or an EntityTable
+# with one column per schema column (cells past the schema go to "extra").
+
+# SQLite caps host parameters per statement (999 on older builds)
+_IN_CHUNK = 500
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class GridRows:
+    table = "grid_rows"
+    columns = ["cells"]
+
+    def encode(self, cells):
+        return [json.dumps(cells)]
+
+    def decode(self, values):
+        return json.loads(values[0])
+
+    def column(self, col):
+        return None
+
+
+GRID_ROWS = GridRows()
+
+
+class EntityTable:
+
+    def __init__(self, table, schema, indexes=(), titles=()):
+        # titles: the tab titles stored here, or a predicate on the title
+        self.table = table
+        self.schema = list(schema)
+        self.indexes = list(indexes)
+        self.titles = titles
+        self.columns = [_quote(c) for c in self.schema] + ["extra"]
+
+    def matches(self, title):
+        return self.titles(title) if callable(self.titles) else title in self.titles
+
+    def ddl(self, kind):
+        version = "BIGINT" if kind == "postgres" else "INTEGER"
+        cols = ", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in self.columns)
+        return [
+            f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                sheet_id INTEGER NOT NULL,
+                row_no   INTEGER NOT NULL,
+                version  {version} NOT NULL DEFAULT 0,
+                {cols},
+                PRIMARY KEY (sheet_id, row_no)
+            )""",
+            f"CREATE INDEX IF NOT EXISTS {self.table}_version ON {self.table} (sheet_id, version)",
+        ] + [
+            f"CREATE INDEX IF NOT EXISTS {self.table}_{name.lower()} ON {self.table} (sheet_id, {_quote(name)}, row_no)"
+            for name in self.indexes
+        ]
+
+    def encode(self, cells):
+        n = len(self.schema)
+        return cells[:n] + [""] * (n - len(cells)) + [json.dumps(cells[n:]) if len(cells) > n else ""]
+
+    def decode(self, values):
+        cells = ["" if v is None else v for v in values[:-1]]
+        if values[-1]:
+            cells += json.loads(values[-1])
+        return _trim(cells)
+
+    def column(self, col):
+        # SQL column of a 1-based sheet column, None past the schema
+        return self.columns[col - 1] if 1 <= col <= len(self.schema) else None
+
+
+class SqlClient:
+
+    def __init__(self, db, mirror=False, tables=()):
+        self.db = db
+        self.mirror = mirror            # queue every write for storage.flush_mirror
+        self.tables = list(tables)      # EntityTables; other tabs go to grid_rows
+        self._spreadsheets = {}
+        self._lock = threading.Lock()
+
+        for table in self.tables:
+            for stmt in table.ddl(db.kind):
+                db.execute(stmt)
+
+    def rows_for(self, title):
+        return next((t for t in self.tables if t.matches(title)), GRID_ROWS)
+
+    def open_by_key(self, key):
+        with self._lock:
+            if key not in self._spreadsheets:
+                self._spreadsheets[key] = SqlSpreadsheet(self, key)
+            return self._spreadsheets[key]
+
+
+class SqlSpreadsheet:
+
+    def __init__(self, client, key):
+        self.client = client
+        self.id = key
+        self._tabs = {}                 # title -> SqlWorksheet (keeps its rows cached)
+        self._lock = threading.Lock()
+
+    @property
+    def _db(self):
+        return self.client.db
+
+    def _handle(self, title, sheet_id, rows, cols):
+        with self._lock:
+            ws = self._tabs.get(title)
+            if ws is None or ws.id != sheet_id:
+                ws = self._tabs[title] = SqlWorksheet(self, title, sheet_id, rows, cols)
+            return ws
+
+    def worksheet(self, title):
+        found = self._db.all(
+            "SELECT sheet_id, row_count, col_count FROM grid_tabs WHERE spreadsheet = ? AND title = ?",
+            (self.id, title)
+        )
+        if not found:
+            raise WorksheetNotFound(title)
+        return self._handle(title, *found[0])
+
+    def worksheets(self):
+        rows = self._db.all(
+            "SELECT title, sheet_id, row_count, col_count FROM grid_tabs WHERE spreadsheet = ? ORDER BY sheet_id",
+            (self.id,)
+        )
+        return [self._handle(*r) for r in rows]
+
+    def add_worksheet(self, title, rows=1000, cols=26, index=None):
+        with self._db.transaction():
+            if self._db.all("SELECT 1 FROM grid_tabs WHERE spreadsheet = ? AND title = ?", (self.id, title)):
+                raise GSpreadException(f'A sheet with the name "{title}" already exists')
+
+            sheet_id = self._db.all("SELECT COALESCE(MAX(sheet_id), 0) + 1 FROM grid_tabs")[0][0]
+            self._db.execute(
+                "INSERT INTO grid_tabs (spreadsheet, title, sheet_id, row_count, col_count, version) VALUES (?, ?, ?, ?, ?, 0)",
+                (self.id, title, sheet_id, int(rows), int(cols))
+            )
+            queue_mirror(self, title, "add_worksheet", [int(rows), int(cols)])
+
+        ws = self._handle(title, sheet_id, int(rows), int(cols))
+        ws._rows, ws._version = [], 0
+        return ws
+
+    def del_worksheet(self, ws):
+        with self._db.transaction():
+            self._db.execute(f"DELETE FROM {self.client.rows_for(ws.title).table} WHERE sheet_id = ?", (ws.id,))
+            self._db.execute("DELETE FROM grid_tabs WHERE sheet_id = ?", (ws.id,))
+            queue_mirror(self, ws.title, "del_worksheet", [])
+
+        with self._lock:
+            self._tabs.pop(ws.title, None)
+
+    def values_batch_get(self, ranges, params=None):
+        out = []
+
+        for rng in ranges:
+            title = rng.rsplit("!", 1)[0].strip("'") if "!" in rng else self.worksheets()[0].title
+            out.append({"range": rng, "majorDimension": "ROWS", "values": self.worksheet(title).get(rng)})
+
+        return {"spreadsheetId": self.id, "valueRanges": out}
+
+    def batch_update(self, body):
+        # deleteDimension (ROWS) requests only, applied in order
+        by_id = {ws.id: ws for ws in self.worksheets()}
+
+        for request in body.get("requests", []):
+            rng = request["deleteDimension"]["range"]
+            by_id[rng["sheetId"]].delete_rows(rng["startIndex"] + 1, rng["endIndex"])
+
+        return {"spreadsheetId": self.id, "replies": [{} for _ in body.get("requests", [])]}
+
+
+def queue_mirror(spreadsheet, title, op, args):
+    # inside the write's transaction: the mirror sees exactly the committed writes
+    if spreadsheet.client.mirror:
+        spreadsheet.client.db.execute(
+            "INSERT INTO mirror_queue (spreadsheet, title, op, args, queued_at) VALUES (?, ?, ?, ?, ?)",
+            (spreadsheet.id, title, op, json.dumps(args), time.time())
+        )
+
+
+class SqlWorksheet:
+
+    def __init__(self, spreadsheet, title, sheet_id, rows, cols):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self._store = spreadsheet.client.rows_for(title)
+        self._rows = None               # loaded by the first whole-tab read
+        self._version = None
+        self._layout = 0
+
+    @property
+    def client(self):
+        return self.spreadsheet.client
+
+    @property
+    def _db(self):
+        return self.spreadsheet.client.db
+
+    # ---------------- SYNC ----------------
+
+    def _select(self, where="", params=(), order="", limit=None):
+        store = self._store
+        rows = self._db.all(
+            f"SELECT row_no, {', '.join(store.columns)} FROM {store.table} WHERE sheet_id = ?{where}"
+            f" ORDER BY row_no{order}" + (f" LIMIT {int(limit)}" if limit else ""),
+            (self.id, *params)
+        )
+        return [(r[0], store.decode(r[1:])) for r in rows]
+
+    def _load(self):
+        rows = []
+        for row_no, cells in self._select():
+            while len(rows) < row_no - 1:
+                rows.append([])
+            rows.append(cells)
+        self._rows = rows
+
+    def _sync(self, lock=False):
+        found = self._db.all(
+            "SELECT version, layout, row_count, col_count FROM grid_tabs WHERE sheet_id = ?"
+            + (self._db.for_update if lock else ""),
+            (self.id,)
+        )
+        if not found:
+            raise WorksheetNotFound(self.title)
+
+        version, self._layout, self.row_count, self.col_count = found[0]
+
+        if self._rows is not None:
+            if self._layout > self._version:
+                self._load()
+            elif version != self._version:
+                # another process wrote: only the rows it stamped
+                for row_no, cells in self._select(" AND version > ?", (self._version,)):
+                    self._ensure(row_no, 0)
+                    self._rows[row_no - 1] = cells
+
+        self._version = version
+
+    def _cached(self):
+        # whole-tab reads: the tab in memory, current
+        self._sync()
+        if self._rows is None:
+            self._load()
+        return self._rows
+
+    @contextmanager
+    def _writing(self, op, args, layout=False):
+        # layout: the write shifts or drops rows, other processes reload the tab
+        with self._db.transaction():
+            try:
+                self._sync(lock=True)
+                self._version += 1
+                yield
+                self._db.execute(
+                    "UPDATE grid_tabs SET version = ?, layout = ?, row_count = ?, col_count = ? WHERE sheet_id = ?",
+                    (self._version, self._version if layout else self._layout, self.row_count, self.col_count, self.id)
+                )
+                queue_mirror(self.spreadsheet, self.title, op, args)
+            except BaseException:
+                self._rows = None       # rolled back: reload on next use
+                raise
+
+    def _fetch(self, row_numbers):
+        # {row_no: cells} of some rows, from memory or just those rows
+        wanted = sorted(set(row_numbers))
+
+        if self._rows is not None:
+            return {n: list(self._rows[n - 1]) if n <= len(self._rows) else [] for n in wanted}
+
+        out = {n: [] for n in wanted}
+        for start in range(0, len(wanted), _IN_CHUNK):
+            chunk = wanted[start:start + _IN_CHUNK]
+            out.update(self._select(f" AND row_no IN ({','.join('?' * len(chunk))})", chunk))
+        return out
+
+    def _last_row(self):
+        if self._rows is not None:
+            return len(self._rows)
+        return self._db.all(
+            f"SELECT COALESCE(MAX(row_no), 0) FROM {self._store.table} WHERE sheet_id = ?", (self.id,)
+        )[0][0]
+
+    def _put(self, rows):
+        # {row_no: cells} written at this write's version (and into memory)
+        if self._rows is not None:
+            for n, cells in rows.items():
+                self._ensure(n, 0)
+                self._rows[n - 1] = cells
+
+        store = self._store
+        cols = ", ".join(store.columns)
+        self._db.executemany(
+            f"""
+            INSERT INTO {store.table} (sheet_id, row_no, version, {cols}) VALUES (?, ?, ?, {', '.join('?' * len(store.columns))})
+            ON CONFLICT (sheet_id, row_no) DO UPDATE SET version = excluded.version,
+                {', '.join(f'{c} = excluded.{c}' for c in store.columns)}
+            """,
+            [(self.id, n, self._version, *store.encode(_trim(rows[n]))) for n in sorted(rows)]
+        )
+
+    def _ensure(self, row, col):
+        while len(self._rows) < row:
+            self._rows.append([])
+
+        r = self._rows[row - 1]
+        while len(r) < col:
+            r.append("")
+        return r
+
+    def _slice(self, r1, c1, r2, c2):
+        rows = self._cached()
+        r2 = r2 or len(rows)
+        out = []
+
+        for r in rows[r1 - 1:r2]:
+            part = r[c1 - 1:c2] if c2 else r[c1 - 1:]
+            while part and part[-1] == "":
+                part = part[:-1]
+            out.append(list(part))
+
+        while out and not out[-1]:
+            out.pop()
+
+        return out
+
+    # ---------------- READS ----------------
+
+    def row_values(self, row):
+        self._sync()
+        if self._rows is None:
+            return self._fetch([row])[row]
+        out = self._slice(row, 1, row, None)
+        return out[0] if out else []
+
+    def col_values(self, col):
+        out = [r[col - 1] if len(r) >= col else "" for r in self._cached()]
+        while out and out[-1] == "":
+            out.pop()
+        return out
+
+    def get_all_values(self):
+        rows = self._cached()
+        width = max((len(r) for r in rows), default=0)
+        return [list(r) + [""] * (width - len(r)) for r in rows]
+
+    def get(self, range_name=None):
+        if range_name is None:
+            return self._slice(1, 1, None, None)
+        return self._slice(*_grid(range_name))
+
+    def batch_get(self, ranges):
+        return [self._slice(*_grid(rng)) for rng in ranges]
+
+    # ---------------- QUERIES ----------------
+    # Not gspread: repositories.SqlRepository uses them when the worksheet
+    # has them. On an entity tab they read only the matching rows.
+
+    def rows_at(self, row_numbers):
+        # [cells] of the given rows, in order ([] for an empty row)
+        self._sync()
+        rows = self._fetch(row_numbers)
+        return [_trim(rows[n]) for n in row_numbers]
+
+    def find_rows(self, col, value, start=2, limit=None, newest_first=False):
+        # [(row_no, cells)] whose 1-based column col holds value, from row start
+        value = str(value)
+        column = self._store.column(col)
+
+        if column is None:
+            hits = [
+                (i, list(r)) for i, r in enumerate(self._cached(), start=1)
+                if i >= start and (r[col - 1] if len(r) >= col else "") == value
+            ]
+            hits = hits[::-1] if newest_first else hits
+            return hits[:limit] if limit else hits
+
+        # (sheet_id, column, row_no) index; the rows above start (the header)
+        # are skipped here, a row_no bound would steer SQLite to the primary key
+        self._sync()
+        hits = self._select(
+            f" AND {column} = ?", (value,),
+            order=" DESC" if newest_first else "", limit=limit and limit + start - 1
+        )
+        hits = [(n, cells) for n, cells in hits if n >= start]
+        return hits[:limit] if limit else hits
+
+    # ---------------- WRITES ----------------
+
+    def batch_update_if(self, requests):
+        # requests: [(checks, data)]. Each batch_update data is written only if
+        # every (row, col, value) of its checks still holds, all tested under
+        # the tab's write lock: a compare-and-set across the bot processes
+        # sharing the database. [True / False] per request
+        done = []
+
+        with self._db.transaction():
+            self._sync(lock=True)
+
+            for checks, data in requests:
+                rows = self._fetch(row for row, _, _ in checks)
+                ok = all(
+                    (rows[row][col - 1] if col <= len(rows[row]) else "") == str(value)
+                    for row, col, value in checks
+                )
+                if ok:
+                    self.batch_update(data)
+                done.append(ok)
+
+        return done
+
+    def append_row(self, values, value_input_option="RAW"):
+        return self.append_rows([values], value_input_option)
+
+    def append_rows(self, values, value_input_option="RAW"):
+        rows = [["" if v is None else str(v) for v in r] for r in values]
+
+        with self._writing("append_rows", rows):
+            first = self._last_row() + 1
+            self._put({first + i: list(r) for i, r in enumerate(rows)})
+            self.row_count = max(self.row_count, first + len(rows) - 1)
+
+        width = max((len(r) for r in rows), default=1) or 1
+        last = rowcol_to_a1(first + len(rows) - 1, width)
+        return {"updates": {"updatedRange": f"'{self.title}'!A{first}:{last}", "updatedRows": len(rows)}}
+
+    def update_cell(self, row, col, value):
+        with self._writing("update_cell", [row, col, str(value)]):
+            cells = self._fetch([row])[row]
+            cells += [""] * (col - len(cells))
+            cells[col - 1] = str(value)
+            self._put({row: cells})
+
+    def update(self, values, range_name=None, **kwargs):
+        # gspread 6 order: values first, range defaults to the top-left cell
+        self.batch_update([{"range": range_name or "A1", "values": values}])
+
+    def batch_update(self, data, **kwargs):
+        data = [{"range": b["range"], "values": [[str(v) for v in row] for row in b["values"]]} for b in data]
+
+        with self._writing("batch_update", data):
+            blocks = [(_grid(b["range"])[:2], b["values"]) for b in data]
+            rows = self._fetch(r1 + dr for (r1, _), values in blocks for dr in range(len(values)))
+
+            for (r1, c1), values in blocks:
+                for dr, row in enumerate(values):
+                    cells = rows[r1 + dr]
+                    for dc, v in enumerate(row):
+                        cells += [""] * (c1 + dc - len(cells))
+                        cells[c1 + dc - 1] = v
+
+            self._put(rows)
+            self.row_count = max(self.row_count, max(rows, default=0))
+
+    def add_rows(self, rows):
+        with self._writing("add_rows", [int(rows)]):
+            self.row_count += int(rows)
+
+    def resize(self, rows=None, cols=None):
+        with self._writing("resize", [rows, cols], layout=rows is not None):
+            if rows is not None:
+                self.row_count = int(rows)
+                if self._rows is not None:
+                    del self._rows[self.row_count:]
+                self._db.execute(
+                    f"DELETE FROM {self._store.table} WHERE sheet_id = ? AND row_no > ?", (self.id, self.row_count)
+                )
+            if cols is not None:
+                self.col_count = int(cols)
+
+    def delete_rows(self, start_index, end_index=None):
+        end_index = end_index or start_index
+        n = end_index - start_index + 1
+        table = self._store.table
+
+        with self._writing("delete_rows", [start_index, end_index], layout=True):
+            if self._rows is not None:
+                del self._rows[start_index - 1:end_index]
+            self.row_count -= n
+
+            self._db.execute(
+                f"DELETE FROM {table} WHERE sheet_id = ? AND row_no BETWEEN ? AND ?", (self.id, start_index, end_index)
+            )
+            # shift through negative numbers so no step collides with the primary key
+            self._db.execute(
+                f"UPDATE {table} SET row_no = -(row_no - ?) WHERE sheet_id = ? AND row_no > ?", (n, self.id, end_index)
+            )
+            self._db.execute(f"UPDATE {table} SET row_no = -row_no WHERE sheet_id = ? AND row_no < 0", (self.id,))
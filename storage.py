@@ -0,0 +1,318 @@
+import argparse
+import json
+import sys
+import threading
+
+import gspread
+from gspread.utils import rowcol_to_a1
+from oauth2client.service_account import ServiceAccountCredentials
+
+from config import (
+    SPREADSHEET_ID, GOOGLE_CREDENTIALS, LOG_ARCHIVE_SPREADSHEET_ID,
+    STORAGE_BACKEND, STORAGE_DSN, SHEETS_MIRROR
+)
+from sheet_metrics import instrument
+from sql_store import SqlClient, SqlDb
+
+
+# ================================
+# STORAGE BACKENDS
+# ================================
+# sheets_logger and users get their client from open_client(), picked by
+# STORAGE_BACKEND:
+#
+#   sheets    Google Sheets (gspread), the spreadsheet is the database
+#   sqlite    sql_store over a local file (STORAGE_DSN)
+#   postgres  sql_store over PostgreSQL (STORAGE_DSN, needs psycopg)
+#
+# Every backend serves the same tabs and row numbers through the same
+# gspread calls, so the indexes, due heaps and review leases built on row
+# numbers work unchanged. On a database the entity tabs (items, owners,
+# submissions, tasks, users, roles, permissions, log) are tables with a
+# column per field, and repositories.py looks rows up by indexed queries. With a database backend and SHEETS_MIRROR=1 each
+# write is also queued (same transaction) and flush_mirror() replays the
+# queue on the spreadsheet in order, so the office copy stays row-for-row
+# identical. Edits made by hand in the mirror are overwritten / shifted:
+# treat it as read-only.
+#
+#   python storage.py migrate --to sqlite            # copy every tab into STORAGE_DSN
+#   python storage.py migrate --from sqlite --to sheets --replace
+#   python storage.py mirror-flush
+
+BACKENDS = ("sheets", "sqlite", "postgres")
+
+MIRROR_BATCH = 500          # queued writes replayed per flush
+MIGRATE_CHUNK_ROWS = 5000   # rows per write when copying a tab
+
+
+def storage_debug(label, value=""):
+    print(f"[STORAGE DEBUG] {label}: {value}")
+
+
+def sheets_client():
+    # gspread over the service account in GOOGLE_CREDENTIALS
+    creds_dict = json.loads(GOOGLE_CREDENTIALS)
+
+    scope = [
+        "https://spreadsheets.google.com/feeds",
+        "https://www.googleapis.com/auth/drive"
+    ]
+
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+
+    return gspread.authorize(creds)
+
+
+def sql_client(dsn, kind="sqlite", mirror=False):
+    # the SQL store with the entity tabs in their own tables (repositories.py)
+    from repositories import entity_tables
+    return SqlClient(SqlDb(dsn, kind), mirror=mirror, tables=entity_tables())
+
+
+def open_backend(name, dsn=None, mirror=False):
+    # an uninstrumented client for one backend
+    if name == "sheets":
+        return sheets_client()
+
+    if name in ("sqlite", "postgres"):
+        return sql_client(dsn or STORAGE_DSN, name, mirror)
+
+    raise ValueError(f"unknown storage backend {name!r}, expected one of {', '.join(BACKENDS)}")
+
+
+_CLIENT = None
+_BACKEND = None             # the raw client behind _CLIENT
+_MIRROR = None              # instrumented Sheets client the mirror replays on
+_LOCK = threading.Lock()
+
+
+def open_client():
+    # the process-wide (instrumented) client of STORAGE_BACKEND
+    global _CLIENT, _BACKEND
+
+    if _CLIENT is None:
+        with _LOCK:
+            if _CLIENT is None:
+                mirror = SHEETS_MIRROR and STORAGE_BACKEND != "sheets"
+                _BACKEND = open_backend(STORAGE_BACKEND, mirror=mirror)
+                _CLIENT = instrument(_BACKEND)
+                storage_debug("BACKEND", STORAGE_BACKEND + (" + sheets mirror" if mirror else ""))
+
+    return _CLIENT
+
+
+def use_client(backend, mirror=None):
+    # installs an already opened backend (bench, migration checks)
+    global _CLIENT, _BACKEND, _MIRROR
+
+    with _LOCK:
+        _BACKEND = backend
+        _CLIENT = instrument(backend)
+        _MIRROR = instrument(mirror) if mirror is not None else None
+
+    return _CLIENT
+
+
+# ---------------- SHEETS MIRROR ----------------
+
+def mirror_enabled():
+    if _BACKEND is None:
+        return SHEETS_MIRROR and STORAGE_BACKEND != "sheets"
+    return isinstance(_BACKEND, SqlClient) and _BACKEND.mirror
+
+
+def _mirror_client():
+    global _MIRROR
+
+    if _MIRROR is None:
+        _MIRROR = instrument(sheets_client())
+    return _MIRROR
+
+
+def mirror_backlog():
+    # writes still waiting for the mirror (one count query)
+    if not mirror_enabled():
+        return 0
+    open_client()
+    return _BACKEND.db.all("SELECT COUNT(*) FROM mirror_queue")[0][0]
+
+
+def _replay_groups(queued):
+    # consecutive appends to the same tab go out as one append_rows, and
+    # consecutive cell writes as one batch_update (applied in order)
+    groups = []
+
+    for qid, key, title, op, args in queued:
+        args = json.loads(args)
+
+        if op == "update_cell":
+            op, args = "batch_update", [{"range": rowcol_to_a1(args[0], args[1]), "values": [[args[2]]]}]
+
+        last = groups[-1] if groups else None
+
+        if last and op in ("append_rows", "batch_update") and last[1:4] == [key, title, op]:
+            last[4].extend(args)
+            last[0] = qid
+        else:
+            groups.append([qid, key, title, op, args])
+
+    return groups
+
+
+def _replay(ss, handles, title, op, args):
+    if op == "add_worksheet":
+        try:
+            handles[title] = ss.worksheet(title)
+        except gspread.exceptions.WorksheetNotFound:
+            handles[title] = ss.add_worksheet(title=title, rows=args[0], cols=args[1])
+        return
+
+    if title not in handles:
+        try:
+            handles[title] = ss.worksheet(title)
+        except gspread.exceptions.WorksheetNotFound:
+            if op == "del_worksheet":
+                return
+            raise
+
+    ws = handles[title]
+
+    if op == "del_worksheet":
+        ss.del_worksheet(ws)
+        handles.pop(title)
+    elif op == "append_rows":
+        ws.append_rows(args)
+    elif op == "update_cell":
+        ws.update_cell(*args)
+    elif op == "batch_update":
+        ws.batch_update(args)
+    elif op == "add_rows":
+        ws.add_rows(*args)
+    elif op == "resize":
+        ws.resize(rows=args[0], cols=args[1])
+    elif op == "delete_rows":
+        ws.delete_rows(*args)
+    else:
+        raise ValueError(f"unknown mirror op {op!r}")
+
+
+def flush_mirror(limit=MIRROR_BATCH):
+    # replays queued writes on Google Sheets, oldest first. A failed call
+    # stops the flush: what went out is dequeued, the rest retries next time
+    if not mirror_enabled():
+        return 0
+
+    open_client()
+    db = _BACKEND.db
+    queued = db.all(
+        "SELECT id, spreadsheet, title, op, args FROM mirror_queue ORDER BY id LIMIT ?", (limit,)
+    )
+    if not queued:
+        return 0
+
+    target = _mirror_client()
+    spreadsheets = {}
+    done = None
+    replayed = 0
+
+    try:
+        for qid, key, title, op, args in _replay_groups(queued):
+            if key not in spreadsheets:
+                spreadsheets[key] = (target.open_by_key(key), {})
+
+            ss, handles = spreadsheets[key]
+            _replay(ss, handles, title, op, args)
+            done = qid
+            replayed += 1
+
+    except Exception as e:
+        storage_debug("MIRROR ERROR", repr(e))
+
+    finally:
+        if done is not None:
+            db.execute("DELETE FROM mirror_queue WHERE id <= ?", (done,))
+
+    return replayed
+
+
+# ---------------- MIGRATION ----------------
+
+def spreadsheet_keys():
+    return [k for k in (SPREADSHEET_ID, LOG_ARCHIVE_SPREADSHEET_ID) if k]
+
+
+def copy_spreadsheet(source, target, key, replace=False, chunk=MIGRATE_CHUNK_ROWS):
+    # every tab of `key` from source to target, row numbers kept (blank rows
+    # included): one read per tab, one write per `chunk` rows. Tabs already in
+    # target with the same number of rows are skipped unless replace, so an
+    # interrupted migration can simply be run again.
+    src = source.open_by_key(key)
+    dst = target.open_by_key(key)
+    existing = {ws.title: ws for ws in dst.worksheets()}
+    stats = {}
+
+    for ws in src.worksheets():
+        rows = ws.get_all_values()
+        old = existing.get(ws.title)
+
+        if old is not None:
+            if not replace and len(old.get_all_values()) == len(rows):
+                stats[ws.title] = "skipped"
+                continue
+            dst.del_worksheet(old)
+
+        new = dst.add_worksheet(title=ws.title, rows=max(ws.row_count, len(rows), 1), cols=max(ws.col_count, 1))
+
+        for start in range(0, len(rows), chunk):
+            new.batch_update([{"range": f"A{start + 1}", "values": rows[start:start + chunk]}])
+
+        stats[ws.title] = len(rows)
+        storage_debug("TAB COPIED", f"{ws.title}: {len(rows)} rows")
+
+    return stats
+
+
+def migrate(source_name, target_name, dsn=None, replace=False):
+    if source_name == target_name:
+        raise ValueError("source and target backends are the same")
+
+    source = instrument(open_backend(source_name, dsn))
+    target = instrument(open_backend(target_name, dsn))
+
+    return {key: copy_spreadsheet(source, target, key, replace) for key in spreadsheet_keys()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="VP listing bot storage tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    m = sub.add_parser("migrate", help="copy every tab from one backend to another")
+    m.add_argument("--from", dest="source", default="sheets", choices=BACKENDS)
+    m.add_argument("--to", dest="target", required=True, choices=BACKENDS)
+    m.add_argument("--dsn", default=None, help="database path / connection string (default STORAGE_DSN)")
+    m.add_argument("--replace", action="store_true", help="recopy tabs that already exist in the target")
+
+    sub.add_parser("mirror-flush", help="replay queued writes on Google Sheets")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        for key, tabs in migrate(args.source, args.target, args.dsn, args.replace).items():
+            print(key)
+            for title, rows in tabs.items():
+                print(f"  {title:<32} {rows}")
+        return 0
+
+    open_client()
+    total = 0
+    while mirror_backlog():
+        replayed = flush_mirror()
+        if not replayed:
+            break           # the oldest write keeps failing, see MIRROR ERROR
+        total += replayed
+    print(f"replayed {total} queued writes, {mirror_backlog()} left")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from accounts import run_sheet, get_cached_role, log_block, log_line
+from config import CAPACITY_CHECK_SECONDS
+from menus import PANEL_SYSTEM
+from sheet_capacity import capacity_report, check_capacity, capacity_text
+
+
+# ================================
+# SYSTEM PANEL
+# ================================
+# Sheet capacity: cells per tab, growth per day and the projected date the
+# spreadsheet hits its cell limit. Served from the last scheduled sample
+# (no reads) unless it is older than CAPACITY_CHECK_SECONDS; 🔄 takes a new
+# one (two reads, plus an add_rows per tab that is running out of rows).
+
+SYSTEM_ROLES = {"ADMIN"}
+
+
+def _keyboard():
+    return InlineKeyboardMarkup([[InlineKeyboardButton("🔄 Refresh", callback_data="SYSTEM|REFRESH")]])
+
+
+def _render(refresh):
+    report = check_capacity() if refresh else capacity_report(CAPACITY_CHECK_SECONDS)
+    return capacity_text(report)
+
+
+async def send_system(context, chat_id, refresh=False, query=None):
+    text = await run_sheet(context, _render, refresh)
+
+    if text is None:
+        text = "⚠️ Could not read the sheet sizes, try again."
+
+    if query:
+        try:
+            await query.edit_message_text(text, reply_markup=_keyboard())
+        except Exception as e:
+            # "message is not modified" when nothing changed
+            log_line("SYSTEM EDIT ERROR", repr(e))
+        return
+
+    await context.bot.send_message(chat_id=chat_id, text=text, reply_markup=_keyboard())
+
+
+async def system_callback(update, context):
+
+    query = update.callback_query
+    role, status = await get_cached_role(context, str(query.from_user.id))
+
+    # a refresh can add rows to the sheet: admins only
+    if role not in SYSTEM_ROLES or status != "ACTIVE":
+        await query.answer("Admins only.")
+        return
+
+    await query.answer()
+
+    await send_system(context, query.message.chat.id, refresh=True, query=query)
+
+
+async def handle_system_panel(update, context, text, role, status):
+
+    if text != PANEL_SYSTEM or role not in SYSTEM_ROLES or status != "ACTIVE":
+        return False
+
+    try:
+        await send_system(context, update.effective_chat.id)
+
+    except Exception as e:
+        log_block("SYSTEM ERROR")
+        log_line("ERROR", repr(e))
+
+    return True
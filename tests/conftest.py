@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+# config.py refuses to import without these; the fakes never read them
+os.environ.setdefault("TELEGRAM_TOKEN", "FAKE:TOKEN")
+os.environ.setdefault("SPREADSHEET_ID", "FAKE_SPREADSHEET")
+os.environ.setdefault("GOOGLE_CREDENTIALS", "{}")
+os.environ.setdefault("LOCAL_DB_PATH", ":memory:")
+os.environ.setdefault("LOG_ARCHIVE_DIR", os.path.join(os.sep, "tmp", "vp-tests-no-log-archive"))
+
+# the bot modules are top-level files next to this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(params=["sheets", "sqlite"])
+def seeded(request):
+    # bench.py's seeded spreadsheet installed as the bot's client: the
+    # in-memory Google Sheets fake, or the same tabs copied into SQLite
+    import accounts
+    import bench
+    import sheets_logger
+    import users
+    from fake_sheets import FakeClient
+    from moderation_queue import moderation_queue
+    from review_queue import review_queue
+    from sheet_metrics import instrument
+
+    fake = FakeClient()
+    sheets_logger._CLIENT = users._CLIENT = instrument(fake)
+    sheets_logger._SPREADSHEET = None
+    sheets_logger._WS_CACHE.clear()
+    sheets_logger.ITEM_INDEX.loaded_at = None
+
+    seeded = bench.seed_backend(fake)
+
+    if request.param == "sqlite":
+        sheets_logger._CLIENT = users._CLIENT = instrument(bench.sql_copy(fake))
+        sheets_logger._SPREADSHEET = None
+        sheets_logger._WS_CACHE.clear()
+
+    accounts.ROLE_CACHE.clear()
+    accounts.ADMIN_CACHE.clear()
+    accounts.USER_RATE_LIMIT.clear()
+    bench.warm_caches(seeded)
+    moderation_queue().clear()
+    review_queue().clear()
+
+    return seeded
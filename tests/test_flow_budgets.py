@@ -0,0 +1,48 @@
+import asyncio
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+import bench
+from fake_telegram import FakeBot, UpdateFactory
+from sheet_metrics import CALLS, DEFAULT_FLOW
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# flows production labels itself (router.message_flow / callback_flow,
+# accounts.start_button), so sheet_metrics.CALLS splits live usage by them
+LABELLED_FLOWS = ["register", "add_account", "new_item", "approve_submission", "pending_list"]
+
+
+@pytest.mark.parametrize("backend", ["sheets", "sqlite"])
+def test_flows_within_budgets(backend):
+    # bench.py --check-budgets in its own process: the flows share the bot's
+    # module caches, so they run in order on a fresh interpreter like in CI
+    run = subprocess.run(
+        [sys.executable, "bench.py", "--check-budgets", "--backend", backend, "--rounds", "5"],
+        cwd=ROOT, capture_output=True, text=True, timeout=600,
+    )
+    assert run.returncode == 0, run.stdout[-2000:] + run.stderr[-2000:]
+
+
+@pytest.mark.parametrize("name", LABELLED_FLOWS)
+def test_production_flow_label(seeded, name):
+    # the flow's updates outside any bench label: every call is charged to it
+    factory = UpdateFactory(FakeBot())
+    steps = bench.FLOWS[name](factory, seeded, 0, random.Random(1))
+
+    async def drive():
+        for handler, update in steps:
+            uid = str(update.effective_user.id)
+            bench.USER_RATE_LIMIT.pop(uid, None)
+            await handler(update, factory.context_for(uid))
+
+    CALLS.reset()
+    asyncio.run(drive())
+
+    assert CALLS.totals(name)["READ"] + CALLS.totals(name)["WRITE"] > 0
+    assert DEFAULT_FLOW not in CALLS.counts, CALLS.counts.get(DEFAULT_FLOW)
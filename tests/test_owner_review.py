@@ -0,0 +1,64 @@
+import asyncio
+
+import accounts
+import bench
+import sheets_logger as sl
+from fake_telegram import FakeBot, UpdateFactory
+from sheet_metrics import CALLS
+
+
+def test_approve_once(seeded):
+    sid = seeded["submissions"][0]
+
+    owner_id, submitted_by = sl.approve_owner_submission(sid)
+
+    assert owner_id.startswith("OWN-") and submitted_by
+    assert sl.approve_owner_submission(sid) is False
+    assert sl.reject_owner_submission(sid) is False
+
+
+def test_reject_without_submitter(seeded):
+    # an empty SUBMITTED_BY is still a successful rejection
+    sid = seeded["submissions"][0]
+    ws, row_i, _ = sl.find_owner_submission(sid)
+    ws.update_cell(row_i, 2, "")
+
+    assert sl.reject_owner_submission(sid) == (True, "")
+    assert sl.reject_owner_submission(sid) is False
+    assert sl.reject_owner_submission("SUB-MISSING") is False
+
+
+def test_failed_call_keeps_the_card(seeded, monkeypatch):
+    # a Sheets error is not "already processed": the card stays for a retry
+    def broken(submission_id):
+        raise ConnectionError("sheets down")
+
+    monkeypatch.setattr(accounts, "reject_owner_submission", broken)
+
+    sid = seeded["submissions"][0]
+    factory = UpdateFactory(FakeBot())
+    update = factory.callback(bench.ADMIN_ID, f"OWNER_REJECT|{sid}|{bench.finder_id(0)}")
+
+    asyncio.run(accounts.owner_review_callback(update, factory.context_for(bench.ADMIN_ID)))
+
+    assert factory.bot.calls["edit_message_text"] == factory.bot.calls["delete_message"] == 0
+    assert "try again" in factory.bot.sent[-1].text
+    assert sl.find_owner_submission(sid)[2][13] == "PENDING"
+
+
+def test_next_page_is_served_from_the_first_read(seeded):
+    factory = UpdateFactory(FakeBot())
+    ctx = factory.context_for(bench.ADMIN_ID)
+    first, next_page = bench.FLOWS["pending_list"](factory, seeded, 0, None)
+
+    async def press(step):
+        handler, update = step
+        bench.USER_RATE_LIMIT.pop(bench.ADMIN_ID, None)
+        CALLS.reset()
+        await handler(update, ctx)
+        return CALLS.totals()["get"]
+
+    async def both():
+        return await press(first), await press(next_page)
+
+    assert asyncio.run(both()) == (1, 0)
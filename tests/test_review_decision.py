@@ -0,0 +1,36 @@
+import sheets_logger as sl
+
+
+STATUS_COL = sl._ITEM_COL["ITEM_STATUS"] + 1
+
+
+def _status(row_i):
+    return sl.items_ws().row_values(row_i)[STATUS_COL - 1]
+
+
+def test_decision_written_once(seeded):
+    _, [(row_i, item_id)] = sl.pending_review_queue(1)
+
+    assert sl.apply_review_decision(row_i, item_id, "PUBLISHED", 1) is True
+    assert sl.apply_review_decision(row_i, item_id, "HIDDEN", 2) is False
+    assert _status(row_i) == "PUBLISHED"
+    assert not sl.is_pending_review(row_i, item_id)
+
+
+def test_decided_elsewhere_is_not_overwritten(seeded):
+    total, [(row_i, item_id)] = sl.pending_review_queue(1)
+    sl.items_ws().update_cell(row_i, STATUS_COL, "HIDDEN")
+
+    assert sl.apply_review_decision(row_i, item_id, "PUBLISHED", 1) is False
+    assert _status(row_i) == "HIDDEN"
+
+    # the index followed the row, so the item is not handed out again
+    assert not sl.is_pending_review(row_i, item_id)
+    assert sl.pending_review_queue()[0] == total - 1
+
+
+def test_row_holding_another_item_is_not_written(seeded):
+    _, [(row_a, item_a), (row_b, _)] = sl.pending_review_queue(2)
+
+    assert sl.apply_review_decision(row_b, item_a, "PUBLISHED", 1) is False
+    assert _status(row_a) == _status(row_b) == "PENDING_REVIEW"
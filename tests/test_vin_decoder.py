@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+from vin_decoder import model_year, decode_vin, vin_fields, _YEAR_CODES
+
+PETERBILT_97 = "1XP5DB9X3VD000000"     # position 10 = V: 1997 or 2027
+
+
+# ---------------- model_year: cycle boundaries ----------------
+
+@pytest.mark.parametrize("code, current, year", [
+    ("W", 2026, 1998),      # 2028 is two years out: one cycle left
+    ("Y", 2026, 2000),
+    ("1", 2026, 2001),
+    ("9", 2026, 2009),      # last code of the first cycle
+    ("T", 2024, 1996),      # 2026 not on sale yet
+    ("V", 2025, 1997),
+    ("A", 2008, 1980),      # 2010 not on sale yet
+])
+def test_single_cycle(code, current, year):
+    assert model_year(code, current=current) == year
+
+
+@pytest.mark.parametrize("code, current", [
+    ("S", 2026),            # 1995 / 2025
+    ("T", 2026),            # 1996 / 2026
+    ("V", 2026),            # 1997 / next year's 2027
+    ("A", 2026),            # 1980 / 2010
+    ("T", 2025),            # 1996 / next year's 2026
+])
+def test_two_cycles_without_hint_is_undecided(code, current):
+    assert model_year(code, current=current) is None
+
+
+@pytest.mark.parametrize("code, hint, year", [
+    ("S", "1995", 1995),
+    ("S", "2025", 2025),
+    ("S", "2024", 2025),    # caption one year off still picks the cycle
+    ("T", "1996", 1996),
+    ("T", "2026", 2026),
+    ("V", "1997", 1997),
+    ("A", "1981", 1980),
+    ("A", "2010", 2010),
+])
+def test_hint_picks_cycle(code, hint, year):
+    assert model_year(code, hint=hint, current=2026) == year
+
+
+def test_never_after_current_year():
+    # next year's code matches the caption but is still in the future
+    assert model_year("V", hint="2027", current=2026) is None
+    assert model_year("W", hint="2028", current=2027) is None
+
+    now = datetime.now().year
+    for code in _YEAR_CODES:
+        for hint in (None, str(now), str(now + 1)):
+            year = model_year(code, hint=hint)
+            assert year is None or year <= now
+
+
+def test_hint_from_another_cycle_is_rejected():
+    # single candidate 1998, but the caption says 2028-ish
+    assert model_year("W", hint="2027", current=2026) is None
+
+
+@pytest.mark.parametrize("pos7, year", [("5", 1980), ("A", 2010)])
+def test_light_vehicle_position_7(pos7, year):
+    assert model_year("A", pos7=pos7, current=2026) == year
+
+
+@pytest.mark.parametrize("code", ["", "I", "O", "Q", "U", "Z", "0"])
+def test_invalid_codes(code):
+    assert model_year(code, current=2026) is None
+
+
+# ---------------- decode_vin / vin_fields ----------------
+
+def test_1997_peterbilt_is_not_2027():
+    assert decode_vin(PETERBILT_97)["year"] in ("", "1997")
+    assert vin_fields(PETERBILT_97, "1997") == {"MAKE": "Peterbilt", "YEAR": "1997"}
+    assert "YEAR" not in vin_fields(PETERBILT_97, "2027")
+
+
+def test_bad_check_digit_gives_nothing():
+    assert vin_fields(PETERBILT_97[:8] + "4" + PETERBILT_97[9:], "1997") == {}
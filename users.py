@@ -1,10 +1,9 @@
-import json
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-from config import SPREADSHEET_ID, GOOGLE_CREDENTIALS, ADMIN_IDS
+from config import SPREADSHEET_ID, ADMIN_IDS, TAB_INITIAL_ROWS
 from utils import now_str, safe_text
+from storage import open_client
+from repositories import open_repository
 
 
 # ================================
@@ -14,10 +13,15 @@ TAB_USERS = "USERS"
 TAB_ROLES = "USER_ROLES"
 TAB_PERMS = "USER_PERMISSIONS"
 
+USERS_SCHEMA = ["TELEGRAM_ID","USERNAME","FULL_NAME","STATUS","CREATED_AT","LAST_SEEN"]
+ROLES_SCHEMA = ["TELEGRAM_ID","ROLE","ASSIGNED_BY","ASSIGNED_AT"]
+PERMS_SCHEMA = ["TELEGRAM_ID","PERMISSION","GRANTED_BY","GRANTED_AT"]
+
 
 # ================================
-# GOOGLE CLIENT
+# STORAGE CLIENT
 # ================================
+# STORAGE_BACKEND's client (storage.py), shared with sheets_logger
 _CLIENT = None
 
 def _client():
@@ -26,16 +30,7 @@ def _client():
     if _CLIENT:
         return _CLIENT
 
-    creds_dict = json.loads(GOOGLE_CREDENTIALS)
-
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive"
-    ]
-
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-
-    _CLIENT = gspread.authorize(creds)
+    _CLIENT = open_client()
 
     return _CLIENT
 
@@ -45,7 +40,8 @@ def _worksheet(name, headers):
     try:
         sh = ss.worksheet(name)
     except Exception:
-        sh = ss.add_worksheet(title=name, rows="2000", cols="20")
+        # as wide as the headers; sheet_capacity grows it when needed
+        sh = ss.add_worksheet(title=name, rows=str(TAB_INITIAL_ROWS), cols=str(len(headers)))
         sh.append_row(headers)
 
     if not sh.row_values(1):
@@ -55,34 +51,35 @@ def _worksheet(name, headers):
 
 
 def users_sheet():
-    return _worksheet(TAB_USERS,
-        ["TELEGRAM_ID","USERNAME","FULL_NAME","STATUS","CREATED_AT","LAST_SEEN"]
-    )
+    return _worksheet(TAB_USERS, USERS_SCHEMA)
 
 
 def roles_sheet():
-    return _worksheet(TAB_ROLES,
-        ["TELEGRAM_ID","ROLE","ASSIGNED_BY","ASSIGNED_AT"]
-    )
+    return _worksheet(TAB_ROLES, ROLES_SCHEMA)
 
 
 def perms_sheet():
-    return _worksheet(TAB_PERMS,
-        ["TELEGRAM_ID","PERMISSION","GRANTED_BY","GRANTED_AT"]
-    )
+    return _worksheet(TAB_PERMS, PERMS_SCHEMA)
+
+
+# rows by TELEGRAM_ID: a tab scan on Sheets, an indexed query on a database
+def users_repo():
+    return open_repository(users_sheet(), USERS_SCHEMA, "TELEGRAM_ID")
+
+
+def roles_repo():
+    return open_repository(roles_sheet(), ROLES_SCHEMA, "TELEGRAM_ID")
+
+
+def perms_repo():
+    return open_repository(perms_sheet(), PERMS_SCHEMA, "TELEGRAM_ID")
 
 
 # ================================
 # USER LOOKUP
 # ================================
 def find_user(telegram_id):
-    sh = users_sheet()
-    rows = sh.get_all_values()
-
-    for i, r in enumerate(rows[1:], start=2):
-        if r and r[0] == str(telegram_id):
-            return i, r
-    return None, None
+    return users_repo().find(str(telegram_id))
 
 
 # ================================
@@ -93,21 +90,21 @@ def register_user_pending(telegram_id, username, full_name):
     username = safe_text(username)
     full_name = safe_text(full_name)
 
-    sh = users_sheet()
-    row_i, _ = find_user(telegram_id)
+    repo = users_repo()
+    row_i, _ = repo.find(telegram_id)
 
     # already exists
     if row_i:
         return False
 
-    sh.append_row([
+    repo.append([[
         telegram_id,
         username,
         full_name,
         "PENDING",
         now_str(),
         now_str()
-    ])
+    ]])
 
     return True
 
@@ -119,40 +116,33 @@ def assign_role(telegram_id, role, admin_id):
     telegram_id = str(telegram_id)
     role = str(role)
 
-    sh = roles_sheet()
-
     # 🚫 prevent duplicate roles
     existing_roles = get_user_roles(telegram_id)
     if role in existing_roles:
         return
 
-    sh.append_row([telegram_id, role, admin_id, now_str()])
+    roles_repo().append([[telegram_id, role, admin_id, now_str()]])
 
     # activate user
-    u_sh = users_sheet()
-    row_i, _ = find_user(telegram_id)
+    users = users_repo()
+    row_i, _ = users.find(telegram_id)
     if row_i:
-        u_sh.update_cell(row_i, 4, "ACTIVE")
+        users.update(row_i, {"STATUS": "ACTIVE"})
 
 
 def get_user_roles(telegram_id):
-    sh = roles_sheet()
-    rows = sh.get_all_values()[1:]
-    return [r[1] for r in rows if r[0] == str(telegram_id)]
+    return [r[1] for _, r in roles_repo().find_all("TELEGRAM_ID", telegram_id)]
 
 
 # ================================
 # PERMISSIONS
 # ================================
 def grant_permission(telegram_id, perm, admin_id):
-    sh = perms_sheet()
-    sh.append_row([telegram_id, perm, admin_id, now_str()])
+    perms_repo().append([[telegram_id, perm, admin_id, now_str()]])
 
 
 def get_user_permissions(telegram_id):
-    sh = perms_sheet()
-    rows = sh.get_all_values()[1:]
-    return [r[1] for r in rows if r[0] == str(telegram_id)]
+    return [r[1] for _, r in perms_repo().find_all("TELEGRAM_ID", telegram_id)]
 
 
 # ================================
@@ -161,13 +151,14 @@ def get_user_permissions(telegram_id):
 def get_user_status_role(telegram_id):
     telegram_id = str(telegram_id)
 
-    row_i, r = find_user(telegram_id)
+    users = users_repo()
+    row_i, r = users.find(telegram_id)
     if not r:
         return None, "PENDING"
 
     # 🔄 update last seen every interaction
     try:
-        users_sheet().update_cell(row_i, 6, now_str())
+        users.update(row_i, {"LAST_SEEN": now_str()})
     except Exception:
         pass
 
@@ -4,8 +4,42 @@ from zoneinfo import ZoneInfo
 # ======================================
 # LOCAL TIME (Chihuahua, Mexico)
 # ======================================
+LOCAL_TZ = ZoneInfo("America/Chihuahua")
+
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
 def now_str() -> str:
-    return datetime.now(ZoneInfo("America/Chihuahua")).strftime("%Y-%m-%d %H:%M:%S")
+    return datetime.now(LOCAL_TZ).strftime(TS_FORMAT)
+
+
+def now_local() -> datetime:
+    return datetime.now(LOCAL_TZ).replace(tzinfo=None)
+
+
+def parse_ts(value):
+    value = (value or "").strip()
+
+    if not value:
+        return None
+
+    # fast path for the format we write ourselves (strptime is ~10x slower)
+    if len(value) == 19 and value[4] == "-" and value[10] == " ":
+        try:
+            return datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19])
+            )
+        except ValueError:
+            pass
+
+    for fmt in (TS_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+
+    return None
 
 
 def safe_text(x) -> str:
@@ -13,8 +47,9 @@ def safe_text(x) -> str:
 
 
 def is_vin_17(v: str) -> bool:
+    # shape only (no I/O/Q); vin_decoder.decode_vin also checks the check digit
     v = safe_text(v).upper()
-    return len(v) == 17 and all(c.isalnum() for c in v)
+    return len(v) == 17 and all(c.isalnum() and c not in "IOQ" for c in v)
 
 
 def fmt_item_id(n: int) -> str:
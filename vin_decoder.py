@@ -0,0 +1,145 @@
+from datetime import datetime
+from functools import lru_cache
+
+from utils import safe_text
+
+
+# ================================
+# OFFLINE VIN DECODER
+# ================================
+# ISO 3779 / 49 CFR 565 decoding for the heavy-truck VINs we list:
+#
+#   1XP  WD49X 1  K  D  123456
+#   WMI  VDS   CD YR PL serial
+#
+# The check digit (position 9) catches nearly every single-character typo.
+# WMI (positions 1-3) gives the manufacturer, position 10 the model year.
+# Everything is table lookups; decode_vin is memoized so backfills that see
+# the same VIN in ITEMS_MASTER and TRUCK_INDEX only decode it once.
+
+VIN_CHARS = set("ABCDEFGHJKLMNPRSTUVWXYZ0123456789")
+
+# letters Telegram users type for digits; I, O and Q never appear in a VIN
+_TYPO_MAP = str.maketrans({"I": "1", "O": "0", "Q": "0"})
+
+_TRANSLIT = {
+    **{str(d): d for d in range(10)},
+    "A": 1, "B": 2, "C": 3, "D": 4, "E": 5, "F": 6, "G": 7, "H": 8,
+    "J": 1, "K": 2, "L": 3, "M": 4, "N": 5, "P": 7, "R": 9,
+    "S": 2, "T": 3, "U": 4, "V": 5, "W": 6, "X": 7, "Y": 8, "Z": 9,
+}
+_WEIGHTS = [8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2]
+
+# WMI -> canonical make (same names as caption_parser.MAKES)
+WMI = {
+    "1NP": "Peterbilt", "1XP": "Peterbilt", "2NP": "Peterbilt", "2XP": "Peterbilt", "3BP": "Peterbilt",
+    "1NK": "Kenworth", "1XK": "Kenworth", "2NK": "Kenworth", "2XK": "Kenworth", "3BK": "Kenworth", "3WK": "Kenworth",
+    "1FU": "Freightliner", "1FV": "Freightliner", "2FU": "Freightliner", "2FV": "Freightliner",
+    "3AK": "Freightliner", "3AL": "Freightliner", "4UZ": "Freightliner",
+    "2WK": "Western Star", "2WL": "Western Star", "5KJ": "Western Star", "5KK": "Western Star",
+    "4V1": "Volvo", "4V2": "Volvo", "4V4": "Volvo", "4V5": "Volvo", "4VA": "Volvo", "4VG": "Volvo",
+    "4VH": "Volvo", "4VK": "Volvo", "4VL": "Volvo", "4VM": "Volvo", "4VZ": "Volvo",
+    "1HS": "International", "1HT": "International", "2HS": "International", "2HT": "International",
+    "3HS": "International", "3HT": "International", "3HA": "International", "3HC": "International",
+    "1M1": "Mack", "1M2": "Mack", "1M3": "Mack", "1M4": "Mack", "2M2": "Mack",
+}
+
+# position 10: 30-year cycle starting 1980 (A) / 2010 (A)
+_YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY123456789"
+_YEAR_BASE = 1980
+
+
+def normalize_vin(text):
+    # strips spaces / dashes and fixes I/O/Q typed for 1/0
+    v = "".join(ch for ch in safe_text(text).upper() if ch.isalnum())
+    return v.translate(_TYPO_MAP)
+
+
+def check_digit(vin):
+    # expected position-9 character, or None if the VIN has invalid characters
+    try:
+        total = sum(_TRANSLIT[c] * w for c, w in zip(vin, _WEIGHTS))
+    except KeyError:
+        return None
+
+    r = total % 11
+    return "X" if r == 10 else str(r)
+
+
+def _hint_year(hint):
+    try:
+        return int(str(hint).strip()[:4])
+    except ValueError:
+        return None
+
+
+def model_year(code, hint=None, pos7=None, current=None):
+    # position-10 code -> model year, or None when it can't be decided.
+    # Each code repeats every 30 years (S = 1995 / 2025). Candidates run up to
+    # next year (next year's models go on sale in the summer) but a year
+    # after the current one is never returned. Between two cycles:
+    #   pos7  light vehicles (GVWR <= 10,000 lb) only: a digit in position 7
+    #         means 1980-2009, a letter 2010-2039 (49 CFR 565.15)
+    #   hint  the year from the caption / sheet picks the nearest cycle
+    if not code or code not in _YEAR_CODES:
+        return None
+
+    current = current or datetime.now().year
+    hint = _hint_year(hint)
+    first = _YEAR_BASE + _YEAR_CODES.index(code)
+    years = list(range(first, current + 2, 30))
+
+    if pos7 and len(years) > 1:
+        years = [y for y in years if (y < 2010) == pos7.isdigit() and y < 2040] or years
+
+    if hint is not None:
+        # a caption year from another cycle means the VIN or the caption is wrong
+        years = [y for y in years if abs(y - hint) <= 15]
+
+    if len(years) != 1 or years[0] > current:
+        return None
+
+    return years[0]
+
+
+@lru_cache(maxsize=65536)
+def _decode(vin):
+    if len(vin) != 17:
+        return (False, False, "", "length")
+
+    if any(c not in VIN_CHARS for c in vin):
+        return (False, False, "", "characters")
+
+    check_ok = check_digit(vin) == vin[8]
+    make = WMI.get(vin[:3], "")
+
+    return (True, check_ok, make, "" if check_ok else "check_digit")
+
+
+def decode_vin(text, year_hint="", light=False):
+    # {"vin", "valid", "check_ok", "make", "year", "wmi", "error"}. year is
+    # "" when position 10 fits two cycles and year_hint doesn't pick one;
+    # light enables the position-7 rule (only for GVWR <= 10,000 lb)
+    vin = normalize_vin(text)
+    valid, check_ok, make, error = _decode(vin)
+    year = model_year(vin[9], year_hint, vin[6] if light else None) if valid else None
+
+    return {
+        "vin": vin,
+        "valid": valid,
+        "check_ok": check_ok,
+        "make": make,
+        "year": str(year) if year else "",
+        "wmi": vin[:3],
+        "error": error,
+    }
+
+
+def vin_fields(vin, year_hint=""):
+    # MAKE / YEAR only from VINs whose check digit matches
+    info = decode_vin(vin, year_hint)
+
+    if not info["check_ok"]:
+        return {}
+
+    return {k: v for k, v in (("MAKE", info["make"]), ("YEAR", info["year"])) if v}